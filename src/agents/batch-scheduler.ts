@@ -10,9 +10,12 @@
 
 import * as fs from 'fs';
 import * as path from 'path';
-import { execSync } from 'child_process';
+import { execFile } from 'child_process';
+import { promisify } from 'util';
 import { log } from '../logging.js';
 
+const execFileAsync = promisify(execFile);
+
 // Default batch size (commits per batch)
 const DEFAULT_BATCH_SIZE = parseInt(process.env.BATCH_COMMIT_COUNT || '50', 10);
 
@@ -98,7 +101,7 @@ export class BatchScheduler {
     log('Planning batches', 'info', { repositoryPath: this.repositoryPath, batchSize, maxBatches });
 
     // Get all commits in chronological order (oldest first)
-    const commits = this.getCommitsChronological(options.fromCommit);
+    const commits = await this.getCommitsChronological(options.fromCommit);
     log('Found commits', 'info', { count: commits.length });
 
     if (commits.length === 0) {
@@ -343,25 +346,17 @@ export class BatchScheduler {
   /**
    * Get commits in chronological order (oldest first)
    */
-  private getCommitsChronological(fromCommit?: string): CommitInfo[] {
+  private async getCommitsChronological(fromCommit?: string): Promise<CommitInfo[]> {
     try {
-      // Build git log command
-      let cmd = `git -C "${this.repositoryPath}" log --reverse --format="%H|%aI|%s"`;
+      // Build git log arguments
+      const args = ['-C', this.repositoryPath, 'log', '--reverse', '--format=%H|%aI|%s'];
       if (fromCommit) {
-        cmd += ` ${fromCommit}..HEAD`;
+        args.push(`${fromCommit}..HEAD`);
       }
 
-      const output = execSync(cmd, { encoding: 'utf8', maxBuffer: 50 * 1024 * 1024 });
-      const lines = output.trim().split('\n').filter(line => line);
-
-      return lines.map(line => {
-        const [sha, dateStr, ...messageParts] = line.split('|');
-        return {
-          sha: sha.trim(),
-          date: new Date(dateStr.trim()),
-          message: messageParts.join('|').trim()
-        };
-      });
+      // Async so a long history does not block the event loop while git runs
+      const { stdout } = await execFileAsync('git', args, { encoding: 'utf8', maxBuffer: 50 * 1024 * 1024 });
+      return this.parseCommitLines(stdout);
     } catch (error) {
       log('Failed to get git commits', 'error', { error });
       return [];
@@ -371,26 +366,35 @@ export class BatchScheduler {
   /**
    * Get commits for a specific batch
    */
-  getCommitsForBatch(batch: BatchWindow): CommitInfo[] {
+  async getCommitsForBatch(batch: BatchWindow): Promise<CommitInfo[]> {
     try {
-      const cmd = `git -C "${this.repositoryPath}" log --reverse --format="%H|%aI|%s" ${batch.startCommit}^..${batch.endCommit}`;
-      const output = execSync(cmd, { encoding: 'utf8', maxBuffer: 10 * 1024 * 1024 });
-      const lines = output.trim().split('\n').filter(line => line);
-
-      return lines.map(line => {
-        const [sha, dateStr, ...messageParts] = line.split('|');
-        return {
-          sha: sha.trim(),
-          date: new Date(dateStr.trim()),
-          message: messageParts.join('|').trim()
-        };
-      });
+      const { stdout } = await execFileAsync('git', [
+        '-C', this.repositoryPath, 'log', '--reverse', '--format=%H|%aI|%s',
+        `${batch.startCommit}^..${batch.endCommit}`
+      ], { encoding: 'utf8', maxBuffer: 10 * 1024 * 1024 });
+      return this.parseCommitLines(stdout);
     } catch (error) {
       log('Failed to get batch commits', 'error', { batch: batch.id, error });
       return [];
     }
   }
 
+  /**
+   * Parse `git log --format=%H|%aI|%s` output (the subject may itself contain '|')
+   */
+  private parseCommitLines(output: string): CommitInfo[] {
+    const lines = output.trim().split('\n').filter(line => line);
+
+    return lines.map(line => {
+      const [sha, dateStr, ...messageParts] = line.split('|');
+      return {
+        sha: sha.trim(),
+        date: new Date(dateStr.trim()),
+        message: messageParts.join('|').trim()
+      };
+    });
+  }
+
   /**
    * Load batch checkpoints from file
    */
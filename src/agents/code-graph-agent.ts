@@ -117,6 +117,8 @@ export class CodeGraphAgent {
   private repositoryPath: string;
   private memgraphHost: string;
   private memgraphPort: number;
+  // Absolute uv path, resolved once by checkUvAvailable() and reused for every CLI spawn
+  private resolvedUvPath: string | null = null;
 
   constructor(
     repositoryPath: string = '.',
@@ -181,9 +183,13 @@ export class CodeGraphAgent {
   }
 
   /**
-   * Check if uv CLI is available
+   * Check if uv CLI is available (a successful lookup is cached for the agent's lifetime)
    */
   private async checkUvAvailable(): Promise<{ available: boolean; path?: string; error?: string }> {
+    if (this.resolvedUvPath) {
+      return { available: true, path: this.resolvedUvPath };
+    }
+
     return new Promise((resolve) => {
       const which = spawn('which', ['uv']);
       let stdout = '';
@@ -194,7 +200,8 @@ export class CodeGraphAgent {
 
       which.on('close', (code) => {
         if (code === 0 && stdout.trim()) {
-          resolve({ available: true, path: stdout.trim() });
+          this.resolvedUvPath = stdout.trim().split('\n')[0];
+          resolve({ available: true, path: this.resolvedUvPath });
         } else {
           resolve({ available: false, error: 'uv not found in PATH' });
         }
@@ -556,7 +563,7 @@ export class CodeGraphAgent {
       const result = await this.runCodeGraphCommand('index', [repoPath]);
 
       // Parse the result from code-graph-rag
-      // The CLI outputs protobuf files and logs stats to stderr
+      // The CLI logs indexing stats to stderr
       const indexingStats = result.indexingStats || {};
 
       const analysisResult: CodeGraphAnalysisResult = {
@@ -573,12 +580,10 @@ export class CodeGraphAgent {
       };
 
       // Include indexing stats and diagnostics in result for reporting
-      if (indexingStats.protoFilesGenerated > 0) {
-        (analysisResult as any).indexingStats = indexingStats;
-      }
+      (analysisResult as any).indexingStats = indexingStats;
       (analysisResult as any).diagnostics = diagnostics;
 
-      log(`[CodeGraphAgent] Indexed repository - ${indexingStats.filesProcessed || 0} files, ${indexingStats.protoFilesGenerated || 0} proto files generated`, 'info');
+      log(`[CodeGraphAgent] Indexed repository - ${indexingStats.filesProcessed || 0} files, ${indexingStats.entitiesIndexed || 0} entities indexed`, 'info');
       return analysisResult;
     } catch (error) {
       // Return empty result instead of throwing - allows workflow to continue
@@ -870,14 +875,10 @@ export class CodeGraphAgent {
 
   /**
    * Run a code-graph-rag CLI command
-   * The CLI uses: graph-code index --repo-path <path> --output-proto-dir <dir>
-   * It outputs protobuf files and logs to stderr, returning summary stats
+   * Indexing writes straight to Memgraph and logs to stderr, returning summary stats
    */
   private async runCodeGraphCommand(command: string, args: string[]): Promise<any> {
     return new Promise((resolve, reject) => {
-      // Create temp directory for protobuf output
-      const tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'code-graph-'));
-
       // Build proper CLI arguments based on command
       let cliArgs: string[];
       let targetRepoPath: string = this.repositoryPath;
@@ -897,7 +898,8 @@ export class CodeGraphAgent {
         ];
       } else if (command === 'export') {
         // For export: use `python -m codebase_rag.main export --output <path> --json`
-        const outputPath = args[0] || path.join(tmpDir, 'graph-export.json');
+        // Only an export without an explicit target needs a scratch directory
+        const outputPath = args[0] || path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'code-graph-')), 'graph-export.json');
         cliArgs = [
           'run',
           '--directory', this.codeGraphRagDir,
@@ -924,7 +926,7 @@ export class CodeGraphAgent {
       const TIMEOUT_MS = loadAgentTuningConfig().code_graph.uv_process_timeout_ms;
       let timedOut = false;
 
-      const uvProcess = spawn('uv', cliArgs, {
+      const uvProcess = spawn(this.resolvedUvPath || 'uv', cliArgs, {
         cwd: this.codeGraphRagDir, // Set working directory to code-graph-rag
         env: {
           ...process.env,
@@ -978,11 +980,8 @@ export class CodeGraphAgent {
 
         if (code === 0) {
           try {
-            // For index command, read protobuf output files and parse stats
+            // For index command, parse stats from the CLI log output
             if (command === 'index') {
-              const protoFiles = fs.readdirSync(tmpDir).filter((f: string) => f.endsWith('.pb') || f.endsWith('.proto'));
-              log(`[CodeGraphAgent] Generated ${protoFiles.length} protobuf files in ${tmpDir}`, 'info');
-
               // Parse entity counts from stderr output - try multiple patterns
               const entitiesMatch = stderr.match(/Indexed (\d+) entities/i) ||
                                     stderr.match(/(\d+) entities? indexed/i) ||
@@ -998,8 +997,6 @@ export class CodeGraphAgent {
                 indexingStats: {
                   entitiesIndexed: entitiesMatch ? parseInt(entitiesMatch[1]) : 0,
                   filesProcessed: filesMatch ? parseInt(filesMatch[1]) : 0,
-                  protoFilesGenerated: protoFiles.length,
-                  outputDir: tmpDir,
                 },
                 raw: { stdout, stderr },
               });
@@ -21,6 +21,7 @@ import type { InsightGenerationAgent } from "./insight-generation-agent.js";
 import { GitHistoryAgent } from "./git-history-agent.js";
 import { VibeHistoryAgent } from "./vibe-history-agent.js";
 import { GitStalenessDetector, CommitEntityCorrelation } from "./git-staleness-detector.js";
+import { extractJsonBlock } from "../utils/json-extraction.js";
 
 // Simple logger
 const log = (message: string, level: string = "info", data?: any) => {
@@ -33,6 +34,20 @@ const log = (message: string, level: string = "info", data?: any) => {
   }
 };
 
+// Diagram reference and PlantUML element patterns, compiled once
+const DIAGRAM_IMAGE_PATTERN = /!\[.*?\]\(([^)]+\.(?:png|puml))\)/gi;
+const PLANTUML_INCLUDE_PATTERN = /!include\s+([^\s]+\.puml)/gi;
+const PLANTUML_COMPONENT_PATTERNS: readonly RegExp[] = [
+  /class\s+"?([^"\s{]+)"?\s*{?/gi,           // class ClassName
+  /component\s+"?([^"\s]+)"?/gi,             // component ComponentName
+  /participant\s+"?([^"\s]+)"?/gi,           // participant Name
+  /actor\s+"?([^"\s]+)"?/gi,                 // actor Name
+  /database\s+"?([^"\s]+)"?/gi,              // database Name
+  /node\s+"?([^"\s]+)"?/gi,                  // node Name
+  /package\s+"?([^"\s{]+)"?\s*{?/gi,         // package Name
+  /rectangle\s+"?([^"\s{]+)"?\s*{?/gi,       // rectangle Name
+];
+
 // Validation result interfaces
 export interface ValidationIssue {
   type: "error" | "warning" | "info";
@@ -1442,15 +1457,12 @@ export class ContentValidationAgent {
     const diagrams = new Set<string>();
 
     // Match markdown image references
-    const imgPattern = /!\[.*?\]\(([^)]+\.(?:png|puml))\)/gi;
-    let match;
-    while ((match = imgPattern.exec(content)) !== null) {
+    for (const match of content.matchAll(DIAGRAM_IMAGE_PATTERN)) {
       diagrams.add(match[1]);
     }
 
     // Match PlantUML include patterns
-    const includePattern = /!include\s+([^\s]+\.puml)/gi;
-    while ((match = includePattern.exec(content)) !== null) {
+    for (const match of content.matchAll(PLANTUML_INCLUDE_PATTERN)) {
       diagrams.add(match[1]);
     }
 
@@ -1461,20 +1473,8 @@ export class ContentValidationAgent {
     const components = new Set<string>();
 
     // Extract class/component names from PlantUML
-    const patterns = [
-      /class\s+"?([^"\s{]+)"?\s*{?/gi,           // class ClassName
-      /component\s+"?([^"\s]+)"?/gi,             // component ComponentName
-      /participant\s+"?([^"\s]+)"?/gi,           // participant Name
-      /actor\s+"?([^"\s]+)"?/gi,                 // actor Name
-      /database\s+"?([^"\s]+)"?/gi,              // database Name
-      /node\s+"?([^"\s]+)"?/gi,                  // node Name
-      /package\s+"?([^"\s{]+)"?\s*{?/gi,         // package Name
-      /rectangle\s+"?([^"\s{]+)"?\s*{?/gi,       // rectangle Name
-    ];
-
-    for (const pattern of patterns) {
-      let match;
-      while ((match = pattern.exec(content)) !== null) {
+    for (const pattern of PLANTUML_COMPONENT_PATTERNS) {
+      for (const match of content.matchAll(pattern)) {
         const name = match[1];
         if (name && !name.startsWith("@") && !name.startsWith("#")) {
           components.add(name);
@@ -2404,9 +2404,9 @@ Respond with a JSON array:
       // Parse LLM response
       let parsedObservations: Array<{ type: string; content: string; confidence: number }> = [];
       try {
-        const jsonMatch = result.insights.match(/\[[\s\S]*\]/);
-        if (jsonMatch) {
-          parsedObservations = JSON.parse(jsonMatch[0]);
+        const jsonBlock = extractJsonBlock(result.insights, 'array');
+        if (jsonBlock) {
+          parsedObservations = JSON.parse(jsonBlock);
         }
       } catch (parseError) {
         log('Failed to parse LLM response as JSON', 'warning', parseError);
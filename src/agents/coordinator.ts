@@ -4873,9 +4873,8 @@ Expected locations for generated files:
         (b[1].endTime || b[1].startTime).getTime() - (a[1].endTime || a[1].startTime).getTime()
       );
       
-      const toKeep = sortedExecutions.slice(0, 100);
-      this.executions.clear();
-      toKeep.forEach(([id, execution]) => this.executions.set(id, execution));
+      // Swap in a fresh map rather than clearing and re-inserting into the old one
+      this.executions = new Map(sortedExecutions.slice(0, 100));
     }
   }
 
@@ -4918,18 +4917,23 @@ Expected locations for generated files:
       log("Failed to close GraphDB connection", "error", error);
     }
 
-    // Clear agents
-    this.agents.clear();
+    // Drop agent references - replacing the map releases them in one go instead of
+    // walking and deleting every entry
+    this.agents = new Map();
     log("CoordinatorAgent shutdown complete", "info");
   }
 
   healthCheck(): Record<string, any> {
-    const activeExecutions = this.getActiveExecutions();
+    // Count in place - health probes only need the number, not a filtered copy
+    let activeExecutions = 0;
+    for (const exec of this.executions.values()) {
+      if (exec.status === "running" || exec.status === "pending") activeExecutions++;
+    }
 
     return {
       status: "healthy",
       workflows_available: this.workflows.size,
-      active_executions: activeExecutions.length,
+      active_executions: activeExecutions,
       total_executions: this.executions.size,
       registered_agents: this.agents.size,
       uptime: Date.now(),
@@ -1,6 +1,7 @@
 import { log } from "../logging.js";
 import OpenAI from "openai";
 import { loadAgentTuningConfig } from "../utils/workflow-loader.js";
+import { getConfiguredApiKey } from "../utils/llm-client-pool.js";
 
 export interface SimilarityConfig {
   embeddingModel?: string;
@@ -81,8 +82,8 @@ export class DeduplicationAgent {
 
   private async initializeEmbeddingModel(): Promise<void> {
     try {
-      const openaiKey = process.env.OPENAI_API_KEY;
-      if (openaiKey && openaiKey !== "your-openai-api-key") {
+      const openaiKey = getConfiguredApiKey("OPENAI_API_KEY");
+      if (openaiKey) {
         this.openaiClient = new OpenAI({
           apiKey: openaiKey,
           timeout: DeduplicationAgent.EMBEDDING_TIMEOUT_MS,
@@ -385,7 +386,7 @@ export class DeduplicationAgent {
       for (let j = i + 1; j < entities.length; j++) {
         if (processed.has(entities[j].id)) continue;
 
-        const similarity = await this.calculateSimilarity(entities[i], entities[j]);
+        const similarity = this.calculateSimilarity(entities[i], entities[j]);
         
         if (similarity >= this.similarityConfig.similarityThreshold) {
           similarEntities.push(entities[j]);
@@ -402,7 +403,7 @@ export class DeduplicationAgent {
     return duplicateGroups;
   }
 
-  private async calculateSimilarity(entity1: Entity, entity2: Entity): Promise<number> {
+  private calculateSimilarity(entity1: Entity, entity2: Entity): number {
     // Enhanced similarity calculation with multiple factors
 
     let score = 0;
@@ -451,7 +452,7 @@ export class DeduplicationAgent {
 
     for (let i = 0; i < entities.length; i++) {
       for (let j = i + 1; j < entities.length; j++) {
-        totalSimilarity += await this.calculateSimilarity(entities[i], entities[j]);
+        totalSimilarity += this.calculateSimilarity(entities[i], entities[j]);
         comparisons++;
       }
     }
@@ -584,7 +585,7 @@ export class DeduplicationAgent {
     for (const candidate of candidates) {
       if (candidate.id === targetEntity.id) continue;
 
-      const similarity = await this.calculateSimilarity(targetEntity, candidate);
+      const similarity = this.calculateSimilarity(targetEntity, candidate);
       
       if (similarity >= this.similarityConfig.similarityThreshold) {
         similarEntities.push({ entity: candidate, similarity });
@@ -629,8 +630,9 @@ export class DeduplicationAgent {
           const targetName = group.target_name || group.targetName;
           const mergeStrategy = group.merge_strategy || group.mergeStrategy || "combine";
 
-          // Verify target exists
-          if (!kgAgent.entities?.has(targetName)) {
+          // Verify target exists (single lookup - the entity is reused below)
+          const primaryEntity = kgAgent.entities?.get(targetName);
+          if (!primaryEntity) {
             errors.push({
               group,
               error: `Target entity not found: ${targetName}`
@@ -646,18 +648,15 @@ export class DeduplicationAgent {
 
           // Preserve history if requested
           if (preserveHistory) {
-            const primaryEntity = kgAgent.entities.get(targetName);
-            if (primaryEntity) {
-              if (!primaryEntity.metadata.merge_history) {
-                primaryEntity.metadata.merge_history = [];
-              }
-
-              primaryEntity.metadata.merge_history.push({
-                merged_entities: secondaryNames,
-                merge_strategy: mergeStrategy,
-                timestamp: Date.now()
-              });
+            if (!primaryEntity.metadata.merge_history) {
+              primaryEntity.metadata.merge_history = [];
             }
+
+            primaryEntity.metadata.merge_history.push({
+              merged_entities: secondaryNames,
+              merge_strategy: mergeStrategy,
+              timestamp: Date.now()
+            });
           }
 
           // Perform the merge (simplified - in real implementation would call KG agent)
@@ -13,6 +13,8 @@ import { log } from '../logging.js';
 import type { CodeEntity } from './code-graph-agent.js';
 import { SemanticAnalyzer } from './semantic-analyzer.js';
 import { loadAgentTuningConfig } from '../utils/workflow-loader.js';
+import { extractJsonBlock } from '../utils/json-extraction.js';
+import { mapWithConcurrency } from '../utils/concurrency.js';
 
 export interface DocumentationLink {
   id: string;
@@ -446,20 +448,24 @@ export class DocumentationLinkerAgent {
       return [];
     }
 
-    const results: Array<{
+    type ReferenceMatch = {
       reference: string;
       matchedEntity: string | null;
       confidence: number;
       reasoning: string;
-    }> = [];
+    };
 
     // Process in batches to avoid LLM overload
-    const batchSize = loadAgentTuningConfig().documentation_linker.reference_batch_size;
+    const tuning = loadAgentTuningConfig().documentation_linker;
+    const batchSize = tuning.reference_batch_size;
     const entityNames = availableEntities.slice(0, 100).map(e => e.name).join(', ');
 
+    const batches: string[][] = [];
     for (let i = 0; i < unresolvedReferences.length; i += batchSize) {
-      const batch = unresolvedReferences.slice(i, i + batchSize);
+      batches.push(unresolvedReferences.slice(i, i + batchSize));
+    }
 
+    const matchBatch = async (batch: string[]): Promise<ReferenceMatch[]> => {
       try {
         const prompt = `Match these documentation references to the most likely code entity.
 
@@ -480,24 +486,24 @@ Respond with JSON array:
         });
 
         // Parse LLM response
-        const jsonMatch = result.insights.match(/\[[\s\S]*\]/);
-        if (jsonMatch) {
-          const parsed = JSON.parse(jsonMatch[0]);
-          results.push(...parsed);
-        }
+        const jsonBlock = extractJsonBlock(result.insights, 'array');
+        return jsonBlock ? [...JSON.parse(jsonBlock)] : [];
       } catch (error) {
         log(`[DocumentationLinkerAgent] LLM matching failed for batch: ${error}`, 'warning');
         // Add fallback results for failed batch
-        for (const ref of batch) {
-          results.push({
-            reference: ref,
-            matchedEntity: null,
-            confidence: 0,
-            reasoning: 'LLM matching failed',
-          });
-        }
+        return batch.map(ref => ({
+          reference: ref,
+          matchedEntity: null,
+          confidence: 0,
+          reasoning: 'LLM matching failed',
+        }));
       }
-    }
+    };
+
+    // Batches are independent LLM calls: keep up to reference_concurrency of them in flight
+    // instead of one round-trip at a time (results keep batch order)
+    const batchResults = await mapWithConcurrency(batches, tuning.reference_concurrency ?? 4, matchBatch);
+    const results = batchResults.flat();
 
     log(`[DocumentationLinkerAgent] LLM resolved ${results.filter(r => r.matchedEntity).length}/${unresolvedReferences.length} references`, 'info');
     return results;
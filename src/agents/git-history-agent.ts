@@ -1,9 +1,24 @@
 import * as fs from 'fs';
 import * as path from 'path';
-import { execSync } from 'child_process';
+import { exec, execFile } from 'child_process';
+import { promisify } from 'util';
 import { log } from '../logging.js';
 import { CheckpointManager } from '../utils/checkpoint-manager.js';
 import { SemanticAnalyzer } from './semantic-analyzer.js';
+import { extractJsonBlock } from '../utils/json-extraction.js';
+import { mapWithConcurrency } from '../utils/concurrency.js';
+
+const execAsync = promisify(exec);
+const execFileAsync = promisify(execFile);
+
+// Git processes run at once when a request needs several independent invocations
+// (a non-numeric or non-positive setting falls back to the default)
+const parsedGitConcurrency = parseInt(process.env.GIT_CONCURRENCY || '4', 10);
+const GIT_CONCURRENCY = Number.isFinite(parsedGitConcurrency) && parsedGitConcurrency > 0 ? parsedGitConcurrency : 4;
+
+// One record per commit: a record separator opens each header and unit separators split its
+// fields, so subjects containing '|' and commits without file changes parse unambiguously
+const GIT_LOG_FORMAT = '%x1e%H%x1f%an%x1f%at%x1f%s';
 
 export interface GitCommit {
   hash: string;
@@ -212,7 +227,7 @@ export class GitHistoryAgent {
   private async extractCommits(fromTimestamp: Date | null): Promise<{ commits: GitCommit[], filteredCount: number }> {
     try {
       // Build git log command
-      let gitCommand = 'git log --pretty=format:"%H|%an|%ad|%s" --date=iso --numstat';
+      let gitCommand = `git log --pretty=format:"${GIT_LOG_FORMAT}" --numstat`;
       
       if (fromTimestamp) {
         const since = fromTimestamp.toISOString().split('T')[0];
@@ -220,8 +235,8 @@ export class GitHistoryAgent {
       }
 
       // Execute git command
-      const output = execSync(gitCommand, { 
-        cwd: this.repositoryPath, 
+      const { stdout: output } = await execAsync(gitCommand, {
+        cwd: this.repositoryPath,
         encoding: 'utf8',
         maxBuffer: 10 * 1024 * 1024 // 10MB buffer
       });
@@ -281,49 +296,53 @@ export class GitHistoryAgent {
     const resolvedEndCommit = actualEndCommit;
 
     try {
-      // Check if startCommit is the initial commit (has no parent)
+      // Use git log with range syntax to get commits between SHAs
+      // For normal commits: use startCommit^..endCommit (includes startCommit), in one spawn
+      // For initial commit: startCommit^ does not resolve, so the range log fails and the
+      // fallback below includes startCommit explicitly
+      // --reverse gives us chronological order (oldest first)
       let isInitialCommit = false;
+      let output: string;
+      let rangeListing: { stdout: string } | null = null;
       try {
-        execSync(`git rev-parse ${startCommit}^`, {
-          cwd: this.repositoryPath,
-          encoding: 'utf8',
-          stdio: ['pipe', 'pipe', 'pipe']
-        });
-      } catch {
-        // If rev-parse fails, this is the initial commit
+        ({ stdout: output } = await execFileAsync(
+          'git',
+          ['log', `--pretty=format:${GIT_LOG_FORMAT}`, '--numstat', '--reverse', `${startCommit}^..${resolvedEndCommit}`],
+          { cwd: this.repositoryPath, encoding: 'utf8', maxBuffer: 10 * 1024 * 1024 }
+        ));
+      } catch (error: any) {
+        if (!/unknown revision|bad revision|ambiguous argument/.test(String(error?.stderr))) {
+          throw error;
+        }
         isInitialCommit = true;
         log('Start commit is the initial commit, using alternative range syntax', 'info');
-      }
 
-      // Use git log with range syntax to get commits between SHAs
-      // For initial commit: use startCommit..endCommit and include startCommit separately
-      // For normal commits: use startCommit^..endCommit (includes startCommit)
-      // --reverse gives us chronological order (oldest first)
-      let gitCommand: string;
-      if (isInitialCommit) {
-        // For initial commit, we need to include it explicitly
         // Get commits from startCommit to resolvedEndCommit inclusive
-        gitCommand = `git log --pretty=format:"%H|%an|%ad|%s" --date=iso --numstat --reverse ${resolvedEndCommit} --not $(git rev-list --max-parents=0 HEAD)^ 2>/dev/null || git log --pretty=format:"%H|%an|%ad|%s" --date=iso --numstat --reverse ${resolvedEndCommit}`;
-      } else {
-        gitCommand = `git log --pretty=format:"%H|%an|%ad|%s" --date=iso --numstat --reverse ${startCommit}^..${resolvedEndCommit}`;
+        const gitCommand = `git log --pretty=format:"${GIT_LOG_FORMAT}" --numstat --reverse ${resolvedEndCommit} --not $(git rev-list --max-parents=0 HEAD)^ 2>/dev/null || git log --pretty=format:"${GIT_LOG_FORMAT}" --numstat --reverse ${resolvedEndCommit}`;
+
+        // The range filter list is independent of the log, so both run at once
+        const [logResult, listing] = await Promise.all([
+          execAsync(gitCommand, {
+            cwd: this.repositoryPath,
+            encoding: 'utf8',
+            maxBuffer: 10 * 1024 * 1024, // 10MB buffer
+            shell: '/bin/bash'
+          }),
+          execAsync(
+            `git rev-list --reverse ${startCommit}^..${resolvedEndCommit} 2>/dev/null || git rev-list --reverse ${resolvedEndCommit}`,
+            { cwd: this.repositoryPath, encoding: 'utf8', maxBuffer: 10 * 1024 * 1024, shell: '/bin/bash' }
+          )
+        ]);
+        output = logResult.stdout;
+        rangeListing = listing;
       }
 
-      const output = execSync(gitCommand, {
-        cwd: this.repositoryPath,
-        encoding: 'utf8',
-        maxBuffer: 10 * 1024 * 1024, // 10MB buffer
-        shell: '/bin/bash'
-      });
-
       const result = this.parseGitLogOutput(output);
 
       // If initial commit, filter to only include commits in our range
-      if (isInitialCommit && result.commits.length > 0) {
+      if (rangeListing && result.commits.length > 0) {
         // Get list of commits in range to filter
-        const rangeOutput = execSync(
-          `git rev-list --reverse ${startCommit}^..${resolvedEndCommit} 2>/dev/null || git rev-list --reverse ${resolvedEndCommit}`,
-          { cwd: this.repositoryPath, encoding: 'utf8', shell: '/bin/bash' }
-        ).trim().split('\n').filter(Boolean);
+        const rangeOutput = rangeListing.stdout.trim().split('\n').filter(Boolean);
 
         // Truncate hashes to 8 chars to match parseGitLogOutput format
         const rangeSet = new Set(rangeOutput.map(h => h.substring(0, 8)));
@@ -369,20 +388,24 @@ export class GitHistoryAgent {
       const allCommits: GitCommit[] = [];
       let totalFiltered = 0;
 
-      // Process in batches of 50 to avoid command line length limits
+      // Process in batches of 50 to avoid command line length limits; up to GIT_CONCURRENCY
+      // batches run at once and outputs are kept in batch order
       const chunkSize = 50;
+      const chunks: string[][] = [];
       for (let i = 0; i < commitShas.length; i += chunkSize) {
-        const chunk = commitShas.slice(i, i + chunkSize);
-        const shaList = chunk.join(' ');
-
-        const gitCommand = `git log --pretty=format:"%H|%an|%ad|%s" --date=iso --numstat --no-walk ${shaList}`;
+        chunks.push(commitShas.slice(i, i + chunkSize));
+      }
 
-        const output = execSync(gitCommand, {
-          cwd: this.repositoryPath,
-          encoding: 'utf8',
-          maxBuffer: 10 * 1024 * 1024
-        });
+      const outputs = await mapWithConcurrency(chunks, GIT_CONCURRENCY, async (chunk) => {
+        const { stdout } = await execFileAsync(
+          'git',
+          ['log', `--pretty=format:${GIT_LOG_FORMAT}`, '--numstat', '--no-walk', ...chunk],
+          { cwd: this.repositoryPath, encoding: 'utf8', maxBuffer: 10 * 1024 * 1024 }
+        );
+        return stdout;
+      });
 
+      for (const output of outputs) {
         const result = this.parseGitLogOutput(output);
         allCommits.push(...result.commits);
         totalFiltered += result.filteredCount;
@@ -427,19 +450,18 @@ export class GitHistoryAgent {
 
   private parseGitLogOutput(output: string): { commits: GitCommit[], filteredCount: number } {
     const commits: GitCommit[] = [];
-    const sections = output.split('\n\n').filter(section => section.trim());
     let filteredCount = 0;
 
-    for (const section of sections) {
-      const lines = section.split('\n');
-      if (lines.length < 1) continue;
+    for (const record of output.split('\x1e')) {
+      if (!record.trim()) continue;
+      const lines = record.split('\n');
 
-      // Parse commit header
-      const headerParts = lines[0].split('|');
+      // Parse commit header (see GIT_LOG_FORMAT)
+      const headerParts = lines[0].split('\x1f');
       if (headerParts.length < 4) continue;
 
-      const [hash, author, dateStr, message] = headerParts;
-      const date = new Date(dateStr);
+      const [hash, author, timestamp, message] = headerParts;
+      const date = new Date(parseInt(timestamp, 10) * 1000);
 
       // Skip documentation-only commits for semantic analysis
       if (this.isDocumentationOnlyCommit(message)) {
@@ -664,7 +686,7 @@ export class GitHistoryAgent {
       const commitSummary = commits.slice(0, 50).map(c => ({
         hash: c.hash,
         message: c.message,
-        files: c.files.map(f => f.path).slice(0, 5),
+        files: c.files.slice(0, 5).map(f => f.path),
         changes: c.stats.totalChanges,
       }));
 
@@ -696,9 +718,9 @@ Respond with JSON:
       });
 
       // Parse LLM response
-      const jsonMatch = result.insights.match(/\{[\s\S]*\}/);
-      if (jsonMatch) {
-        const parsed = JSON.parse(jsonMatch[0]);
+      const jsonBlock = extractJsonBlock(result.insights);
+      if (jsonBlock) {
+        const parsed = JSON.parse(jsonBlock);
 
         return (parsed.patterns || []).map((p: any) => ({
           pattern: p.pattern,
@@ -915,9 +937,9 @@ Respond with JSON:
         analysisType: 'general',
       });
 
-      const jsonMatch = result.insights.match(/\{[\s\S]*\}/);
-      if (jsonMatch) {
-        return JSON.parse(jsonMatch[0]);
+      const jsonBlock = extractJsonBlock(result.insights);
+      if (jsonBlock) {
+        return JSON.parse(jsonBlock);
       }
     } catch (error) {
       log('Semantic commit analysis failed', 'warning', error);
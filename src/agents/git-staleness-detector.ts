@@ -18,6 +18,8 @@ import { log } from "../logging.js";
 import type { GitCommit, GitFileChange } from "./git-history-agent.js";
 import { EmbeddingCache, getSharedEmbeddingCache } from "../utils/embedding-cache.js";
 import { isMockLLMEnabled, getMockDelay } from "../mock/llm-mock-service.js";
+import { getConfiguredApiKey } from "../utils/llm-client-pool.js";
+import { extractJsonBlock } from "../utils/json-extraction.js";
 
 // ============================================================================
 // Interfaces
@@ -71,6 +73,18 @@ export interface StalenessConfig {
   embeddingCacheTtlMs: number;         // Default: 7 days
 }
 
+const STOP_WORDS = new Set([
+  "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
+  "have", "has", "had", "do", "does", "did", "will", "would", "could",
+  "should", "may", "might", "must", "and", "or", "but", "if", "then",
+  "else", "when", "where", "why", "how", "all", "each", "every", "both",
+  "few", "more", "most", "other", "some", "such", "no", "not", "only",
+  "same", "so", "than", "too", "very", "just", "also", "now", "here",
+  "there", "can", "this", "that", "these", "those", "with", "from", "for",
+  "into", "during", "before", "after", "above", "below", "to", "of", "in",
+  "on", "by", "at", "as", "it", "its", "we", "us", "our", "you", "your",
+]);
+
 // ============================================================================
 // GitStalenessDetector Class
 // ============================================================================
@@ -105,8 +119,8 @@ export class GitStalenessDetector {
 
   private initializeClients(): void {
     // Initialize Groq for TIER 3 LLM correlation
-    const groqKey = process.env.GROQ_API_KEY;
-    if (groqKey && groqKey !== "your-groq-api-key") {
+    const groqKey = getConfiguredApiKey("GROQ_API_KEY");
+    if (groqKey) {
       this.groqClient = new Groq({
         apiKey: groqKey,
         timeout: 30000,
@@ -115,8 +129,8 @@ export class GitStalenessDetector {
     }
 
     // Initialize OpenAI for embeddings (TIER 2)
-    const openaiKey = process.env.OPENAI_API_KEY;
-    if (openaiKey && openaiKey !== "your-openai-api-key") {
+    const openaiKey = getConfiguredApiKey("OPENAI_API_KEY");
+    if (openaiKey) {
       this.openaiClient = new OpenAI({
         apiKey: openaiKey,
         timeout: 30000,
@@ -360,22 +374,19 @@ export class GitStalenessDetector {
 
     const allText = this.getEntityObservationsText(entity);
 
+    // matchAll iterates without touching the shared patterns' lastIndex, so they need no per-call copy
     // Extract file paths
-    let match;
-    const filePathRegex = new RegExp(this.filePathPattern.source, this.filePathPattern.flags);
-    while ((match = filePathRegex.exec(allText)) !== null) {
+    for (const match of allText.matchAll(this.filePathPattern)) {
       topics.filePaths.push(match[1]);
     }
 
     // Extract commands
-    const commandRegex = new RegExp(this.commandPattern.source, this.commandPattern.flags);
-    while ((match = commandRegex.exec(allText)) !== null) {
+    for (const match of allText.matchAll(this.commandPattern)) {
       topics.commands.push(match[1].split(" ")[0]);
     }
 
     // Extract component names
-    const componentRegex = new RegExp(this.componentPattern.source, this.componentPattern.flags);
-    while ((match = componentRegex.exec(allText)) !== null) {
+    for (const match of allText.matchAll(this.componentPattern)) {
       topics.components.push(match[1]);
     }
 
@@ -394,9 +405,7 @@ export class GitStalenessDetector {
 
     // Extract component names from commit message and file paths
     const allText = commit.message + " " + commit.files.map(f => f.path).join(" ");
-    const componentRegex = new RegExp(this.componentPattern.source, this.componentPattern.flags);
-    let match;
-    while ((match = componentRegex.exec(allText)) !== null) {
+    for (const match of allText.matchAll(this.componentPattern)) {
       topics.components.push(match[1]);
     }
 
@@ -405,22 +414,10 @@ export class GitStalenessDetector {
 
   private extractKeywords(text: string): string[] {
     // Simple keyword extraction: split by non-word chars, filter noise
-    const stopWords = new Set([
-      "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
-      "have", "has", "had", "do", "does", "did", "will", "would", "could",
-      "should", "may", "might", "must", "and", "or", "but", "if", "then",
-      "else", "when", "where", "why", "how", "all", "each", "every", "both",
-      "few", "more", "most", "other", "some", "such", "no", "not", "only",
-      "same", "so", "than", "too", "very", "just", "also", "now", "here",
-      "there", "can", "this", "that", "these", "those", "with", "from", "for",
-      "into", "during", "before", "after", "above", "below", "to", "of", "in",
-      "on", "by", "at", "as", "it", "its", "we", "us", "our", "you", "your",
-    ]);
-
     const words = text.toLowerCase()
       .replace(/[^a-z0-9\s-]/g, " ")
       .split(/\s+/)
-      .filter(w => w.length > 2 && !stopWords.has(w));
+      .filter(w => w.length > 2 && !STOP_WORDS.has(w));
 
     // Return unique keywords
     return [...new Set(words)];
@@ -658,10 +655,10 @@ Respond with JSON array:
 
     try {
       // Extract JSON from response
-      const jsonMatch = content.match(/\[[\s\S]*\]/);
-      if (!jsonMatch) return results;
+      const jsonBlock = extractJsonBlock(content, 'array');
+      if (!jsonBlock) return results;
 
-      const parsed = JSON.parse(jsonMatch[0]);
+      const parsed = JSON.parse(jsonBlock);
       if (!Array.isArray(parsed)) return results;
 
       for (const item of parsed) {
@@ -1,5 +1,6 @@
 import * as fs from 'fs';
 import * as path from 'path';
+import { spawn } from 'child_process';
 import { log } from '../logging.js';
 import { SemanticAnalyzer } from './semantic-analyzer.js';
 import { FilenameTracer } from '../utils/filename-tracer.js';
@@ -14,6 +15,10 @@ import {
 import type { IntelligentQueryResult, SynthesisResult } from './code-graph-agent.js';
 import { WebSearchAgent, type SearchResult } from './web-search.js';
 
+// PlantUML keyword run straight into an uppercase name ("participantFoo"), a common LLM error
+const PUML_KEYWORD_WITHOUT_SPACE =
+  /\b(participant|actor|component|interface|database|entity|boundary|control|collections|queue|node|rectangle|package)([A-Z][a-zA-Z0-9_]*)\b/g;
+
 export interface InsightDocument {
   name: string;
   title: string;
@@ -432,7 +437,7 @@ export class InsightGenerationAgent {
       : '';
 
     const codeContextText = serenaAnalysis
-      ? `\n\n**Code Structure:**\n- ${serenaAnalysis.symbols.length} code symbols found\n- Key files: ${serenaAnalysis.fileStructures.map(f => f.path).slice(0, 5).join(', ')}`
+      ? `\n\n**Code Structure:**\n- ${serenaAnalysis.symbols.length} code symbols found\n- Key files: ${serenaAnalysis.fileStructures.slice(0, 5).map(f => f.path).join(', ')}`
       : '';
 
     const prompt = `You are a technical documentation expert creating a comprehensive insight document for "${entityName}" (type: ${entityType}).
@@ -1823,7 +1828,7 @@ Best practices, rules, and conventions for using this correctly. What should dev
         log(`No entityInfo found in data. Keys: ${Object.keys(data).join(', ')}`, 'warning');
       }
 
-      log(`🔍 DEBUG: Cleaned data for LLM (original size: ${JSON.stringify(data).length}, cleaned size: ${JSON.stringify(cleanData).length})`, 'debug');
+      log(`🔍 DEBUG: Cleaned data for LLM (original keys: ${Object.keys(data).length}, cleaned keys: ${Object.keys(cleanData).length})`, 'debug');
 
       diagramContent = await this.generateLLMEnhancedDiagram(type, cleanData);
     }
@@ -1860,25 +1865,8 @@ Best practices, rules, and conventions for using this correctly. What should dev
     const pumlFile = path.join(pumlDir, `${toKebabCase(name)}-${type}.puml`);
 
     try {
-      await fs.promises.writeFile(pumlFile, validatedContent, 'utf8');
-
-      // Validate with plantuml -checkonly before attempting PNG generation
-      const { spawn } = await import('child_process');
-
-      // Run syntax check first
-      const checkResult = await new Promise<{ valid: boolean; error?: string }>((resolve) => {
-        const check = spawn('plantuml', ['-checkonly', pumlFile]);
-        let stderr = '';
-        check.stderr?.on('data', (data) => { stderr += data.toString(); });
-        check.on('close', (code) => {
-          if (code === 0) {
-            resolve({ valid: true });
-          } else {
-            resolve({ valid: false, error: stderr || `Exit code ${code}` });
-          }
-        });
-        check.on('error', (err) => resolve({ valid: false, error: err.message }));
-      });
+      // Syntax-check (and repair) the source in memory; the .puml file is written once, with the final content
+      const checkResult = await this.checkPlantUMLSyntax(validatedContent);
 
       if (!checkResult.valid) {
         log(`PlantUML syntax check failed for ${pumlFile}: ${checkResult.error}`, 'warning');
@@ -1896,18 +1884,9 @@ Best practices, rules, and conventions for using this correctly. What should dev
 
           if (repairResult) {
             repairedContent = repairResult;
-            await fs.promises.writeFile(pumlFile, repairedContent, 'utf8');
 
             // Re-validate
-            const recheck = await new Promise<{ valid: boolean; error?: string }>((resolve) => {
-              const check = spawn('plantuml', ['-checkonly', pumlFile]);
-              let stderr = '';
-              check.stderr?.on('data', (d) => { stderr += d.toString(); });
-              check.on('close', (code) => {
-                resolve(code === 0 ? { valid: true } : { valid: false, error: stderr || `Exit code ${code}` });
-              });
-              check.on('error', (err) => resolve({ valid: false, error: err.message }));
-            });
+            const recheck = await this.checkPlantUMLSyntax(repairedContent);
 
             if (recheck.valid) {
               log(`✅ PlantUML repair successful on attempt ${repairAttempt}`, 'info');
@@ -1925,6 +1904,7 @@ Best practices, rules, and conventions for using this correctly. What should dev
 
         if (!checkResult.valid) {
           log(`PlantUML repair failed after ${repairAttempt} attempts`, 'warning');
+          await fs.promises.writeFile(pumlFile, repairedContent, 'utf8');
           return {
             type,
             name: `${toKebabCase(name)}-${type}`,
@@ -1938,6 +1918,8 @@ Best practices, rules, and conventions for using this correctly. What should dev
         validatedContent = repairedContent;
       }
 
+      await fs.promises.writeFile(pumlFile, validatedContent, 'utf8');
+
       // Generate PNG if PlantUML is available and syntax is valid
       let pngFile: string | undefined;
       try {
@@ -2001,8 +1983,7 @@ Best practices, rules, and conventions for using this correctly. What should dev
         dataKeys: Object.keys(data || {}),
         dataTypes: Object.fromEntries(Object.entries(data || {}).map(([k, v]) => [k, typeof v])),
         patternCatalogExists: !!data.patternCatalog,
-        patternCount: data.patternCatalog?.patterns?.length || 0,
-        dataStringified: JSON.stringify(data, null, 2).substring(0, 500) + '...'
+        patternCount: data.patternCatalog?.patterns?.length || 0
       });
       
       // 🚨 SPECIAL WORKFLOW DEBUG: Log a more detailed breakdown
@@ -2086,13 +2067,7 @@ Best practices, rules, and conventions for using this correctly. What should dev
     });
 
     // Fix 4: Missing space after keywords (LLM sometimes generates "participantFoo" instead of "participant Foo")
-    // Handle: participant, actor, component, interface, database, entity, boundary, control, collections
-    const keywords = ['participant', 'actor', 'component', 'interface', 'database', 'entity', 'boundary', 'control', 'collections', 'queue', 'node', 'rectangle', 'package'];
-    for (const keyword of keywords) {
-      // Match keyword immediately followed by uppercase letter (no space) - common LLM error
-      const regex = new RegExp(`\\b(${keyword})([A-Z][a-zA-Z0-9_]*)\\b`, 'g');
-      fixed = fixed.replace(regex, '$1 $2');
-    }
+    fixed = fixed.replace(PUML_KEYWORD_WITHOUT_SPACE, '$1 $2');
 
     // Fix 5: Inline notes with \n escape sequences - convert to multi-line note blocks
     // Match: note "text with \n in it" -> note as N1 \n text \n end note
@@ -2330,7 +2305,7 @@ ${observationsText}`;
     } else {
       // Fallback to generic analysis data
       analysisContext = `**Analysis Data:**
-${JSON.stringify(data, null, 2)}`;
+${JSON.stringify(data)}`;
     }
 
     let prompt = `Generate a professional PlantUML ${type} diagram based on the following:
@@ -3494,9 +3469,40 @@ ${pattern.implementation.usageNotes.map(note => `- ${note}`).join('\n')}
     });
   }
 
+  /**
+   * Syntax-check PlantUML source by piping it to `plantuml -syntax`, without writing a file.
+   * Runs in the puml output directory so the relative `!include` of the standard style
+   * resolves exactly as it will for the written file.
+   */
+  private async checkPlantUMLSyntax(content: string): Promise<{ valid: boolean; error?: string }> {
+    const pumlDir = path.join(this.outputDir, 'puml');
+    await fs.promises.mkdir(pumlDir, { recursive: true });
+    return new Promise((resolve) => {
+      const check = spawn('plantuml', ['-syntax'], { cwd: pumlDir });
+      let stdout = '';
+      let stderr = '';
+      check.stdout?.on('data', (data) => { stdout += data.toString(); });
+      check.stderr?.on('data', (data) => { stderr += data.toString(); });
+      check.on('close', (code) => {
+        // -syntax prints "ERROR", the line number and the message for invalid input
+        const lines = stdout.trim().split('\n').map(line => line.trim());
+        if (lines[0] === 'ERROR') {
+          resolve({ valid: false, error: `Line ${lines[1]}: ${lines.slice(2).join(' ') || 'Syntax error'}` });
+        } else if (code === 0) {
+          resolve({ valid: true });
+        } else {
+          resolve({ valid: false, error: stderr || `Exit code ${code}` });
+        }
+      });
+      check.on('error', (err) => resolve({ valid: false, error: err.message }));
+      // The process may exit before reading all input (e.g. plantuml missing); the close handler reports it
+      check.stdin?.on('error', () => {});
+      check.stdin?.end(content);
+    });
+  }
+
   private async checkPlantUMLAvailability(): Promise<void> {
     try {
-      const { spawn } = await import('child_process');
       const plantuml = spawn('plantuml', ['-version']);
       
       plantuml.on('close', (code) => {
@@ -3785,7 +3791,7 @@ skinparam sequence {
       const prompt = `Analyze these git commits and extract SPECIFIC architectural patterns.
 
 COMMITS:
-${JSON.stringify(commitSummary, null, 2)}
+${JSON.stringify(commitSummary)}
 
 REQUIREMENTS:
 - Pattern names must be SPECIFIC and DESCRIPTIVE based on actual implementation details
@@ -4642,7 +4648,7 @@ ${analysisResult.insights}
     return `Generate comprehensive technical documentation based on the following semantic analysis results:
 
 **Analysis Data:**
-${JSON.stringify(data, null, 2)}
+${JSON.stringify(data)}
 
 **Documentation Requirements:**
 - Create a professional technical document with clear structure
@@ -4844,7 +4850,7 @@ ${data.appendices || 'Additional metadata and references.'}
       description: partial.description || 'Pattern identified through commit analysis',
       significance: partial.significance || 5,
       evidence: partial.evidence || [`Found in ${commits.length} commits`],
-      relatedComponents: partial.relatedComponents || commits.flatMap(c => c.files?.map((f: any) => f.path) || []).slice(0, 10),
+      relatedComponents: partial.relatedComponents || this.firstCommitFilePaths(commits, 10),
       implementation: partial.implementation || {
         language: 'TypeScript',
         usageNotes: ['Pattern extracted from commit history']
@@ -4852,6 +4858,20 @@ ${data.appendices || 'Additional metadata and references.'}
     };
   }
 
+  /**
+   * Paths of the first `limit` files across the commits, without flattening every commit's file list
+   */
+  private firstCommitFilePaths(commits: any[], limit: number): string[] {
+    const paths: string[] = [];
+    for (const commit of commits) {
+      for (const file of commit.files || []) {
+        if (paths.length >= limit) return paths;
+        paths.push(file.path);
+      }
+    }
+    return paths;
+  }
+
   // New helper methods for improved insight structure
   private getSignificanceDescription(significance: number): string {
     if (significance >= 9) return 'Critical architecture pattern for system success';
@@ -28,6 +28,9 @@ const EDGE_WEIGHTS = {
 // Minimum score threshold for edge prediction
 const EDGE_PREDICTION_THRESHOLD = parseFloat(process.env.EDGE_PREDICTION_THRESHOLD || '0.5');
 
+// Word tokenizer used to build per-entity observation token sets
+const WORD_TOKEN_PATTERN = /\w+/g;
+
 export interface KGEntity {
   id: string;
   name: string;
@@ -187,20 +190,36 @@ export class KGOperators {
   ): Promise<KGEntity[]> {
     const enriched: KGEntity[] = [];
 
+    // Lowercase commit message prefixes once per batch rather than per entity/observation
+    const commitKeys = batchContext.commits.map(c => ({
+      commit: c,
+      key: c.message.toLowerCase().substring(0, 20)
+    }));
+
     for (const entity of entities) {
       // Build context from batch information
       const contextParts: string[] = [];
 
+      // Tokenize observations once so single-word commit prefixes resolve with a
+      // set lookup; the substring scan only runs when the token lookup misses
+      const observationsLower = entity.observations.map(obs => obs.toLowerCase());
+      const observationTokens = new Set<string>();
+      for (const obs of observationsLower) {
+        for (const token of obs.match(WORD_TOKEN_PATTERN) || []) {
+          observationTokens.add(token);
+        }
+      }
+
       // Add temporal context
       const dateRange = `${batchContext.startDate.toISOString().split('T')[0]} to ${batchContext.endDate.toISOString().split('T')[0]}`;
       contextParts.push(`Time period: ${dateRange}`);
 
       // Find related commits
-      const relatedCommits = batchContext.commits.filter(c =>
-        entity.observations.some(obs =>
-          obs.toLowerCase().includes(c.message.toLowerCase().substring(0, 20))
+      const relatedCommits = commitKeys
+        .filter(({ key }) =>
+          observationTokens.has(key) || observationsLower.some(obs => obs.includes(key))
         )
-      );
+        .map(({ commit }) => commit);
       if (relatedCommits.length > 0) {
         contextParts.push(`Related commits: ${relatedCommits.map(c => c.hash.substring(0, 7)).join(', ')}`);
       }
@@ -462,25 +481,43 @@ export class KGOperators {
     // Build neighbor map for Adamic-Adar
     const neighbors = new Map<string, Set<string>>();
     for (const relation of accumulatedKG.relations) {
-      if (!neighbors.has(relation.from)) neighbors.set(relation.from, new Set());
-      if (!neighbors.has(relation.to)) neighbors.set(relation.to, new Set());
-      neighbors.get(relation.from)!.add(relation.to);
-      neighbors.get(relation.to)!.add(relation.from);
+      let fromNeighbors = neighbors.get(relation.from);
+      if (!fromNeighbors) neighbors.set(relation.from, fromNeighbors = new Set());
+      let toNeighbors = neighbors.get(relation.to);
+      if (!toNeighbors) neighbors.set(relation.to, toNeighbors = new Set());
+      fromNeighbors.add(relation.to);
+      toNeighbors.add(relation.from);
+    }
+
+    // Columnar view of the accumulated entities: ids, embeddings and embedding norms
+    // are laid out once per call instead of being re-derived for every pair
+    const accCount = accumulatedKG.entities.length;
+    const accIds: string[] = new Array(accCount);
+    const accEmbeddings: Array<number[] | undefined> = new Array(accCount);
+    const accNorms = new Float64Array(accCount);
+    for (let j = 0; j < accCount; j++) {
+      const { id, embedding } = accumulatedKG.entities[j];
+      accIds[j] = id;
+      accEmbeddings[j] = embedding;
+      accNorms[j] = this.embeddingNorm(embedding);
     }
 
     // Compare each pair of new entities with accumulated entities
     for (const newEntity of entities) {
-      for (const accEntity of accumulatedKG.entities) {
-        if (newEntity.id === accEntity.id) continue;
+      const newNorm = this.embeddingNorm(newEntity.embedding);
+
+      for (let j = 0; j < accCount; j++) {
+        const accId = accIds[j];
+        if (newEntity.id === accId) continue;
 
         // Calculate cosine similarity
-        const cos = this.cosineSimilarity(newEntity.embedding, accEntity.embedding);
+        const cos = this.cosineSimilarity(newEntity.embedding, accEmbeddings[j], newNorm, accNorms[j]);
 
         // Calculate Adamic-Adar index
-        const aa = this.adamicAdar(newEntity.id, accEntity.id, neighbors);
+        const aa = this.adamicAdar(newEntity.id, accId, neighbors);
 
         // Calculate common ancestors
-        const ca = this.commonAncestors(newEntity.id, accEntity.id, accumulatedKG.relations);
+        const ca = this.commonAncestors(newEntity.id, accId, accumulatedKG.relations);
 
         // Combined score
         const score =
@@ -491,7 +528,7 @@ export class KGOperators {
         if (score >= this.edgeThreshold) {
           edges.push({
             from: newEntity.id,
-            to: accEntity.id,
+            to: accId,
             type: 'related_to',
             weight: score,
             source: 'predicted',
@@ -500,7 +537,7 @@ export class KGOperators {
 
           scores.push({
             from: newEntity.id,
-            to: accEntity.id,
+            to: accId,
             score,
             components: { cos, aa, ca }
           });
@@ -518,25 +555,36 @@ export class KGOperators {
   }
 
   /**
-   * Calculate cosine similarity between two embeddings
+   * Euclidean norm of an embedding (0 when missing or empty)
+   */
+  private embeddingNorm(embedding?: number[]): number {
+    if (!embedding || embedding.length === 0) {
+      return 0;
+    }
+
+    let sumSquares = 0;
+    for (let i = 0; i < embedding.length; i++) {
+      sumSquares += embedding[i] * embedding[i];
+    }
+    return Math.sqrt(sumSquares);
+  }
+
+  /**
+   * Calculate cosine similarity between two embeddings with precomputed norms
    */
-  private cosineSimilarity(a?: number[], b?: number[]): number {
+  private cosineSimilarity(a: number[] | undefined, b: number[] | undefined, normA: number, normB: number): number {
     if (!a || !b || a.length !== b.length || a.length === 0) {
       return 0;
     }
 
-    let dotProduct = 0;
-    let normA = 0;
-    let normB = 0;
+    if (normA === 0 || normB === 0) return 0;
 
+    let dotProduct = 0;
     for (let i = 0; i < a.length; i++) {
       dotProduct += a[i] * b[i];
-      normA += a[i] * a[i];
-      normB += b[i] * b[i];
     }
 
-    if (normA === 0 || normB === 0) return 0;
-    return dotProduct / (Math.sqrt(normA) * Math.sqrt(normB));
+    return dotProduct / (normA * normB);
   }
 
   /**
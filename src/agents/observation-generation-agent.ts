@@ -267,7 +267,7 @@ export class ObservationGenerationAgent {
     // Generate observations for architectural decisions
     if (gitAnalysis.architecturalDecisions) {
       for (const decision of gitAnalysis.architecturalDecisions) {
-        const observation = await this.createArchitecturalDecisionObservation(decision, gitAnalysis);
+        const observation = this.createArchitecturalDecisionObservation(decision, gitAnalysis);
         if (observation) observations.push(observation);
       }
     }
@@ -277,7 +277,7 @@ export class ObservationGenerationAgent {
     if (gitAnalysis.codeEvolution) {
       log(`Processing ${gitAnalysis.codeEvolution.length} code evolution patterns (no artificial limit)`, 'info');
       for (const pattern of gitAnalysis.codeEvolution) {
-        const observation = await this.createCodeEvolutionObservation(pattern, gitAnalysis);
+        const observation = this.createCodeEvolutionObservation(pattern, gitAnalysis);
         if (observation) observations.push(observation);
       }
       log(`Generated ${observations.length} observations from code evolution patterns`, 'info');
@@ -286,10 +286,10 @@ export class ObservationGenerationAgent {
     return observations;
   }
 
-  private async createArchitecturalDecisionObservation(
+  private createArchitecturalDecisionObservation(
     decision: any, 
     gitAnalysis: any
-  ): Promise<StructuredObservation | null> {
+  ): StructuredObservation | null {
     try {
       const entityName = this.generateEntityName(decision.type, decision.description);
       const currentDate = new Date().toISOString();
@@ -360,10 +360,10 @@ export class ObservationGenerationAgent {
     }
   }
 
-  private async createCodeEvolutionObservation(
+  private createCodeEvolutionObservation(
     pattern: any,
     gitAnalysis: any
-  ): Promise<StructuredObservation | null> {
+  ): StructuredObservation | null {
     try {
       const entityName = this.generateEntityName('CodeEvolution', pattern.pattern);
       const currentDate = new Date().toISOString();
@@ -442,7 +442,7 @@ export class ObservationGenerationAgent {
     if (vibeAnalysis.problemSolutionPairs) {
       log(`Processing ${vibeAnalysis.problemSolutionPairs.length} problem-solution pairs (no artificial limit)`, 'info');
       for (const pair of vibeAnalysis.problemSolutionPairs) {
-        const observation = await this.createProblemSolutionObservation(pair, vibeAnalysis);
+        const observation = this.createProblemSolutionObservation(pair, vibeAnalysis);
         if (observation) observations.push(observation);
       }
     }
@@ -451,7 +451,7 @@ export class ObservationGenerationAgent {
     if (vibeAnalysis.developmentContexts) {
       const contextGroups = this.groupContextsByType(vibeAnalysis.developmentContexts);
       for (const [type, contexts] of contextGroups.entries()) {
-        const observation = await this.createContextGroupObservation(type, contexts, vibeAnalysis);
+        const observation = this.createContextGroupObservation(type, contexts, vibeAnalysis);
         if (observation) observations.push(observation);
       }
     }
@@ -597,10 +597,10 @@ export class ObservationGenerationAgent {
     };
   }
 
-  private async createProblemSolutionObservation(
+  private createProblemSolutionObservation(
     pair: any,
     vibeAnalysis: any
-  ): Promise<StructuredObservation | null> {
+  ): StructuredObservation | null {
     try {
       const entityName = this.generateEntityName('ProblemSolution', pair.problem.description);
       const currentDate = new Date().toISOString();
@@ -678,11 +678,11 @@ export class ObservationGenerationAgent {
     return groups;
   }
 
-  private async createContextGroupObservation(
+  private createContextGroupObservation(
     type: string,
     contexts: any[],
     vibeAnalysis: any
-  ): Promise<StructuredObservation | null> {
+  ): StructuredObservation | null {
     try {
       const entityName = this.generateEntityName('DevelopmentContext', type);
       const currentDate = new Date().toISOString();
@@ -895,7 +895,7 @@ Provide a JSON response with:
     // Process multiple insight documents if available
     if (insightsResults?.insightDocuments && Array.isArray(insightsResults.insightDocuments)) {
       for (const insightDoc of insightsResults.insightDocuments) {
-        const observation = await this.createInsightDocumentObservation(insightDoc);
+        const observation = this.createInsightDocumentObservation(insightDoc);
         if (observation) {
           observations.push(observation);
           log(`Created observation for insight: ${insightDoc.name}`, 'info');
@@ -904,7 +904,7 @@ Provide a JSON response with:
     } 
     // Process single insight document if available
     else if (insightsResults?.insightDocument) {
-      const observation = await this.createInsightDocumentObservation(insightsResults.insightDocument);
+      const observation = this.createInsightDocumentObservation(insightsResults.insightDocument);
       if (observation) {
         observations.push(observation);
       }
@@ -913,7 +913,7 @@ Provide a JSON response with:
     // Process pattern catalog if available
     if (insightsResults?.patternCatalog?.patterns) {
       for (const pattern of insightsResults.patternCatalog.patterns) {
-        const observation = await this.createPatternObservation(pattern);
+        const observation = this.createPatternObservation(pattern);
         if (observation) {
           observations.push(observation);
         }
@@ -923,7 +923,7 @@ Provide a JSON response with:
     return observations;
   }
   
-  private async createInsightDocumentObservation(insightDoc: any): Promise<StructuredObservation | null> {
+  private createInsightDocumentObservation(insightDoc: any): StructuredObservation | null {
     try {
       const currentDate = new Date().toISOString();
       const cleanName = insightDoc.name || 'UnknownInsight';
@@ -1021,7 +1021,7 @@ Provide a JSON response with:
     }
   }
   
-  private async createPatternObservation(pattern: any): Promise<StructuredObservation | null> {
+  private createPatternObservation(pattern: any): StructuredObservation | null {
     try {
       const currentDate = new Date().toISOString();
       const patternName = pattern.name || 'UnknownPattern';
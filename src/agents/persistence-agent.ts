@@ -6,6 +6,7 @@ import { createOntologySystem, type OntologySystem, type UnifiedInferenceEngine
 import { ContentValidationAgent, type EntityValidationReport } from './content-validation-agent.js';
 import { CheckpointManager } from '../utils/checkpoint-manager.js';
 import { SemanticAnalyzer } from './semantic-analyzer.js';
+import { mapWithConcurrency } from '../utils/concurrency.js';
 
 export interface PersistenceResult {
   success: boolean;
@@ -151,16 +152,31 @@ export interface PersistenceAgentConfig {
 }
 
 // Classification cache entry with TTL
+// The cached result is frozen and stored in its final (cache-hit) shape, so hits
+// hand out the same object instead of rebuilding a copy each time
 interface ClassificationCacheEntry {
-  entityType: string;
-  confidence: number;
-  method: string;
-  ontologyMetadata?: any;
-  timestamp: number;
+  result: Readonly<{
+    entityType: string;
+    confidence: number;
+    method: string;
+    ontologyMetadata?: any;
+  }>;
+  timestamp: number;  // performance.now() - monotonic, immune to wall-clock adjustments
 }
 
 // Cache TTL: 5 minutes (classification results are valid within a workflow run)
 const CLASSIFICATION_CACHE_TTL_MS = 5 * 60 * 1000;
+// LRU bound: entries that are never looked up again would otherwise outlive their TTL forever
+const CLASSIFICATION_CACHE_MAX_ENTRIES = parseInt(process.env.CLASSIFICATION_CACHE_MAX_ENTRIES || '1000', 10);
+
+// PROTECTED INFRASTRUCTURE ENTITIES: These should NEVER be re-classified
+// They have fixed types that determine visualization colors and semantic meaning
+// Built once at module load instead of on every store/load of an entity
+const PROTECTED_ENTITY_TYPES: Readonly<Record<string, string>> = Object.freeze({
+  'Coding': 'Project',
+  'CollectiveKnowledge': 'System',
+  // Add other infrastructure entities as needed
+});
 
 export class PersistenceAgent {
   private repositoryPath: string;
@@ -340,20 +356,18 @@ export class PersistenceAgent {
     const cacheKey = entityName;
     const cachedEntry = this.classificationCache.get(cacheKey);
     if (cachedEntry) {
-      const age = Date.now() - cachedEntry.timestamp;
+      const age = performance.now() - cachedEntry.timestamp;
       if (age < CLASSIFICATION_CACHE_TTL_MS) {
         log('Classification cache hit - skipping LLM call', 'info', {
           entityName,
-          entityType: cachedEntry.entityType,
-          confidence: cachedEntry.confidence,
+          entityType: cachedEntry.result.entityType,
+          confidence: cachedEntry.result.confidence,
           cacheAgeMs: age
         });
-        return {
-          entityType: cachedEntry.entityType,
-          confidence: cachedEntry.confidence,
-          method: `${cachedEntry.method}-cached`,
-          ontologyMetadata: cachedEntry.ontologyMetadata
-        };
+        // Re-insert to keep the map in LRU order
+        this.classificationCache.delete(cacheKey);
+        this.classificationCache.set(cacheKey, cachedEntry);
+        return cachedEntry.result;
       } else {
         // Cache expired, remove it
         this.classificationCache.delete(cacheKey);
@@ -404,9 +418,12 @@ export class PersistenceAgent {
 
         // CACHE THE RESULT for future calls
         this.classificationCache.set(cacheKey, {
-          ...result,
-          timestamp: Date.now()
+          result: Object.freeze({ ...result, method: `${result.method}-cached` }),
+          timestamp: performance.now()
         });
+        if (this.classificationCache.size > CLASSIFICATION_CACHE_MAX_ENTRIES) {
+          this.classificationCache.delete(this.classificationCache.keys().next().value!);
+        }
 
         return result;
       } else {
@@ -727,6 +744,7 @@ export class PersistenceAgent {
     sharedMemory: SharedMemoryStructure
   ): Promise<SharedMemoryEntity[]> {
     const createdEntities: SharedMemoryEntity[] = [];
+    const now = new Date().toISOString();
 
     for (const observation of observations) {
       try {
@@ -745,7 +763,7 @@ export class PersistenceAgent {
 
           if (newObservations.length > 0) {
             existingEntity.observations.push(...newObservations);
-            existingEntity.metadata.last_updated = new Date().toISOString();
+            existingEntity.metadata.last_updated = now;
             log(`Updated existing entity: ${observation.name} with ${newObservations.length} new observations`, 'info');
           }
         } else {
@@ -779,11 +797,11 @@ export class PersistenceAgent {
             name: observation.name,
             entityType: observation.entityType,  // Must be classified - no fallbacks
             significance: observation.significance || 5,
-            observations: this.formatObservations(observation.observations),
+            observations: this.formatObservations(observation.observations, now),
             relationships: observation.relationships || [],
             metadata: {
-              created_at: new Date().toISOString(),
-              last_updated: new Date().toISOString(),
+              created_at: now,
+              last_updated: now,
               created_by: 'semantic-analysis-agent',
               version: '1.0',
               team: this.config.ontologyTeam,
@@ -1065,14 +1083,6 @@ export class PersistenceAgent {
         // No insight file exists yet - that's fine
       }
 
-      // PROTECTED INFRASTRUCTURE ENTITIES: These should NEVER be re-classified
-      // They have fixed types that determine visualization colors and semantic meaning
-      const PROTECTED_ENTITY_TYPES: Record<string, string> = {
-        'Coding': 'Project',
-        'CollectiveKnowledge': 'System',
-        // Add other infrastructure entities as needed
-      };
-
       let entityType: string;
       let classification: { entityType: string; confidence: number; method: string; ontologyMetadata?: any };
 
@@ -1233,7 +1243,7 @@ export class PersistenceAgent {
       // Create automatic relationships for graph connectivity
       // HIERARCHICAL STRUCTURE: CollectiveKnowledge -> Projects -> Topics
       // Topics should connect to Projects (not directly to CollectiveKnowledge)
-      const autoRelationships = [...(entity.relationships || [])];
+      const autoRelationships = entity.relationships ? [...entity.relationships] : [];
 
       // Add project relationship if team metadata exists
       // Use capitalized team name (e.g., "coding" -> "Coding") as Project entity name
@@ -1316,19 +1326,24 @@ export class PersistenceAgent {
     };
   }
 
-  private formatObservations(observations: any[]): (string | ObservationObject)[] {
+  private formatObservations(observations: any[], now: string = new Date().toISOString()): (string | ObservationObject)[] {
     return observations.map(obs => {
       if (typeof obs === 'string') {
         return obs;
       }
 
       if (typeof obs === 'object' && obs.content) {
-        return {
+        const formatted: ObservationObject = {
           type: obs.type || 'insight',
           content: obs.content,
-          date: obs.date || new Date().toISOString(),
-          metadata: obs.metadata || {}
+          date: obs.date || now
         };
+        // metadata is optional - only carry it over when present instead of
+        // allocating an empty object for every observation
+        if (obs.metadata) {
+          formatted.metadata = obs.metadata;
+        }
+        return formatted;
       }
 
       // Fallback for unexpected formats
@@ -2502,10 +2517,6 @@ export class PersistenceAgent {
         );
         if (exactMatch) {
           // PROTECTED INFRASTRUCTURE ENTITIES: Enforce correct types
-          const PROTECTED_ENTITY_TYPES: Record<string, string> = {
-            'Coding': 'Project',
-            'CollectiveKnowledge': 'System',
-          };
           const entityName = exactMatch.name || exactMatch.entity_name;
           const protectedType = PROTECTED_ENTITY_TYPES[entityName];
 
@@ -3077,7 +3088,6 @@ export class PersistenceAgent {
       });
 
       // TRACE: Write to file for debugging
-      const fs = await import('fs');
       const traceFile = `${process.cwd()}/logs/persist-trace-${Date.now()}.json`;
       await fs.promises.mkdir(`${process.cwd()}/logs`, { recursive: true });
       await fs.promises.writeFile(traceFile, JSON.stringify({
@@ -3089,7 +3099,7 @@ export class PersistenceAgent {
         entitiesLength: Array.isArray(entities) ? entities.length : 'N/A',
         entitiesSample: Array.isArray(entities) ? entities.slice(0, 2) : null,
         team
-      }, null, 2));
+      }));
       log(`TRACE: persistEntities params written to ${traceFile}`, 'info');
 
       // Handle empty/null/undefined input gracefully
@@ -3111,6 +3121,9 @@ export class PersistenceAgent {
         result.failed += skippedCount;
       }
 
+      // One timestamp for the whole persist call rather than one per entity
+      const currentDate = new Date().toISOString();
+
       // Helper to process a single entity
       const processEntity = async (entity: typeof entities[0]): Promise<'created' | 'updated' | 'failed'> => {
         try {
@@ -3146,7 +3159,6 @@ export class PersistenceAgent {
             }
           } else {
             // Create new entity using storeEntityToGraph (direct GraphDB storage)
-            const currentDate = new Date().toISOString();
             const sharedMemoryEntity: SharedMemoryEntity = {
               id: `entity_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
               name: entity.name,
@@ -3191,22 +3203,24 @@ export class PersistenceAgent {
         }
       };
 
-      // Process in parallel batches
+      // Process through a sliding window of CONCURRENCY workers: each worker picks
+      // up the next entity as soon as its previous one finishes, so one slow
+      // GraphDB write no longer holds back the rest of a fixed batch
       const startTime = Date.now();
-      for (let i = 0; i < validEntities.length; i += CONCURRENCY) {
-        const batch = validEntities.slice(i, i + CONCURRENCY);
-        const batchResults = await Promise.all(batch.map(processEntity));
-
-        for (const r of batchResults) {
-          if (r === 'created') result.created++;
-          else if (r === 'updated') result.updated++;
-          else result.failed++;
+      let completed = 0;
+      await mapWithConcurrency(validEntities, CONCURRENCY, async (entity) => {
+        const r = await processEntity(entity);
+        if (r === 'created') result.created++;
+        else if (r === 'updated') result.updated++;
+        else result.failed++;
+
+        // Progress log every CONCURRENCY completions (and at the end)
+        completed++;
+        if (completed % CONCURRENCY === 0 || completed === validEntities.length) {
+          const progress = Math.round((completed / validEntities.length) * 100);
+          log(`Persistence progress: ${progress}% (${completed}/${validEntities.length})`, 'info');
         }
-
-        // Progress log every batch
-        const progress = Math.min(100, Math.round(((i + batch.length) / validEntities.length) * 100));
-        log(`Persistence progress: ${progress}% (${i + batch.length}/${validEntities.length})`, 'info');
-      }
+      });
       const elapsed = ((Date.now() - startTime) / 1000).toFixed(1);
       log(`Persistence completed in ${elapsed}s`, 'info');
 
@@ -2,6 +2,13 @@ import * as fs from 'fs';
 import * as path from 'path';
 import { log } from '../logging.js';
 import { SemanticAnalyzer } from './semantic-analyzer.js';
+import { extractJsonBlock } from '../utils/json-extraction.js';
+
+// sharp is only needed for PNG validation, so it is loaded on first use and then reused
+let sharpModule: Promise<typeof import('sharp')> | null = null;
+function loadSharp(): Promise<typeof import('sharp')> {
+  return sharpModule ??= import('sharp');
+}
 
 export interface QualityAssuranceReport {
   stepName: string;
@@ -475,7 +482,7 @@ export class QualityAssuranceAgent {
 
         try {
           // Use sharp to analyze the PNG (already a dependency via @xenova/transformers)
-          const sharp = await import('sharp');
+          const sharp = await loadSharp();
           const image = sharp.default(filePath);
           const metadata = await image.metadata();
           const { width, height } = metadata;
@@ -557,44 +564,62 @@ export class QualityAssuranceAgent {
 
     const mdFiles = fs.readdirSync(insightsDir).filter(f => f.endsWith('.md'));
 
-    for (const mdFile of mdFiles) {
-      const mdPath = path.join(insightsDir, mdFile);
-      const content = fs.readFileSync(mdPath, 'utf8');
-
-      // Find all PNG image references: ![...](images/xxx.png)
-      const pngRefs = content.match(/!\[.*?\]\(images\/([^)]+\.png)\)/g) || [];
-      const pumlFallbacks = content.match(/📄 \*\*\[View.*?Diagram Source\]\(puml\/[^)]+\.puml\)\*\*/g) || [];
-
-      // Check if referenced PNGs exist
-      for (const ref of pngRefs) {
-        const match = ref.match(/!\[.*?\]\(images\/([^)]+\.png)\)/);
-        if (match) {
-          const pngName = match[1];
-          const pngPath = path.join(imagesDir, pngName);
-          if (!fs.existsSync(pngPath)) {
-            errors.push(`${mdFile}: Missing PNG file - ${pngName}`);
+    // One listing of the images directory answers the PNG existence checks for every document
+    let imageFiles = new Set<string>();
+    try {
+      imageFiles = new Set(fs.readdirSync(imagesDir));
+    } catch {
+      // No images directory: every reference is missing
+    }
+    const pngExists = (pngName: string) =>
+      pngName.includes('/') ? fs.existsSync(path.join(imagesDir, pngName)) : imageFiles.has(pngName);
+
+    // Read insight documents in parallel batches without blocking the event loop; each batch is
+    // checked in directory order so the reported errors and warnings keep their order
+    const PARALLEL_BATCH_SIZE = 20; // Read 20 documents concurrently
+    for (let i = 0; i < mdFiles.length; i += PARALLEL_BATCH_SIZE) {
+      const batch = mdFiles.slice(i, i + PARALLEL_BATCH_SIZE);
+      const contents = await Promise.all(
+        batch.map(mdFile => fs.promises.readFile(path.join(insightsDir, mdFile), 'utf8'))
+      );
+
+      for (let j = 0; j < batch.length; j++) {
+        const mdFile = batch[j];
+        const content = contents[j];
+
+        // Find all PNG image references: ![...](images/xxx.png)
+        const pngRefs = content.match(/!\[.*?\]\(images\/([^)]+\.png)\)/g) || [];
+        const pumlFallbacks = content.match(/📄 \*\*\[View.*?Diagram Source\]\(puml\/[^)]+\.puml\)\*\*/g) || [];
+
+        // Check if referenced PNGs exist
+        for (const ref of pngRefs) {
+          const match = ref.match(/!\[.*?\]\(images\/([^)]+\.png)\)/);
+          if (match) {
+            const pngName = match[1];
+            if (!pngExists(pngName)) {
+              errors.push(`${mdFile}: Missing PNG file - ${pngName}`);
+            }
           }
         }
-      }
 
-      // Detect inconsistent diagram formatting (mix of PNG and PUML-only references)
-      if (pngRefs.length > 0 && pumlFallbacks.length > 0) {
-        warnings.push(`${mdFile}: Inconsistent diagram formatting - ${pngRefs.length} PNG refs, ${pumlFallbacks.length} PUML-only refs`);
-
-        // Extract which diagrams fell back to PUML-only
-        for (const fallback of pumlFallbacks) {
-          const typeMatch = fallback.match(/View ([^)]+?) Diagram Source/);
-          if (typeMatch) {
-            const diagramType = typeMatch[1];
-            // Check if PNG actually exists for this diagram
-            const baseName = mdFile.replace('.md', '');
-            const expectedPng = `${baseName}_${diagramType.toLowerCase().replace(' ', '-')}.png`;
-            const pngPath = path.join(imagesDir, expectedPng);
-
-            if (fs.existsSync(pngPath)) {
-              errors.push(`${mdFile}: PNG exists but not referenced - ${expectedPng} (should update markdown to use PNG)`);
-            } else {
-              warnings.push(`${mdFile}: ${diagramType} diagram missing PNG - ${expectedPng}`);
+        // Detect inconsistent diagram formatting (mix of PNG and PUML-only references)
+        if (pngRefs.length > 0 && pumlFallbacks.length > 0) {
+          warnings.push(`${mdFile}: Inconsistent diagram formatting - ${pngRefs.length} PNG refs, ${pumlFallbacks.length} PUML-only refs`);
+
+          // Extract which diagrams fell back to PUML-only
+          for (const fallback of pumlFallbacks) {
+            const typeMatch = fallback.match(/View ([^)]+?) Diagram Source/);
+            if (typeMatch) {
+              const diagramType = typeMatch[1];
+              // Check if PNG actually exists for this diagram
+              const baseName = mdFile.replace('.md', '');
+              const expectedPng = `${baseName}_${diagramType.toLowerCase().replace(' ', '-')}.png`;
+
+              if (pngExists(expectedPng)) {
+                errors.push(`${mdFile}: PNG exists but not referenced - ${expectedPng} (should update markdown to use PNG)`);
+              } else {
+                warnings.push(`${mdFile}: ${diagramType} diagram missing PNG - ${expectedPng}`);
+              }
             }
           }
         }
@@ -2415,9 +2440,9 @@ Consider:
         tier: 'premium',
       });
 
-      const jsonMatch = result.insights.match(/\{[\s\S]*\}/);
-      if (jsonMatch) {
-        const parsed = JSON.parse(jsonMatch[0]);
+      const jsonBlock = extractJsonBlock(result.insights);
+      if (jsonBlock) {
+        const parsed = JSON.parse(jsonBlock);
         return {
           action: parsed.action || 'proceed',
           affectedSteps: parsed.affectedSteps || [],
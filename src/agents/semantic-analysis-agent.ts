@@ -1,5 +1,8 @@
 import * as fs from 'fs';
 import * as path from 'path';
+import * as crypto from 'crypto';
+import { execFile } from 'child_process';
+import { promisify } from 'util';
 import Anthropic from "@anthropic-ai/sdk";
 import OpenAI from "openai";
 import Groq from "groq-sdk";
@@ -8,6 +11,177 @@ import { log } from '../logging.js';
 import type { IntelligentQueryResult } from './code-graph-agent.js';
 import { SemanticAnalyzer } from './semantic-analyzer.js';
 import { isMockLLMEnabled, getMockDelay } from '../mock/llm-mock-service.js';
+import { LLMResponseCache, llmResponseCachePath } from '../utils/llm-response-cache.js';
+import { extractJsonBlock } from '../utils/json-extraction.js';
+import { getConfiguredApiKey, getSharedLLMClient } from '../utils/llm-client-pool.js';
+import { mapWithConcurrency } from '../utils/concurrency.js';
+
+// Semantic tier of the analyzeContent cache: reuse responses for paraphrased prompts
+// (needs an OpenAI key for embeddings; exact-match caching is always on)
+const LLM_SEMANTIC_CACHE = process.env.LLM_SEMANTIC_CACHE === 'true';
+const LLM_SEMANTIC_CACHE_THRESHOLD = parseFloat(process.env.LLM_SEMANTIC_CACHE_THRESHOLD || '0.87');
+// Prompts longer than this are not embedded: a truncated embedding only sees the leading
+// instructions and context, so different contents behind them would look identical
+const SEMANTIC_CACHE_MAX_PROMPT_CHARS = 8000;
+const LLM_CACHE_TTL_MS = parseInt(process.env.LLM_CACHE_TTL_MS || '3600000', 10);
+const LLM_CACHE_MAX_ENTRIES = parseInt(process.env.LLM_CACHE_MAX_ENTRIES || '500', 10);
+
+// Shared by every agent instance and persisted under DATA_DIR so restarts start warm
+const sharedResponseCache = new LLMResponseCache({
+  ttlMs: LLM_CACHE_TTL_MS,
+  maxEntries: LLM_CACHE_MAX_ENTRIES,
+  similarityThreshold: LLM_SEMANTIC_CACHE_THRESHOLD,
+  cachePath: llmResponseCachePath('semantic-analysis-cache')
+});
+
+// Response-cache partition for generateLLMInsights (analyzeContent partitions by analysisType)
+const INSIGHTS_CACHE_PARTITION = 'semantic-insights';
+
+const execFileAsync = promisify(execFile);
+
+// analyzeRepository results keyed by working-tree fingerprint, configured providers and options:
+// a repeat call on an unchanged tree within the TTL returns the previous result without
+// re-running the analysis. Mock-mode results are never cached.
+const REPO_ANALYSIS_CACHE_MAX_ENTRIES = parseInt(process.env.REPO_ANALYSIS_CACHE_MAX_ENTRIES || '32', 10);
+const repositoryAnalysisCache = new Map<string, { analysis: any; cachedAt: number }>();
+
+// Model used by each provider's retry wrapper
+const PROVIDER_MODELS = Object.freeze({
+  groq: 'llama-3.3-70b-versatile',
+  gemini: 'gemini-2.0-flash-exp',
+  anthropic: 'claude-sonnet-4-20250514',
+  openai: 'gpt-4',
+});
+type ProviderName = keyof typeof PROVIDER_MODELS;
+
+// Escalation order for insight generation (cheapest/fastest first)
+const PROVIDER_FALLBACK_ORDER: ReadonlyArray<ProviderName> = ['groq', 'gemini', 'anthropic', 'openai'];
+
+// Hedged requests: if the primary provider has not answered after this many ms, race the
+// fallback provider against it (0 disables). The losing call is aborted, but a hedged call
+// can still cost up to 2x provider spend for the tokens it produced before the abort.
+const LLM_HEDGE_MS = parseInt(process.env.LLM_HEDGE_MS || '0', 10);
+
+// One side of a hedged request; `call` must stop (and not retry) once the signal is aborted
+interface HedgedCall {
+  provider: ProviderName;
+  call: (signal?: AbortSignal) => Promise<string>;
+}
+
+// Concurrent provider calls allowed by analyzeContentBatch
+const LLM_BATCH_CONCURRENCY = parseInt(process.env.LLM_BATCH_CONCURRENCY || '8', 10);
+
+// Compiled once at load; these run per file
+const DECISION_POINT_PATTERNS: Record<string, RegExp> = {
+  typescript: /\b(if|else|while|for|switch|case|catch|&&|\|\||\?)\b/g,
+  javascript: /\b(if|else|while|for|switch|case|catch|&&|\|\||\?)\b/g,
+  python: /\b(if|elif|else|while|for|try|except|and|or)\b/g,
+  java: /\b(if|else|while|for|switch|case|catch|&&|\|\||\?)\b/g
+};
+
+// Text fallback for insight responses that are not valid JSON: a sentence fragment starting
+// at a keyword. Shared by every agent instance (tool handlers build a fresh agent per call).
+// Used with matchAll, so each needs the g flag.
+const TEXT_INSIGHT_PATTERNS = Object.freeze({
+  keyPatterns: /(?:pattern)[^.]*/gi,
+  architecturalDecisions: /(?:decision|architecture)[^.]*/gi,
+  technicalDebt: /(?:debt|improvement|refactor)[^.]*/gi,
+  innovativeApproaches: /(?:innovative|creative|novel)[^.]*/gi,
+  learnings: /(?:learning|insight|lesson)[^.]*/gi
+});
+
+// Used with test(), so none of these may carry the g flag
+const ARCHITECTURAL_PATTERN_MATCHERS: ReadonlyArray<{ pattern: string; regex: RegExp }> = [
+  { pattern: 'singleton', regex: /class\s+\w+\s*{[\s\S]*?private\s+static\s+instance/i },
+  { pattern: 'factory', regex: /create\w*\s*\([^)]*\)[\s\S]*?return\s+new/i },
+  { pattern: 'observer', regex: /(addEventListener|subscribe|notify|Observer)/i },
+  { pattern: 'promise', regex: /(Promise|async|await)/i },
+  { pattern: 'decorator', regex: /@\w+/ },
+  { pattern: 'middleware', regex: /(middleware|next\(\)|express)/i },
+  { pattern: 'repository', regex: /Repository|DataAccess/i },
+  { pattern: 'service', regex: /Service|Provider/i },
+  { pattern: 'component', regex: /(React\.|Component|useState|useEffect)/i },
+  { pattern: 'api', regex: /(fetch|axios|http|api)/i }
+];
+
+const LANGUAGE_BY_EXTENSION: Readonly<Record<string, string>> = Object.freeze({
+  '.ts': 'typescript',
+  '.js': 'javascript',
+  '.jsx': 'javascript',
+  '.tsx': 'typescript',
+  '.json': 'json',
+  '.md': 'markdown',
+  '.py': 'python',
+  '.java': 'java',
+  '.cpp': 'cpp',
+  '.c': 'c',
+  '.go': 'go',
+  '.rs': 'rust',
+  '.php': 'php',
+  '.rb': 'ruby',
+  '.yml': 'yaml',
+  '.yaml': 'yaml'
+});
+
+/**
+ * First `limit` items accepted by the predicate, stopping the scan once they are found
+ */
+function takeMatching<T>(items: T[], limit: number, predicate: (item: T) => boolean): T[] {
+  const taken: T[] = [];
+  for (const item of items) {
+    if (taken.length >= limit) break;
+    if (predicate(item)) taken.push(item);
+  }
+  return taken;
+}
+
+// File selection for git-history analysis
+const DEFAULT_INCLUDE_PATTERNS = ['**/*.ts', '**/*.js', '**/*.tsx', '**/*.jsx', '**/*.json', '**/*.md'];
+const DEFAULT_EXCLUDE_PATTERNS = ['node_modules/**', 'dist/**', '.git/**', '**/*.log', '**/package-lock.json', '**/yarn.lock'];
+
+// One alternation regex per glob list, so each file is tested once per list rather than once per pattern
+const globListCache = new Map<string, RegExp>();
+
+function compileGlobList(patterns: string[]): RegExp {
+  const key = patterns.join('\n');
+  let regex = globListCache.get(key);
+  if (!regex) {
+    regex = patterns.length === 0
+      ? /(?!)/
+      : new RegExp(patterns.map(p => `(?:${p.replace(/\*\*/g, '.*').replace(/\*/g, '[^/]*')})`).join('|'));
+    globListCache.set(key, regex);
+  }
+  return regex;
+}
+
+const PATTERN_DESCRIPTIONS: Readonly<Record<string, string>> = Object.freeze({
+  singleton: 'Ensures a class has only one instance',
+  factory: 'Creates objects without specifying exact classes',
+  observer: 'Defines one-to-many dependency between objects',
+  promise: 'Handles asynchronous operations',
+  decorator: 'Adds behavior to objects dynamically',
+  middleware: 'Processes requests in a pipeline',
+  repository: 'Encapsulates data access logic',
+  service: 'Contains business logic',
+  component: 'Reusable UI building blocks',
+  api: 'Handles external communication'
+});
+
+const FUNCTION_PATTERNS: Record<string, RegExp> = {
+  typescript: /(?:function\s+(\w+)|(\w+)\s*\([^)]*\)\s*(?:=>|\{)|(?:async\s+)?(\w+)\s*\([^)]*\)\s*(?:=>|\{))/g,
+  javascript: /(?:function\s+(\w+)|(\w+)\s*\([^)]*\)\s*(?:=>|\{)|(?:async\s+)?(\w+)\s*\([^)]*\)\s*(?:=>|\{))/g,
+  python: /def\s+(\w+)\s*\(/g,
+  java: /(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(\w+)\s*\(/g,
+  default: /function\s+(\w+)|(\w+)\s*\(/g
+};
+
+const IMPORT_PATTERNS: Record<string, RegExp> = {
+  typescript: /import\s+(?:.*?\s+from\s+)?['"`]([^'"`]+)['"`]/g,
+  javascript: /import\s+(?:.*?\s+from\s+)?['"`]([^'"`]+)['"`]/g,
+  python: /(?:from\s+(\S+)\s+import|import\s+([^;\n]+))/g,
+  java: /import\s+([^;\n]+);/g,
+  default: /import\s+['"`]([^'"`]+)['"`]/g
+};
 
 export interface CodeFile {
   path: string;
@@ -72,6 +246,8 @@ export class SemanticAnalysisAgent {
   private anthropicClient: Anthropic | null = null;
   private openaiClient: OpenAI | null = null;
   private repositoryPath: string;
+  private responseCache = sharedResponseCache;
+  private inFlightAnalyses = new Map<string, Promise<any>>();
 
   constructor(repositoryPath: string = '.') {
     this.repositoryPath = repositoryPath;
@@ -95,7 +271,6 @@ export class SemanticAnalysisAgent {
     const docData = options.docAnalysis;
 
     // ULTRA DEBUG: Write input data to trace file (optional, failures are non-fatal)
-    const fs = await import('fs');
     const logsDir = `${process.cwd()}/logs`;
     const traceFile = `${logsDir}/semantic-analysis-trace-${Date.now()}.json`;
     try {
@@ -125,7 +300,7 @@ export class SemanticAnalysisAgent {
           skipped: codeGraph?.skipped || false
         },
         options
-      }, null, 2));
+      }));
       log(`🔍 TRACE: Input data written to ${traceFile}`, 'info');
     } catch (traceError) {
       // Non-fatal: trace file write failure should not abort analysis
@@ -202,40 +377,40 @@ export class SemanticAnalysisAgent {
 
   private initializeClients(): void {
     // Initialize Groq client (primary/default - cheap, fast)
-    const groqKey = process.env.GROQ_API_KEY;
-    if (groqKey && groqKey !== "your-groq-api-key") {
-      this.groqClient = new Groq({
+    const groqKey = getConfiguredApiKey('GROQ_API_KEY');
+    if (groqKey) {
+      this.groqClient = getSharedLLMClient('groq', groqKey, { timeout: SemanticAnalysisAgent.LLM_TIMEOUT_MS }, () => new Groq({
         apiKey: groqKey,
         timeout: SemanticAnalysisAgent.LLM_TIMEOUT_MS,
-      });
+      }));
       log("Groq client initialized for semantic analysis (default provider)", "info");
     }
 
     // Initialize Gemini client (fallback #1 - cheap, good quality)
     // Note: Gemini SDK doesn't support timeout in constructor, handled per-request
-    const googleKey = process.env.GOOGLE_API_KEY;
-    if (googleKey && googleKey !== "your-google-api-key") {
-      this.geminiClient = new GoogleGenerativeAI(googleKey);
+    const googleKey = getConfiguredApiKey('GOOGLE_API_KEY');
+    if (googleKey) {
+      this.geminiClient = getSharedLLMClient('gemini', googleKey, {}, () => new GoogleGenerativeAI(googleKey));
       log("Gemini client initialized for semantic analysis (fallback #1)", "info");
     }
 
     // Initialize Anthropic client (fallback #2)
-    const anthropicKey = process.env.ANTHROPIC_API_KEY;
-    if (anthropicKey && anthropicKey !== "your-anthropic-api-key") {
-      this.anthropicClient = new Anthropic({
+    const anthropicKey = getConfiguredApiKey('ANTHROPIC_API_KEY');
+    if (anthropicKey) {
+      this.anthropicClient = getSharedLLMClient('anthropic', anthropicKey, { timeout: SemanticAnalysisAgent.LLM_TIMEOUT_MS }, () => new Anthropic({
         apiKey: anthropicKey,
         timeout: SemanticAnalysisAgent.LLM_TIMEOUT_MS,
-      });
+      }));
       log("Anthropic client initialized for semantic analysis (fallback #2)", "info");
     }
 
     // Initialize OpenAI client (fallback #3)
-    const openaiKey = process.env.OPENAI_API_KEY;
-    if (openaiKey && openaiKey !== "your-openai-api-key") {
-      this.openaiClient = new OpenAI({
+    const openaiKey = getConfiguredApiKey('OPENAI_API_KEY');
+    if (openaiKey) {
+      this.openaiClient = getSharedLLMClient('openai', openaiKey, { timeout: SemanticAnalysisAgent.LLM_TIMEOUT_MS }, () => new OpenAI({
         apiKey: openaiKey,
         timeout: SemanticAnalysisAgent.LLM_TIMEOUT_MS,
-      });
+      }));
       log("OpenAI client initialized for semantic analysis (fallback #3)", "info");
     }
 
@@ -250,9 +425,11 @@ export class SemanticAnalysisAgent {
   ): string[] {
     const {
       maxFiles = 100, // Increased from 50 to capture more relevant files
-      includePatterns = ['**/*.ts', '**/*.js', '**/*.tsx', '**/*.jsx', '**/*.json', '**/*.md'],
-      excludePatterns = ['node_modules/**', 'dist/**', '.git/**', '**/*.log', '**/package-lock.json', '**/yarn.lock']
+      includePatterns = DEFAULT_INCLUDE_PATTERNS,
+      excludePatterns = DEFAULT_EXCLUDE_PATTERNS
     } = options;
+    const includeRegex = compileGlobList(includePatterns);
+    const excludeRegex = compileGlobList(excludePatterns);
 
     const filesSet = new Set<string>();
 
@@ -270,89 +447,86 @@ export class SemanticAnalysisAgent {
       } : null
     });
 
+    // Collect files until maxFiles unique paths are gathered - later sources
+    // would only be sliced away, so stop scanning (and pattern matching) early
+    const collect = (filePath: string): boolean => {
+      if (filesSet.size >= maxFiles) return true;
+      if (this.shouldIncludeFile(filePath, includeRegex, excludeRegex)) {
+        filesSet.add(filePath);
+      }
+      return filesSet.size >= maxFiles;
+    };
+
     // Extract files from commits
+    let limitReached = false;
     if (gitAnalysis?.commits) {
-      gitAnalysis.commits.forEach((commit: any) => {
-        if (commit.files) {
-          commit.files.forEach((file: any) => {
-            if (this.shouldIncludeFile(file.path, includePatterns, excludePatterns)) {
-              filesSet.add(file.path);
-            }
-          });
+      for (const commit of gitAnalysis.commits) {
+        if (!commit.files) continue;
+        for (const file of commit.files) {
+          if (collect(file.path)) { limitReached = true; break; }
         }
-      });
+        if (limitReached) break;
+      }
     }
 
     // Extract files from architectural decisions
-    if (gitAnalysis?.architecturalDecisions) {
-      gitAnalysis.architecturalDecisions.forEach((decision: any) => {
-        if (decision.files) {
-          decision.files.forEach((filePath: string) => {
-            if (this.shouldIncludeFile(filePath, includePatterns, excludePatterns)) {
-              filesSet.add(filePath);
-            }
-          });
+    if (!limitReached && gitAnalysis?.architecturalDecisions) {
+      for (const decision of gitAnalysis.architecturalDecisions) {
+        if (!decision.files) continue;
+        for (const filePath of decision.files as string[]) {
+          if (collect(filePath)) { limitReached = true; break; }
         }
-      });
+        if (limitReached) break;
+      }
     }
 
-    // Convert to array and limit
-    const files = Array.from(filesSet).slice(0, maxFiles);
+    const files = Array.from(filesSet);
     
-    log(`File extraction: ${filesSet.size} unique files found, analyzing top ${files.length}`, 'info');
+    log(`File extraction: ${files.length} unique files selected${limitReached ? ` (stopped at maxFiles=${maxFiles})` : ''}`, 'info');
     return files;
   }
 
   private shouldIncludeFile(
     filePath: string, 
-    includePatterns: string[], 
-    excludePatterns: string[]
+    includeRegex: RegExp, 
+    excludeRegex: RegExp
   ): boolean {
     // Check exclude patterns first
-    for (const pattern of excludePatterns) {
-      const regex = new RegExp(pattern.replace(/\*\*/g, '.*').replace(/\*/g, '[^/]*'));
-      if (regex.test(filePath)) {
-        return false;
-      }
-    }
-
-    // Check include patterns
-    for (const pattern of includePatterns) {
-      const regex = new RegExp(pattern.replace(/\*\*/g, '.*').replace(/\*/g, '[^/]*'));
-      if (regex.test(filePath)) {
-        return true;
-      }
-    }
-
-    return false;
+    return !excludeRegex.test(filePath) && includeRegex.test(filePath);
   }
 
   private async analyzeCodeFiles(
     filePaths: string[], 
     options: { analysisDepth?: string }
   ): Promise<CodeFile[]> {
-    const codeFiles: CodeFile[] = [];
     const depth = options.analysisDepth || 'deep';
 
-    for (const filePath of filePaths) {
+    // Files are read concurrently with async I/O (the list is capped at maxFiles) so a
+    // large change set never stalls the event loop; results keep the input order
+    const loaded = await Promise.all(filePaths.map(async (filePath): Promise<CodeFile | null> => {
       try {
         const fullPath = path.join(this.repositoryPath, filePath);
-        
-        if (!fs.existsSync(fullPath)) {
-          log(`File not found: ${filePath}`, 'warning');
-          continue;
+
+        let stats: fs.Stats;
+        try {
+          stats = await fs.promises.stat(fullPath);
+        } catch (error: any) {
+          if (error?.code === 'ENOENT') {
+            log(`File not found: ${filePath}`, 'warning');
+            return null;
+          }
+          throw error;
         }
 
-        const stats = fs.statSync(fullPath);
         if (stats.size > 1024 * 1024) { // Skip files > 1MB
           log(`Skipping large file: ${filePath} (${stats.size} bytes)`, 'info');
-          continue;
+          return null;
         }
 
-        const content = fs.readFileSync(fullPath, 'utf8');
+        const content = await fs.promises.readFile(fullPath, 'utf8');
         const language = this.detectLanguage(filePath);
 
-        const codeFile: CodeFile = {
+        return {
           path: filePath,
           content,
           language,
@@ -364,12 +538,12 @@ export class SemanticAnalysisAgent {
           changeType: 'modified' // Default, could be enhanced with git diff analysis
         };
 
-        codeFiles.push(codeFile);
-
       } catch (error) {
         log(`Error analyzing file ${filePath}`, 'warning', error);
+        return null;
       }
-    }
+    }));
+    const codeFiles = loaded.filter((file): file is CodeFile => file !== null);
 
     log(`Code analysis completed: ${codeFiles.length} files processed`, 'info');
     return codeFiles;
@@ -377,26 +551,7 @@ export class SemanticAnalysisAgent {
 
   private detectLanguage(filePath: string): string {
     const ext = path.extname(filePath).toLowerCase();
-    const languageMap: Record<string, string> = {
-      '.ts': 'typescript',
-      '.js': 'javascript',
-      '.jsx': 'javascript',
-      '.tsx': 'typescript',
-      '.json': 'json',
-      '.md': 'markdown',
-      '.py': 'python',
-      '.java': 'java',
-      '.cpp': 'cpp',
-      '.c': 'c',
-      '.go': 'go',
-      '.rs': 'rust',
-      '.php': 'php',
-      '.rb': 'ruby',
-      '.yml': 'yaml',
-      '.yaml': 'yaml'
-    };
-
-    return languageMap[ext] || 'text';
+    return LANGUAGE_BY_EXTENSION[ext] || 'text';
   }
 
   private calculateComplexity(content: string, language: string): number {
@@ -404,14 +559,7 @@ export class SemanticAnalysisAgent {
     let complexity = 1; // Base complexity
 
     // Count decision points based on language
-    const patterns = {
-      typescript: /\b(if|else|while|for|switch|case|catch|&&|\|\||\?)\b/g,
-      javascript: /\b(if|else|while|for|switch|case|catch|&&|\|\||\?)\b/g,
-      python: /\b(if|elif|else|while|for|try|except|and|or)\b/g,
-      java: /\b(if|else|while|for|switch|case|catch|&&|\|\||\?)\b/g
-    };
-
-    const pattern = patterns[language as keyof typeof patterns] || patterns.javascript;
+    const pattern = DECISION_POINT_PATTERNS[language] || DECISION_POINT_PATTERNS.javascript;
     const matches = content.match(pattern);
     
     if (matches) {
@@ -425,20 +573,7 @@ export class SemanticAnalysisAgent {
     const patterns: string[] = [];
 
     // Common architectural patterns
-    const patternMatches = [
-      { pattern: 'singleton', regex: /class\s+\w+\s*{[\s\S]*?private\s+static\s+instance/i },
-      { pattern: 'factory', regex: /create\w*\s*\([^)]*\)[\s\S]*?return\s+new/i },
-      { pattern: 'observer', regex: /(addEventListener|subscribe|notify|Observer)/i },
-      { pattern: 'promise', regex: /(Promise|async|await)/i },
-      { pattern: 'decorator', regex: /@\w+/g },
-      { pattern: 'middleware', regex: /(middleware|next\(\)|express)/i },
-      { pattern: 'repository', regex: /Repository|DataAccess/i },
-      { pattern: 'service', regex: /Service|Provider/i },
-      { pattern: 'component', regex: /(React\.|Component|useState|useEffect)/i },
-      { pattern: 'api', regex: /(fetch|axios|http|api)/i }
-    ];
-
-    for (const { pattern, regex } of patternMatches) {
+    for (const { pattern, regex } of ARCHITECTURAL_PATTERN_MATCHERS) {
       if (regex.test(content)) {
         patterns.push(pattern);
       }
@@ -450,23 +585,9 @@ export class SemanticAnalysisAgent {
   private extractFunctions(content: string, language: string): string[] {
     const functions: string[] = [];
 
-    // Language-specific function extraction
-    let functionRegex: RegExp;
-
-    switch (language) {
-      case 'typescript':
-      case 'javascript':
-        functionRegex = /(?:function\s+(\w+)|(\w+)\s*\([^)]*\)\s*(?:=>|\{)|(?:async\s+)?(\w+)\s*\([^)]*\)\s*(?:=>|\{))/g;
-        break;
-      case 'python':
-        functionRegex = /def\s+(\w+)\s*\(/g;
-        break;
-      case 'java':
-        functionRegex = /(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(\w+)\s*\(/g;
-        break;
-      default:
-        functionRegex = /function\s+(\w+)|(\w+)\s*\(/g;
-    }
+    // Language-specific function extraction (shared global regex, so reset its cursor)
+    const functionRegex = FUNCTION_PATTERNS[language] || FUNCTION_PATTERNS.default;
+    functionRegex.lastIndex = 0;
 
     let match;
     while ((match = functionRegex.exec(content)) !== null) {
@@ -482,23 +603,9 @@ export class SemanticAnalysisAgent {
   private extractImports(content: string, language: string): string[] {
     const imports: string[] = [];
 
-    // Language-specific import extraction
-    let importRegex: RegExp;
-
-    switch (language) {
-      case 'typescript':
-      case 'javascript':
-        importRegex = /import\s+(?:.*?\s+from\s+)?['"`]([^'"`]+)['"`]/g;
-        break;
-      case 'python':
-        importRegex = /(?:from\s+(\S+)\s+import|import\s+([^;\n]+))/g;
-        break;
-      case 'java':
-        importRegex = /import\s+([^;\n]+);/g;
-        break;
-      default:
-        importRegex = /import\s+['"`]([^'"`]+)['"`]/g;
-    }
+    // Language-specific import extraction (shared global regex, so reset its cursor)
+    const importRegex = IMPORT_PATTERNS[language] || IMPORT_PATTERNS.default;
+    importRegex.lastIndex = 0;
 
     let match;
     while ((match = importRegex.exec(content)) !== null) {
@@ -570,20 +677,7 @@ export class SemanticAnalysisAgent {
   }
 
   private getPatternDescription(pattern: string): string {
-    const descriptions: Record<string, string> = {
-      singleton: 'Ensures a class has only one instance',
-      factory: 'Creates objects without specifying exact classes',
-      observer: 'Defines one-to-many dependency between objects',
-      promise: 'Handles asynchronous operations',
-      decorator: 'Adds behavior to objects dynamically',
-      middleware: 'Processes requests in a pipeline',
-      repository: 'Encapsulates data access logic',
-      service: 'Contains business logic',
-      component: 'Reusable UI building blocks',
-      api: 'Handles external communication'
-    };
-
-    return descriptions[pattern] || `${pattern} pattern implementation`;
+    return PATTERN_DESCRIPTIONS[pattern] || `${pattern} pattern implementation`;
   }
 
   private assessCodeQuality(codeFiles: CodeFile[]): { score: number; issues: string[]; recommendations: string[] } {
@@ -848,128 +942,40 @@ export class SemanticAnalysisAgent {
       const analysisPrompt = this.buildAnalysisPrompt(codeFiles, gitAnalysis, vibeAnalysis, crossAnalysis, codeGraph);
 
       // ULTRA DEBUG: Write LLM prompt to trace file
-      const fs2 = await import('fs');
       const promptTraceFile = `${process.cwd()}/logs/semantic-analysis-prompt-${Date.now()}.txt`;
-      await fs2.promises.writeFile(promptTraceFile, `=== LLM PROMPT ===\n${analysisPrompt}\n\n=== END PROMPT ===\n`);
+      await fs.promises.writeFile(promptTraceFile, `=== LLM PROMPT ===\n${analysisPrompt}\n\n=== END PROMPT ===\n`);
       log(`🔍 TRACE: LLM prompt written to ${promptTraceFile}`, 'info');
 
-      let response: string;
-
-      // Try Groq first (default, cheap, low-latency)
-      if (this.groqClient) {
-        try {
-          response = await this.callGroqWithRetry(analysisPrompt);
-        } catch (groqError: any) {
-          log('Groq call failed, trying Gemini fallback', 'warning', {
-            error: groqError.message,
-            status: groqError.status
-          });
-
-          // If Groq fails due to rate limiting, try Gemini
-          if (this.geminiClient && this.isRateLimitError(groqError)) {
-            try {
-              response = await this.callGeminiWithRetry(analysisPrompt);
-            } catch (geminiError: any) {
-              log('Gemini fallback failed, trying Anthropic', 'warning', {
-                error: geminiError.message,
-                status: geminiError.status
-              });
-
-              // If Gemini also fails, try Anthropic
-              if (this.anthropicClient && this.isRateLimitError(geminiError)) {
-                try {
-                  response = await this.callAnthropicWithRetry(analysisPrompt);
-                } catch (anthropicError: any) {
-                  log('Anthropic fallback failed, trying OpenAI', 'warning', {
-                    error: anthropicError.message,
-                    status: anthropicError.status
-                  });
-
-                  // If Anthropic fails, try OpenAI as last resort
-                  if (this.openaiClient && this.isRateLimitError(anthropicError)) {
-                    response = await this.callOpenAIWithRetry(analysisPrompt);
-                  } else {
-                    throw anthropicError;
-                  }
-                }
-              } else {
-                throw geminiError;
-              }
-            }
-          } else {
-            throw groqError;
-          }
-        }
-      } else if (this.geminiClient) {
-        // Fallback #1: Gemini if Groq not available
-        try {
-          response = await this.callGeminiWithRetry(analysisPrompt);
-        } catch (geminiError: any) {
-          log('Gemini call failed, trying Anthropic fallback', 'warning', {
-            error: geminiError.message,
-            status: geminiError.status
-          });
-
-          // If Gemini fails due to rate limiting, try Anthropic
-          if (this.anthropicClient && this.isRateLimitError(geminiError)) {
-            try {
-              response = await this.callAnthropicWithRetry(analysisPrompt);
-            } catch (anthropicError: any) {
-              log('Anthropic fallback failed, trying OpenAI', 'warning', {
-                error: anthropicError.message,
-                status: anthropicError.status
-              });
-
-              // If Anthropic fails, try OpenAI as last resort
-              if (this.openaiClient && this.isRateLimitError(anthropicError)) {
-                response = await this.callOpenAIWithRetry(analysisPrompt);
-              } else {
-                throw anthropicError;
-              }
-            }
-          } else {
-            throw geminiError;
-          }
-        }
-      } else if (this.anthropicClient) {
-        // Fallback #2: Anthropic if neither Groq nor Gemini available
-        try {
-          response = await this.callAnthropicWithRetry(analysisPrompt);
-        } catch (anthropicError: any) {
-          log('Anthropic call failed, trying OpenAI fallback', 'warning', {
-            error: anthropicError.message,
-            status: anthropicError.status
-          });
-
-          // If Anthropic fails due to rate limiting, try OpenAI
-          if (this.openaiClient && this.isRateLimitError(anthropicError)) {
-            response = await this.callOpenAIWithRetry(analysisPrompt);
-          } else {
-            throw anthropicError;
-          }
-        }
-      } else if (this.openaiClient) {
-        // Fallback #3: OpenAI if no other providers available
-        response = await this.callOpenAIWithRetry(analysisPrompt);
-      } else {
-        throw new Error('No LLM client available');
+      // Exact tier only: a re-run over the same set of commits and sessions reuses the earlier
+      // provider response. The semantic tier is not used here because every batch's prompt opens
+      // with the same template and code overview, so batches over different commit ranges embed
+      // almost identically and would be served each other's insights.
+      await this.responseCache.initialize();
+      const cacheKey = LLMResponseCache.normalizedKeyFor(INSIGHTS_CACHE_PARTITION, analysisPrompt);
+      const cachedResponse: string | null = this.responseCache.getExact(cacheKey);
+      if (cachedResponse) {
+        log('Semantic insights served from response cache', 'info', { tier: 'exact' });
+        return this.parseInsightsFromLLMResponse(cachedResponse);
       }
+      this.responseCache.recordMiss();
+
+      const response = await this.callWithProviderFallback(analysisPrompt);
 
       // ULTRA DEBUG: Write LLM response to trace file
-      const fs3 = await import('fs');
       const responseTraceFile = `${process.cwd()}/logs/semantic-analysis-response-${Date.now()}.txt`;
-      await fs3.promises.writeFile(responseTraceFile, `=== LLM RESPONSE ===\n${response}\n\n=== END RESPONSE ===\n`);
+      await fs.promises.writeFile(responseTraceFile, `=== LLM RESPONSE ===\n${response}\n\n=== END RESPONSE ===\n`);
       log(`🔍 TRACE: LLM response written to ${responseTraceFile}`, 'info');
 
+      this.responseCache.set(cacheKey, INSIGHTS_CACHE_PARTITION, response);
       const parsedInsights = this.parseInsightsFromLLMResponse(response);
 
       // ULTRA DEBUG: Write parsed insights to trace file
       const parsedTraceFile = `${process.cwd()}/logs/semantic-analysis-parsed-${Date.now()}.json`;
-      await fs3.promises.writeFile(parsedTraceFile, JSON.stringify({
+      await fs.promises.writeFile(parsedTraceFile, JSON.stringify({
         timestamp: new Date().toISOString(),
         phase: 'PARSED_INSIGHTS',
         parsedInsights
-      }, null, 2));
+      }));
       log(`🔍 TRACE: Parsed insights written to ${parsedTraceFile}`, 'info');
 
       return parsedInsights;
@@ -980,6 +986,42 @@ export class SemanticAnalysisAgent {
     }
   }
 
+  /**
+   * Provider chain for insight generation: start at the first configured provider in
+   * PROVIDER_FALLBACK_ORDER and move to the next one only when that one is configured
+   * and the failure was a rate limit
+   */
+  private async callWithProviderFallback(prompt: string): Promise<string> {
+    const callers: Record<ProviderName, ((prompt: string) => Promise<string>) | null> = {
+      groq: this.groqClient ? p => this.callGroqWithRetry(p) : null,
+      gemini: this.geminiClient ? p => this.callGeminiWithRetry(p) : null,
+      anthropic: this.anthropicClient ? p => this.callAnthropicWithRetry(p) : null,
+      openai: this.openaiClient ? p => this.callOpenAIWithRetry(p) : null
+    };
+
+    let index = PROVIDER_FALLBACK_ORDER.findIndex(provider => callers[provider]);
+    if (index === -1) {
+      throw new Error('No LLM client available');
+    }
+
+    for (;;) {
+      const provider = PROVIDER_FALLBACK_ORDER[index];
+      try {
+        return await callers[provider]!(prompt);
+      } catch (error: any) {
+        const next = PROVIDER_FALLBACK_ORDER[index + 1];
+        if (!next || !callers[next] || !this.isRateLimitError(error)) {
+          throw error;
+        }
+        log(`${provider} call rate limited, trying ${next} fallback`, 'warning', {
+          error: error.message,
+          status: error.status
+        });
+        index++;
+      }
+    }
+  }
+
   /**
    * Check if an error is a rate limit error
    */
@@ -998,49 +1040,30 @@ export class SemanticAnalysisAgent {
   }
 
   /**
-   * Call Groq with exponential backoff retry
-   * Using llama-3.3-70b-versatile: cheap, low-latency model
+   * Shared retry loop for the provider calls: exponential backoff on rate limits, no retry otherwise.
+   * Once `signal` is aborted no further attempt is made.
    */
-  private async callGroqWithRetry(prompt: string, maxRetries: number = 3): Promise<string> {
+  private async callWithRetry(
+    providerName: string,
+    maxRetries: number,
+    call: (attempt: number) => Promise<string>,
+    signal?: AbortSignal
+  ): Promise<string> {
     let lastError: any;
 
     for (let attempt = 0; attempt < maxRetries; attempt++) {
       try {
-        log(`Calling Groq API (attempt ${attempt + 1}/${maxRetries})`, 'info');
-
-        const result = await this.groqClient!.chat.completions.create({
-          model: "llama-3.3-70b-versatile", // Cheap, low-latency model
-          max_tokens: 4096,
-          messages: [{ role: "user", content: prompt }],
-          temperature: 0.7
-        });
-
-        const response = result.choices[0]?.message?.content || '';
-        const usage = result.usage;
-
-        // Record LLM metrics for workflow tracking
-        if (usage) {
-          SemanticAnalyzer.recordMetricsFromExternal({
-            provider: 'groq',
-            model: 'llama-3.3-70b-versatile',
-            inputTokens: usage.prompt_tokens || 0,
-            outputTokens: usage.completion_tokens || 0,
-            totalTokens: usage.total_tokens || 0,
-          });
-        }
-
-        log(`Groq API call successful`, 'info', {
-          responseLength: response.length,
-          attempt: attempt + 1,
-          model: "llama-3.3-70b-versatile",
-          tokens: usage?.total_tokens
-        });
-
-        return response;
+        log(`Calling ${providerName} API (attempt ${attempt + 1}/${maxRetries})`, 'info');
+        return await call(attempt);
 
       } catch (error: any) {
         lastError = error;
 
+        if (signal?.aborted) {
+          log(`${providerName} API call aborted`, 'info', { attempt: attempt + 1 });
+          break;
+        }
+
         if (this.isRateLimitError(error)) {
           const backoffMs = Math.min(1000 * Math.pow(2, attempt), 30000); // Max 30 seconds
           log(`Rate limited, retrying in ${backoffMs}ms`, 'warning', {
@@ -1057,7 +1080,7 @@ export class SemanticAnalysisAgent {
         }
 
         // For non-rate-limit errors, don't retry
-        log(`Groq API call failed`, 'error', {
+        log(`${providerName} API call failed`, 'error', {
           attempt: attempt + 1,
           error: error.message,
           status: error.status
@@ -1070,217 +1093,158 @@ export class SemanticAnalysisAgent {
   }
 
   /**
-   * Call Gemini with exponential backoff retry
-   * Using gemini-2.0-flash-exp: cheap, fast model with good quality
+   * Call Groq with exponential backoff retry
+   * Using llama-3.3-70b-versatile: cheap, low-latency model
    */
-  private async callGeminiWithRetry(prompt: string, maxRetries: number = 3): Promise<string> {
-    let lastError: any;
-
-    for (let attempt = 0; attempt < maxRetries; attempt++) {
-      try {
-        log(`Calling Gemini API (attempt ${attempt + 1}/${maxRetries})`, 'info');
-
-        const model = this.geminiClient!.getGenerativeModel({ model: "gemini-2.0-flash-exp" });
-
-        // Wrap Gemini call with timeout since SDK doesn't support it natively
-        const timeoutPromise = new Promise<never>((_, reject) => {
-          setTimeout(() => reject(new Error(`Gemini API timeout after ${SemanticAnalysisAgent.LLM_TIMEOUT_MS}ms`)), SemanticAnalysisAgent.LLM_TIMEOUT_MS);
-        });
-
-        const result = await Promise.race([
-          model.generateContent(prompt),
-          timeoutPromise
-        ]);
-        const response = result.response.text();
-        const usageMetadata = result.response.usageMetadata;
-
-        // Record LLM metrics for workflow tracking
-        if (usageMetadata) {
-          SemanticAnalyzer.recordMetricsFromExternal({
-            provider: 'gemini',
-            model: 'gemini-2.0-flash-exp',
-            inputTokens: usageMetadata.promptTokenCount || 0,
-            outputTokens: usageMetadata.candidatesTokenCount || 0,
-            totalTokens: usageMetadata.totalTokenCount || 0,
-          });
-        }
-
-        log(`Gemini API call successful`, 'info', {
-          responseLength: response.length,
-          attempt: attempt + 1,
-          model: "gemini-2.0-flash-exp",
-          tokens: usageMetadata?.totalTokenCount
+  private async callGroqWithRetry(prompt: string, maxRetries: number = 3, signal?: AbortSignal): Promise<string> {
+    const model = PROVIDER_MODELS.groq;
+    return this.callWithRetry('Groq', maxRetries, async (attempt) => {
+      const result = await this.groqClient!.chat.completions.create({
+        model, // Cheap, low-latency model
+        max_tokens: 4096,
+        messages: [{ role: "user", content: prompt }],
+        temperature: 0.7
+      }, { signal });
+
+      const response = result.choices[0]?.message?.content || '';
+      const usage = result.usage;
+
+      // Record LLM metrics for workflow tracking
+      if (usage) {
+        SemanticAnalyzer.recordMetricsFromExternal({
+          provider: 'groq',
+          model,
+          inputTokens: usage.prompt_tokens || 0,
+          outputTokens: usage.completion_tokens || 0,
+          totalTokens: usage.total_tokens || 0,
         });
+      }
 
-        return response;
-
-      } catch (error: any) {
-        lastError = error;
+      log(`Groq API call successful`, 'info', {
+        responseLength: response.length,
+        attempt: attempt + 1,
+        model,
+        tokens: usage?.total_tokens
+      });
 
-        if (this.isRateLimitError(error)) {
-          const backoffMs = Math.min(1000 * Math.pow(2, attempt), 30000); // Max 30 seconds
-          log(`Rate limited, retrying in ${backoffMs}ms`, 'warning', {
-            attempt: attempt + 1,
-            maxRetries,
-            status: error.status,
-            backoffMs
-          });
+      return response;
+    }, signal);
+  }
 
-          if (attempt < maxRetries - 1) {
-            await this.sleep(backoffMs);
-            continue;
-          }
-        }
+  /**
+   * Call Gemini with exponential backoff retry
+   * Using gemini-2.0-flash-exp: cheap, fast model with good quality
+   */
+  private async callGeminiWithRetry(prompt: string, maxRetries: number = 3, signal?: AbortSignal): Promise<string> {
+    const modelName = PROVIDER_MODELS.gemini;
+    return this.callWithRetry('Gemini', maxRetries, async (attempt) => {
+      const model = this.geminiClient!.getGenerativeModel({ model: modelName });
+
+      // Wrap Gemini call with timeout since SDK doesn't support it natively
+      let timeoutHandle: NodeJS.Timeout | undefined;
+      const timeoutPromise = new Promise<never>((_, reject) => {
+        timeoutHandle = setTimeout(() => reject(new Error(`Gemini API timeout after ${SemanticAnalysisAgent.LLM_TIMEOUT_MS}ms`)), SemanticAnalysisAgent.LLM_TIMEOUT_MS);
+      });
 
-        // For non-rate-limit errors, don't retry
-        log(`Gemini API call failed`, 'error', {
-          attempt: attempt + 1,
-          error: error.message,
-          status: error.status
+      const result = await Promise.race([
+        model.generateContent(prompt, { signal }),
+        timeoutPromise
+      ]).finally(() => clearTimeout(timeoutHandle));
+      const response = result.response.text();
+      const usageMetadata = result.response.usageMetadata;
+
+      // Record LLM metrics for workflow tracking
+      if (usageMetadata) {
+        SemanticAnalyzer.recordMetricsFromExternal({
+          provider: 'gemini',
+          model: modelName,
+          inputTokens: usageMetadata.promptTokenCount || 0,
+          outputTokens: usageMetadata.candidatesTokenCount || 0,
+          totalTokens: usageMetadata.totalTokenCount || 0,
         });
-        break;
       }
-    }
 
-    throw lastError;
+      log(`Gemini API call successful`, 'info', {
+        responseLength: response.length,
+        attempt: attempt + 1,
+        model: modelName,
+        tokens: usageMetadata?.totalTokenCount
+      });
+
+      return response;
+    }, signal);
   }
 
   /**
    * Call Anthropic with exponential backoff retry
    */
-  private async callAnthropicWithRetry(prompt: string, maxRetries: number = 3): Promise<string> {
-    let lastError: any;
-    
-    for (let attempt = 0; attempt < maxRetries; attempt++) {
-      try {
-        log(`Calling Anthropic API (attempt ${attempt + 1}/${maxRetries})`, 'info');
-        
-        const result = await this.anthropicClient!.messages.create({
-          model: "claude-sonnet-4-20250514",
-          max_tokens: 4096,
-          messages: [{ role: "user", content: prompt }]
-        });
-        
-        const response = result.content[0].type === 'text' ? result.content[0].text : '';
-        const usage = result.usage;
-
-        // Record LLM metrics for workflow tracking
-        if (usage) {
-          SemanticAnalyzer.recordMetricsFromExternal({
-            provider: 'anthropic',
-            model: 'claude-sonnet-4-20250514',
-            inputTokens: usage.input_tokens || 0,
-            outputTokens: usage.output_tokens || 0,
-            totalTokens: (usage.input_tokens || 0) + (usage.output_tokens || 0),
-          });
-        }
-
-        log(`Anthropic API call successful`, 'info', {
-          responseLength: response.length,
-          attempt: attempt + 1,
-          tokens: usage ? usage.input_tokens + usage.output_tokens : undefined
+  private async callAnthropicWithRetry(prompt: string, maxRetries: number = 3, signal?: AbortSignal): Promise<string> {
+    const model = PROVIDER_MODELS.anthropic;
+    return this.callWithRetry('Anthropic', maxRetries, async (attempt) => {
+      const result = await this.anthropicClient!.messages.create({
+        model,
+        max_tokens: 4096,
+        messages: [{ role: "user", content: prompt }]
+      }, { signal });
+
+      const response = result.content[0].type === 'text' ? result.content[0].text : '';
+      const usage = result.usage;
+
+      // Record LLM metrics for workflow tracking
+      if (usage) {
+        SemanticAnalyzer.recordMetricsFromExternal({
+          provider: 'anthropic',
+          model,
+          inputTokens: usage.input_tokens || 0,
+          outputTokens: usage.output_tokens || 0,
+          totalTokens: (usage.input_tokens || 0) + (usage.output_tokens || 0),
         });
+      }
 
-        return response;
-
-      } catch (error: any) {
-        lastError = error;
-
-        if (this.isRateLimitError(error)) {
-          const backoffMs = Math.min(1000 * Math.pow(2, attempt), 30000); // Max 30 seconds
-          log(`Rate limited, retrying in ${backoffMs}ms`, 'warning', {
-            attempt: attempt + 1,
-            maxRetries,
-            status: error.status,
-            backoffMs
-          });
+      log(`Anthropic API call successful`, 'info', {
+        responseLength: response.length,
+        attempt: attempt + 1,
+        tokens: usage ? usage.input_tokens + usage.output_tokens : undefined
+      });
 
-          if (attempt < maxRetries - 1) {
-            await this.sleep(backoffMs);
-            continue;
-          }
-        }
-        
-        // For non-rate-limit errors, don't retry
-        log(`Anthropic API call failed`, 'error', {
-          attempt: attempt + 1,
-          error: error.message,
-          status: error.status
-        });
-        break;
-      }
-    }
-    
-    throw lastError;
+      return response;
+    }, signal);
   }
 
   /**
    * Call OpenAI with exponential backoff retry
    */
   private async callOpenAIWithRetry(prompt: string, maxRetries: number = 3): Promise<string> {
-    let lastError: any;
-    
-    for (let attempt = 0; attempt < maxRetries; attempt++) {
-      try {
-        log(`Calling OpenAI API (attempt ${attempt + 1}/${maxRetries})`, 'info');
-        
-        const result = await this.openaiClient!.chat.completions.create({
-          model: "gpt-4",
-          max_tokens: 2000,
-          messages: [{ role: "user", content: prompt }]
-        });
-        
-        const response = result.choices[0]?.message?.content || '';
-        const usage = result.usage;
-
-        // Record LLM metrics for workflow tracking
-        if (usage) {
-          SemanticAnalyzer.recordMetricsFromExternal({
-            provider: 'openai',
-            model: 'gpt-4',
-            inputTokens: usage.prompt_tokens || 0,
-            outputTokens: usage.completion_tokens || 0,
-            totalTokens: usage.total_tokens || 0,
-          });
-        }
+    const model = PROVIDER_MODELS.openai;
+    return this.callWithRetry('OpenAI', maxRetries, async (attempt) => {
+      const result = await this.openaiClient!.chat.completions.create({
+        model,
+        max_tokens: 2000,
+        messages: [{ role: "user", content: prompt }]
+      });
 
-        log(`OpenAI API call successful`, 'info', {
-          responseLength: response.length,
-          attempt: attempt + 1,
-          tokens: usage?.total_tokens
+      const response = result.choices[0]?.message?.content || '';
+      const usage = result.usage;
+
+      // Record LLM metrics for workflow tracking
+      if (usage) {
+        SemanticAnalyzer.recordMetricsFromExternal({
+          provider: 'openai',
+          model,
+          inputTokens: usage.prompt_tokens || 0,
+          outputTokens: usage.completion_tokens || 0,
+          totalTokens: usage.total_tokens || 0,
         });
+      }
 
-        return response;
-
-      } catch (error: any) {
-        lastError = error;
-
-        if (this.isRateLimitError(error)) {
-          const backoffMs = Math.min(1000 * Math.pow(2, attempt), 30000); // Max 30 seconds
-          log(`Rate limited, retrying in ${backoffMs}ms`, 'warning', {
-            attempt: attempt + 1,
-            maxRetries,
-            status: error.status,
-            backoffMs
-          });
+      log(`OpenAI API call successful`, 'info', {
+        responseLength: response.length,
+        attempt: attempt + 1,
+        tokens: usage?.total_tokens
+      });
 
-          if (attempt < maxRetries - 1) {
-            await this.sleep(backoffMs);
-            continue;
-          }
-        }
-        
-        // For non-rate-limit errors, don't retry
-        log(`OpenAI API call failed`, 'error', {
-          attempt: attempt + 1,
-          error: error.message,
-          status: error.status
-        });
-        break;
-      }
-    }
-    
-    throw lastError;
+      return response;
+    });
   }
 
   private buildAnalysisPrompt(
@@ -1304,7 +1268,7 @@ export class SemanticAnalysisAgent {
       .slice(0, 30)
       .map((c: any) => ({
         message: c.message,
-        files: c.files?.map((f: any) => f.path).slice(0, 5),
+        files: c.files?.slice(0, 5).map((f: any) => f.path),
         changes: c.stats?.totalChanges || 0,
         date: c.date
       }));
@@ -1371,10 +1335,10 @@ export class SemanticAnalysisAgent {
 
       codeGraphSection = `
 === CODE GRAPH (AST Analysis) ===
-Summary: ${JSON.stringify(entitySummary, null, 2)}
+Summary: ${JSON.stringify(entitySummary)}
 
 Top Entities (functions, classes, methods with call relationships):
-${JSON.stringify(topEntities, null, 2)}
+${JSON.stringify(topEntities)}
 `;
     }
 
@@ -1398,23 +1362,23 @@ None`;
     return `Analyze this software development project and provide comprehensive insights.
 
 === CODE ANALYSIS (${codeFiles.length} files analyzed) ===
-${JSON.stringify(codeOverview, null, 2)}
+${JSON.stringify(codeOverview)}
 
 === RECENT COMMIT HISTORY (${gitAnalysis?.commits?.length || 0} total commits) ===
-${JSON.stringify(recentCommits, null, 2)}
+${JSON.stringify(recentCommits)}
 
 === ARCHITECTURAL DECISIONS (${gitAnalysis?.architecturalDecisions?.length || 0} identified) ===
-${JSON.stringify(architecturalDecisions, null, 2)}
+${JSON.stringify(architecturalDecisions)}
 
 === CODE EVOLUTION PATTERNS ===
-${JSON.stringify(codeEvolution, null, 2)}
+${JSON.stringify(codeEvolution)}
 ${codeGraphSection}
 === DEVELOPMENT SESSIONS (${vibeAnalysis?.sessions?.length || 0} sessions) ===
 Problem-Solution Pairs:
-${JSON.stringify(problemSolutions, null, 2)}
+${JSON.stringify(problemSolutions)}
 
 Development Themes:
-${JSON.stringify(devThemes, null, 2)}
+${JSON.stringify(devThemes)}
 
 ${crossAnalysisSection}
 
@@ -1481,9 +1445,9 @@ QUALITY RULES:
   private parseInsightsFromLLMResponse(response: string): SemanticAnalysisResult['semanticInsights'] {
     try {
       // Try to extract JSON from response
-      const jsonMatch = response.match(/\{[\s\S]*\}/);
-      if (jsonMatch) {
-        const parsed = JSON.parse(jsonMatch[0]);
+      const jsonBlock = extractJsonBlock(response);
+      if (jsonBlock) {
+        const parsed = JSON.parse(jsonBlock);
 
         // Handle new structured format
         if (parsed.patterns || parsed.learnings) {
@@ -1511,11 +1475,11 @@ QUALITY RULES:
 
     // Fallback: extract insights from text
     return {
-      keyPatterns: this.extractPatternFromText(response, 'pattern'),
-      architecturalDecisions: this.extractPatternFromText(response, 'decision|architecture'),
-      technicalDebt: this.extractPatternFromText(response, 'debt|improvement|refactor'),
-      innovativeApproaches: this.extractPatternFromText(response, 'innovative|creative|novel'),
-      learnings: this.extractPatternFromText(response, 'learning|insight|lesson')
+      keyPatterns: this.extractPatternFromText(response, TEXT_INSIGHT_PATTERNS.keyPatterns),
+      architecturalDecisions: this.extractPatternFromText(response, TEXT_INSIGHT_PATTERNS.architecturalDecisions),
+      technicalDebt: this.extractPatternFromText(response, TEXT_INSIGHT_PATTERNS.technicalDebt),
+      innovativeApproaches: this.extractPatternFromText(response, TEXT_INSIGHT_PATTERNS.innovativeApproaches),
+      learnings: this.extractPatternFromText(response, TEXT_INSIGHT_PATTERNS.learnings)
     };
   }
 
@@ -1523,72 +1487,90 @@ QUALITY RULES:
    * Convert structured pattern objects to rich observation strings
    */
   private convertStructuredPatterns(patterns: any[]): string[] {
-    return patterns
-      .filter(p => p.name && p.codeExample) // Must have name and code example
-      .map(p => {
-        const parts = [`${p.name}:`];
-        if (p.problem) parts.push(`Problem: ${p.problem}`);
-        if (p.solution) parts.push(`Solution: ${p.solution}`);
-        if (p.codeExample) parts.push(`Example: ${p.codeExample}`);
-        if (p.doRules?.length) parts.push(`DO: ${p.doRules.join('; ')}`);
-        if (p.dontRules?.length) parts.push(`DON'T: ${p.dontRules.join('; ')}`);
-        if (p.evidence?.length) parts.push(`Evidence: ${p.evidence.slice(0, 2).join(', ')}`);
-        return parts.join(' | ');
-      });
+    const observations: string[] = [];
+    for (const p of this.asStructuredList(patterns)) {
+      if (!p.name || !p.codeExample) continue; // Must have name and code example
+      const parts = [`${p.name}:`];
+      if (p.problem) parts.push(`Problem: ${p.problem}`);
+      if (p.solution) parts.push(`Solution: ${p.solution}`);
+      parts.push(`Example: ${p.codeExample}`);
+      if (p.doRules?.length) parts.push(`DO: ${p.doRules.join('; ')}`);
+      if (p.dontRules?.length) parts.push(`DON'T: ${p.dontRules.join('; ')}`);
+      if (p.evidence?.length) parts.push(`Evidence: ${p.evidence.slice(0, 2).join(', ')}`);
+      observations.push(parts.join(' | '));
+    }
+    return observations;
   }
 
   /**
    * Convert structured decision objects to rich observation strings
    */
   private convertStructuredDecisions(decisions: any[]): string[] {
-    return decisions
-      .filter(d => d.name && (d.decision || d.rationale))
-      .map(d => {
-        const parts = [`${d.name}:`];
-        if (d.decision) parts.push(`Decision: ${d.decision}`);
-        if (d.rationale) parts.push(`Rationale: ${d.rationale}`);
-        if (d.codeExample) parts.push(`Example: ${d.codeExample}`);
-        if (d.tradeoffs?.length) parts.push(`Tradeoffs: ${d.tradeoffs.join('; ')}`);
-        if (d.evidence?.length) parts.push(`Evidence: ${d.evidence.slice(0, 2).join(', ')}`);
-        return parts.join(' | ');
-      });
+    const observations: string[] = [];
+    for (const d of this.asStructuredList(decisions)) {
+      if (!d.name || !(d.decision || d.rationale)) continue;
+      const parts = [`${d.name}:`];
+      if (d.decision) parts.push(`Decision: ${d.decision}`);
+      if (d.rationale) parts.push(`Rationale: ${d.rationale}`);
+      if (d.codeExample) parts.push(`Example: ${d.codeExample}`);
+      if (d.tradeoffs?.length) parts.push(`Tradeoffs: ${d.tradeoffs.join('; ')}`);
+      if (d.evidence?.length) parts.push(`Evidence: ${d.evidence.slice(0, 2).join(', ')}`);
+      observations.push(parts.join(' | '));
+    }
+    return observations;
   }
 
   /**
    * Convert structured debt objects to rich observation strings
    */
   private convertStructuredDebt(debt: any[]): string[] {
-    return debt
-      .filter(d => d.name && d.issue)
-      .map(d => {
-        const parts = [`${d.name}:`];
-        if (d.issue) parts.push(`Issue: ${d.issue}`);
-        if (d.location) parts.push(`Location: ${d.location}`);
-        if (d.suggestedFix) parts.push(`Fix: ${d.suggestedFix}`);
-        if (d.priority) parts.push(`Priority: ${d.priority}`);
-        return parts.join(' | ');
-      });
+    const observations: string[] = [];
+    for (const d of this.asStructuredList(debt)) {
+      if (!d.name || !d.issue) continue;
+      const parts = [`${d.name}:`, `Issue: ${d.issue}`];
+      if (d.location) parts.push(`Location: ${d.location}`);
+      if (d.suggestedFix) parts.push(`Fix: ${d.suggestedFix}`);
+      if (d.priority) parts.push(`Priority: ${d.priority}`);
+      observations.push(parts.join(' | '));
+    }
+    return observations;
   }
 
   /**
    * Convert structured learning objects to rich observation strings
    */
   private convertStructuredLearnings(learnings: any[]): string[] {
-    return learnings
-      .filter(l => l.name && (l.insight || l.codeExample))
-      .map(l => {
-        const parts = [`${l.name}:`];
-        if (l.insight) parts.push(`Insight: ${l.insight}`);
-        if (l.codeExample) parts.push(`Example: ${l.codeExample}`);
-        if (l.applicability) parts.push(`When: ${l.applicability}`);
-        return parts.join(' | ');
-      });
+    const observations: string[] = [];
+    for (const l of this.asStructuredList(learnings)) {
+      if (!l.name || !(l.insight || l.codeExample)) continue;
+      const parts = [`${l.name}:`];
+      if (l.insight) parts.push(`Insight: ${l.insight}`);
+      if (l.codeExample) parts.push(`Example: ${l.codeExample}`);
+      if (l.applicability) parts.push(`When: ${l.applicability}`);
+      observations.push(parts.join(' | '));
+    }
+    return observations;
   }
 
-  private extractPatternFromText(text: string, pattern: string): string[] {
-    const regex = new RegExp(`(?:${pattern})[^.]*`, 'gi');
-    const matches = text.match(regex);
-    return matches ? matches.slice(0, 5) : [];
+  /**
+   * Guard for the structured converters: a non-array field means the response does not follow
+   * the schema, so throw and let the caller fall back to text extraction
+   */
+  private asStructuredList(value: any): any[] {
+    if (!Array.isArray(value)) {
+      throw new TypeError('Structured insight field is not an array');
+    }
+    return value;
+  }
+
+  private extractPatternFromText(text: string, regex: RegExp): string[] {
+    // matchAll is lazy, so scanning stops at the fifth match
+    const matches: string[] = [];
+    for (const match of text.matchAll(regex)) {
+      matches.push(match[0]);
+      if (matches.length === 5) break;
+    }
+    return matches;
   }
 
   private generateRuleBasedInsights(
@@ -1602,23 +1584,27 @@ QUALITY RULES:
       ? [...new Set(codeFiles.flatMap(f => f.patterns))]
       : (gitAnalysis?.patterns || []).map((p: any) => p.name || p);
     
+    // Only the first few entries of each list are kept: select them before formatting,
+    // so long commit/session histories are not formatted in full just to be sliced away
     const architecturalDecisions = gitAnalysis?.architecturalDecisions
-      ?.map((d: any) => `${d.type || 'Decision'}: ${d.description || d}`)
-      .slice(0, 5) || [];
+      ?.slice(0, 5)
+      .map((d: any) => `${d.type || 'Decision'}: ${d.description || d}`) || [];
 
     // Get technical debt from code analysis or git commits
     const technicalDebt = codeFiles?.length > 0
-      ? codeFiles.filter(f => f.complexity > 15)
-          .map(f => `High complexity in ${f.path} (${f.complexity})`).slice(0, 3)
-      : gitAnalysis?.commits?.filter((c: any) => c.message?.includes('fix') || c.message?.includes('refactor'))
-          .map((c: any) => `Technical fix: ${c.message?.substring(0, 50)}...`).slice(0, 3) || [];
+      ? takeMatching(codeFiles, 3, f => f.complexity > 15)
+          .map(f => `High complexity in ${f.path} (${f.complexity})`)
+      : gitAnalysis?.commits
+        ? takeMatching(gitAnalysis.commits, 3, (c: any) => c.message?.includes('fix') || c.message?.includes('refactor'))
+            .map((c: any) => `Technical fix: ${c.message?.substring(0, 50)}...`)
+        : [];
 
     // Generate insights from conversation analysis
     const innovativeApproaches = crossAnalysis?.conversationImplementationMap?.length > 0
       ? crossAnalysis.conversationImplementationMap
-          .map((m: any) => `Implemented ${m.implementation?.join(', ') || 'solution'} for: ${m.problem}`)
           .slice(0, 3)
-      : vibeAnalysis?.sessions?.map((s: any) => `Development insight from session: ${s.content?.substring(0, 50)}...`).slice(0, 3) || [];
+          .map((m: any) => `Implemented ${m.implementation?.join(', ') || 'solution'} for: ${m.problem}`)
+      : vibeAnalysis?.sessions?.slice(0, 3).map((s: any) => `Development insight from session: ${s.content?.substring(0, 50)}...`) || [];
 
     // Generate meaningful learnings even without code files
     const learnings = [];
@@ -1740,46 +1726,35 @@ QUALITY RULES:
     }
 
     try {
-      // Build the full prompt with context if provided
-      let fullPrompt = content;
-      if (context && typeof context === 'object' && context.context) {
-        fullPrompt = `${context.context}\n\n${content}`;
+      // Hash context and content as separate parts: the concatenated prompt (a full copy of
+      // potentially large content) is only built once the exact tier has missed.
+      // Keys use whitespace-normalized text so reformatted content still hits the exact tier.
+      const promptContext: string | null =
+        context && typeof context === 'object' && context.context ? String(context.context) : null;
+      const cachePartition = analysisType || 'general';
+      const cacheKey = promptContext
+        ? LLMResponseCache.normalizedKeyFor(cachePartition, promptContext, content)
+        : LLMResponseCache.normalizedKeyFor(cachePartition, content);
+      await this.responseCache.initialize();
+      const exactHit = this.responseCache.getExact(cacheKey);
+      if (exactHit) {
+        log('analyzeContent served from response cache (exact)', 'info', { analysisType: cachePartition });
+        return exactHit;
       }
 
-      // Call LLM with the actual prompt using the same logic as generateLLMInsights
-      let response: string;
-
-      if (this.groqClient) {
-        try {
-          response = await this.callGroqWithRetry(fullPrompt);
-        } catch (groqError: any) {
-          if (this.geminiClient && this.isRateLimitError(groqError)) {
-            response = await this.callGeminiWithRetry(fullPrompt);
-          } else if (this.anthropicClient) {
-            response = await this.callAnthropicWithRetry(fullPrompt);
-          } else {
-            throw groqError;
-          }
-        }
-      } else if (this.geminiClient) {
-        response = await this.callGeminiWithRetry(fullPrompt);
-      } else if (this.anthropicClient) {
-        response = await this.callAnthropicWithRetry(fullPrompt);
-      } else if (this.openaiClient) {
-        response = await this.callOpenAIWithRetry(fullPrompt);
-      } else {
-        throw new Error('No LLM client available');
+      // Single-flight per key: a burst of identical prompts (e.g. parallel insight steps)
+      // waits on the request already on the wire instead of issuing duplicates
+      const inFlight = this.inFlightAnalyses.get(cacheKey);
+      if (inFlight) {
+        log('analyzeContent joining in-flight request', 'debug', { analysisType: cachePartition });
+        return await inFlight;
       }
 
-      log('LLM analysis completed successfully', 'info', {
-        responseLength: response.length
+      const analysis = this.runContentAnalysis(cacheKey, cachePartition, promptContext, content).finally(() => {
+        this.inFlightAnalyses.delete(cacheKey);
       });
-
-      return {
-        insights: response,
-        provider: this.groqClient ? 'groq' : this.geminiClient ? 'gemini' : this.anthropicClient ? 'anthropic' : 'openai',
-        confidence: 0.8
-      };
+      this.inFlightAnalyses.set(cacheKey, analysis);
+      return await analysis;
 
     } catch (error) {
       log('analyzeContent failed', 'error', error);
@@ -1787,6 +1762,186 @@ QUALITY RULES:
     }
   }
 
+  /**
+   * Semantic-tier lookup and provider call for an analyzeContent exact-tier miss
+   */
+  private async runContentAnalysis(
+    cacheKey: string,
+    cachePartition: string,
+    promptContext: string | null,
+    content: string
+  ): Promise<any> {
+    const fullPrompt = promptContext ? `${promptContext}\n\n${content}` : content;
+    const promptEmbedding = await this.embedPromptForCache(fullPrompt);
+    if (promptEmbedding) {
+      const similarHit = this.responseCache.getSimilar(cachePartition, promptEmbedding);
+      if (similarHit) {
+        log('analyzeContent served from response cache (semantic)', 'info', {
+          analysisType: cachePartition,
+          similarity: similarHit.score.toFixed(3)
+        });
+        return similarHit.value;
+      }
+    } else {
+      this.responseCache.recordMiss();
+    }
+
+    // Call LLM with the actual prompt using the same logic as generateLLMInsights
+    let response: string;
+    let provider: ProviderName;
+
+    if (this.groqClient) {
+      // Providers the hedge has already called are skipped by the fallback chain below
+      const tried = new Set<ProviderName>(['groq']);
+      const hedgeFallback: HedgedCall | null = this.geminiClient
+        ? { provider: 'gemini', call: signal => { tried.add('gemini'); return this.callGeminiWithRetry(fullPrompt, 3, signal); } }
+        : this.anthropicClient
+          ? { provider: 'anthropic', call: signal => { tried.add('anthropic'); return this.callAnthropicWithRetry(fullPrompt, 3, signal); } }
+          : null;
+      try {
+        ({ response, provider } = await this.callHedged(
+          { provider: 'groq', call: signal => this.callGroqWithRetry(fullPrompt, 3, signal) },
+          hedgeFallback
+        ));
+      } catch (groqError: any) {
+        if (this.geminiClient && !tried.has('gemini') && this.isRateLimitError(groqError)) {
+          response = await this.callGeminiWithRetry(fullPrompt);
+          provider = 'gemini';
+        } else if (this.anthropicClient && !tried.has('anthropic')) {
+          response = await this.callAnthropicWithRetry(fullPrompt);
+          provider = 'anthropic';
+        } else {
+          throw groqError;
+        }
+      }
+    } else if (this.geminiClient) {
+      response = await this.callGeminiWithRetry(fullPrompt);
+      provider = 'gemini';
+    } else if (this.anthropicClient) {
+      response = await this.callAnthropicWithRetry(fullPrompt);
+      provider = 'anthropic';
+    } else if (this.openaiClient) {
+      response = await this.callOpenAIWithRetry(fullPrompt);
+      provider = 'openai';
+    } else {
+      throw new Error('No LLM client available');
+    }
+
+    log('LLM analysis completed successfully', 'info', {
+      responseLength: response.length
+    });
+
+    const result = {
+      insights: response,
+      provider,
+      confidence: 0.8
+    };
+    this.responseCache.set(cacheKey, cachePartition, result, promptEmbedding);
+    return result;
+  }
+
+  /**
+   * Run the primary call; if it is still pending after LLM_HEDGE_MS, start the fallback and
+   * take whichever succeeds first, aborting the other. Resolves with the winning provider.
+   * A primary failure before the hedge fires, or after the fallback has failed, is rethrown
+   * so the caller's normal fallback chain applies.
+   */
+  private callHedged(primary: HedgedCall, fallback: HedgedCall | null): Promise<{ response: string; provider: ProviderName }> {
+    if (!fallback || LLM_HEDGE_MS <= 0) {
+      return primary.call().then(response => ({ response, provider: primary.provider }));
+    }
+
+    return new Promise((resolve, reject) => {
+      const primaryAbort = new AbortController();
+      const fallbackAbort = new AbortController();
+      let settled = false;
+      let hedgeStarted = false;
+      let primaryError: any = null;
+      let fallbackFailed = false;
+
+      const succeed = (winner: HedgedCall, loser: AbortController) => (response: string) => {
+        if (settled) return;
+        settled = true;
+        clearTimeout(hedgeTimer);
+        if (hedgeStarted) {
+          log(`Hedged request won by ${winner.provider} - aborting the other call`, 'info');
+        }
+        loser.abort();
+        resolve({ response, provider: winner.provider });
+      };
+
+      const hedgeTimer = setTimeout(() => {
+        hedgeStarted = true;
+        log(`Primary provider slower than ${LLM_HEDGE_MS}ms - starting hedged fallback request`, 'info');
+        fallback.call(fallbackAbort.signal).then(succeed(fallback, primaryAbort), (error) => {
+          fallbackFailed = true;
+          if (settled) return;
+          log('Hedged fallback request failed', 'warning', { error: error?.message });
+          if (primaryError) {
+            settled = true;
+            reject(primaryError);
+          }
+        });
+      }, LLM_HEDGE_MS);
+
+      primary.call(primaryAbort.signal).then(succeed(primary, fallbackAbort), (error) => {
+        primaryError = error;
+        if (settled) return;
+        if (!hedgeStarted || fallbackFailed) {
+          settled = true;
+          clearTimeout(hedgeTimer);
+          reject(error);
+        }
+      });
+    });
+  }
+
+  /**
+   * Analyze many prompts through a bounded worker pool instead of one round-trip at a time.
+   * Results keep input order; a failed item yields its Error instead of rejecting the batch.
+   */
+  async analyzeContentBatch(
+    items: Array<{ content: string; context?: any; analysisType?: string }>,
+    concurrency: number = LLM_BATCH_CONCURRENCY
+  ): Promise<Array<any | Error>> {
+    const results = await mapWithConcurrency(items, concurrency, async ({ content, context, analysisType }): Promise<any | Error> => {
+      try {
+        return await this.analyzeContent(content, context, analysisType);
+      } catch (error) {
+        return error instanceof Error ? error : new Error(String(error));
+      }
+    });
+
+    log('analyzeContentBatch completed', 'info', {
+      items: items.length,
+      concurrency,
+      failed: results.filter(r => r instanceof Error).length
+    });
+
+    return results;
+  }
+
+  /**
+   * Embed a prompt for the semantic cache tier; null when the tier is disabled, the prompt does
+   * not fit the embedding window, or embedding fails
+   */
+  private async embedPromptForCache(prompt: string): Promise<Float32Array | null> {
+    if (!LLM_SEMANTIC_CACHE || !this.openaiClient || prompt.length > SEMANTIC_CACHE_MAX_PROMPT_CHARS) {
+      return null;
+    }
+
+    try {
+      const response = await this.openaiClient.embeddings.create({
+        model: 'text-embedding-3-small',
+        input: prompt,
+      });
+      return LLMResponseCache.normalize(response.data[0].embedding);
+    } catch (error: any) {
+      log('Prompt embedding for response cache failed - using exact cache only', 'warning', { error: error?.message });
+      return null;
+    }
+  }
+
   async analyzeCode(code: string, language?: string, filePath?: string): Promise<any> {
     // Legacy compatibility method  
     const mockFile: CodeFile = {
@@ -1814,6 +1969,25 @@ QUALITY RULES:
 
   async analyzeRepository(repositoryPath: string, options: any = {}): Promise<any> {
     // Legacy compatibility method
+    // Mock mode is toggled outside the working tree, so it cannot be part of the fingerprint
+    const fingerprint = isMockLLMEnabled(this.repositoryPath) ? null : await this.repositoryFingerprint();
+    const clients: Record<ProviderName, unknown> = {
+      groq: this.groqClient, gemini: this.geminiClient, anthropic: this.anthropicClient, openai: this.openaiClient
+    };
+    const providers = PROVIDER_FALLBACK_ORDER.filter(provider => clients[provider]);
+    const cacheKey = fingerprint && `${fingerprint}:${JSON.stringify([providers, options.maxFiles, options.includePatterns, options.excludePatterns])}`;
+    const cached = cacheKey ? repositoryAnalysisCache.get(cacheKey) : undefined;
+    if (cacheKey && cached) {
+      repositoryAnalysisCache.delete(cacheKey);
+      if (performance.now() - cached.cachedAt <= LLM_CACHE_TTL_MS) {
+        // Re-insert to keep the map in LRU order
+        repositoryAnalysisCache.set(cacheKey, cached);
+        log('Repository unchanged since last analysis - returning cached result', 'info', { fingerprint });
+        // Callers get their own copy; the cached object is shared across agent instances
+        return JSON.parse(JSON.stringify(cached.analysis));
+      }
+    }
+
     const mockGitAnalysis = { commits: [], codeEvolution: [] };  
     const mockVibeAnalysis = { sessions: [], problemSolutionPairs: [] };
     
@@ -1824,12 +1998,58 @@ QUALITY RULES:
       analysisDepth: 'comprehensive'
     });
     
-    return {
+    const analysis = {
       structure: `Repository contains ${result.codeAnalysis.filesAnalyzed} files in ${Object.keys(result.codeAnalysis.languageDistribution).length} languages`,
       patterns: result.semanticInsights.keyPatterns,
       insights: result.semanticInsights.learnings.join('. '),
       complexity: result.codeAnalysis.complexityMetrics.averageComplexity
     };
+
+    if (cacheKey) {
+      repositoryAnalysisCache.set(cacheKey, { analysis: JSON.parse(JSON.stringify(analysis)), cachedAt: performance.now() });
+      if (repositoryAnalysisCache.size > REPO_ANALYSIS_CACHE_MAX_ENTRIES) {
+        repositoryAnalysisCache.delete(repositoryAnalysisCache.keys().next().value!);
+      }
+    }
+    return analysis;
+  }
+
+  /**
+   * Content address of the working tree: HEAD plus every uncommitted path with its size and
+   * mtime. Untracked files are listed individually (not as their new directory, whose stat
+   * does not change when a file inside it is edited). Null when the directory is not a git
+   * repository (results are then not cached).
+   */
+  private async repositoryFingerprint(): Promise<string | null> {
+    try {
+      const [head, status] = await Promise.all([
+        execFileAsync('git', ['rev-parse', 'HEAD'], { cwd: this.repositoryPath }),
+        execFileAsync('git', ['status', '--porcelain', '-z', '--untracked-files=all'], { cwd: this.repositoryPath, maxBuffer: 16 * 1024 * 1024 })
+      ]);
+
+      const records: string[] = [];
+      const fields = status.stdout.split('\0');
+      for (let i = 0; i < fields.length; i++) {
+        if (fields[i].length < 4) continue;
+        records.push(fields[i]);
+        if (fields[i][0] === 'R' || fields[i][0] === 'C') {
+          i++; // Rename/copy records are followed by the original path
+        }
+      }
+      // A dirty file is listed the same way however often it changes, so fold in its stat too
+      const stats = await Promise.all(records.map(record =>
+        fs.promises.stat(path.join(this.repositoryPath, record.slice(3))).catch(() => null)
+      ));
+
+      const hasher = crypto.createHash('sha1').update(path.resolve(this.repositoryPath)).update('\0').update(head.stdout);
+      records.forEach((record, i) => {
+        const stat = stats[i];
+        hasher.update(record).update('\0').update(stat ? `${stat.size}:${stat.mtimeMs}` : '-').update('\0');
+      });
+      return hasher.digest('hex');
+    } catch {
+      return null;
+    }
   }
 
   async extractPatterns(source: string, patternTypes?: string[], context?: string): Promise<string[]> {
@@ -2154,12 +2374,12 @@ Respond with a JSON array where each element has:
       }
 
       // Parse JSON response
-      const jsonMatch = response.match(/\[[\s\S]*\]/);
-      if (!jsonMatch) {
+      const jsonBlock = extractJsonBlock(response, 'array');
+      if (!jsonBlock) {
         throw new Error('No JSON array found in LLM response');
       }
 
-      const parsed = JSON.parse(jsonMatch[0]);
+      const parsed = JSON.parse(jsonBlock);
 
       return parsed.map((item: any) => {
         const entity = entities[item.index - 1];
@@ -2262,12 +2482,12 @@ Extract and respond with JSON:
         return null;
       }
 
-      const jsonMatch = response.match(/\{[\s\S]*\}/);
-      if (!jsonMatch) {
+      const jsonBlock = extractJsonBlock(response);
+      if (!jsonBlock) {
         return null;
       }
 
-      const parsed = JSON.parse(jsonMatch[0]);
+      const parsed = JSON.parse(jsonBlock);
 
       return {
         documentPath: docPath,
@@ -9,23 +9,159 @@ import * as path from "path";
 import { fileURLToPath } from "url";
 import * as yaml from "js-yaml";
 import { isMockLLMEnabled, mockSemanticAnalysis } from "../mock/llm-mock-service.js";
+import { getConfiguredApiKey, getSharedLLMClient, sharedHttpAgent, sharedHttpsAgent } from "../utils/llm-client-pool.js";
+import { LLMResponseCache, llmResponseCachePath } from "../utils/llm-response-cache.js";
 
 // ES module compatible __dirname
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
-// Debug logging function that writes to file (persists when stdio is discarded)
+// Debug logging function that writes to file (persists when stdio is discarded).
+// Lines are buffered and appended asynchronously once per tick, so the event loop
+// never blocks on the ~dozen writes each analyzer construction produces.
 const SEMANTIC_DEBUG_LOG_PATH = path.join(process.cwd(), '.data', 'semantic-analyzer-debug.log');
+let pendingDebugLines: string[] = [];
+let debugWriteChain: Promise<void> = Promise.resolve();
+function flushSemanticDebugLog(): void {
+  const chunk = pendingDebugLines.join('');
+  pendingDebugLines = [];
+  debugWriteChain = debugWriteChain
+    .then(() => fs.promises.appendFile(SEMANTIC_DEBUG_LOG_PATH, chunk))
+    .catch(() => {
+      // Silently fail if we can't write to log
+    });
+}
 function semanticDebugLog(message: string, data?: any): void {
   try {
     const timestamp = new Date().toISOString();
     const logLine = `[${timestamp}] ${message}${data ? ' ' + JSON.stringify(data) : ''}\n`;
-    fs.appendFileSync(SEMANTIC_DEBUG_LOG_PATH, logLine);
+    if (pendingDebugLines.push(logLine) === 1) {
+      setImmediate(flushSemanticDebugLog);
+    }
   } catch (e) {
-    // Silently fail if we can't write to log
+    // Silently fail if we can't serialize the log data
+  }
+}
+
+// Analysis prompt text per analysis type, split around the context and content so each
+// call only interpolates those two values
+interface AnalysisPromptTemplate {
+  head: string;
+  label: string;
+  tail: string;
+}
+
+const ANALYSIS_PROMPT_TEMPLATES: Readonly<Record<string, AnalysisPromptTemplate>> = Object.freeze({
+  patterns: {
+    head: "Analyze the following content for architectural and design patterns. Identify recurring patterns, best practices, and reusable solutions.\n\n",
+    label: "\n\nContent to analyze:\n",
+    tail: `
+
+Please provide:
+1. List of identified patterns with clear names
+2. Description of each pattern
+3. Significance score (1-10)
+4. Implementation details
+5. Usage recommendations`,
+  },
+  code: {
+    head: "Analyze the following code for quality, patterns, and improvements.\n\n",
+    label: "\n\nCode to analyze:\n",
+    tail: `
+
+Please provide:
+1. Code quality assessment
+2. Identified patterns and anti-patterns
+3. Security considerations
+4. Performance insights
+5. Improvement recommendations`,
+  },
+  architecture: {
+    head: "Analyze the following for architectural insights and design decisions.\n\n",
+    label: "\n\nContent:\n",
+    tail: `
+
+Please provide:
+1. Architectural patterns identified
+2. Design decisions and trade-offs
+3. System structure insights
+4. Scalability considerations
+5. Maintainability assessment`,
+  },
+  diagram: {
+    head: "Generate a PlantUML diagram based on the following analysis data.\n\n",
+    label: "\n\nAnalysis Data:\n",
+    tail: `
+
+IMPORTANT REQUIREMENTS:
+- You MUST respond with a complete PlantUML diagram enclosed in @startuml and @enduml tags
+- Use proper PlantUML syntax for the requested diagram type
+- Make the diagram visually clear and informative with real components from the analysis
+- Include meaningful relationships and annotations based on the actual data
+- Do NOT provide explanatory text - ONLY the PlantUML code
+- The diagram should represent the actual architectural patterns and components found in the analysis
+
+Generate the PlantUML diagram now:`,
+  },
+  general: {
+    head: "Provide a comprehensive analysis of the following content.\n\n",
+    label: "\n\nContent:\n",
+    tail: "\n\nPlease provide detailed insights, patterns, and recommendations.",
+  },
+});
+
+const PASSTHROUGH_ANALYSIS_TYPES: ReadonlySet<string> = new Set(["raw", "passthrough", "classification"]);
+
+// Field keys recognised in pattern extraction responses ("Key: value" lines)
+const PATTERN_FIELD_KEYS: ReadonlySet<string> = new Set(["pattern", "name", "type", "description"]);
+
+// Ollama availability is probed once per base URL per process, not once per analyzer instance.
+// Only successful probes stay cached: a failed one is dropped, so an Ollama started later is found
+const ollamaProbes = new Map<string, Promise<string[] | null>>();
+function probeOllama(baseUrl: string): Promise<string[] | null> {
+  let probe = ollamaProbes.get(baseUrl);
+  if (!probe) {
+    probe = axios.get(`${baseUrl}/api/tags`, { timeout: 5000, httpAgent: sharedHttpAgent, httpsAgent: sharedHttpsAgent }).then(
+      (response) => {
+        const models = response.data?.models || [];
+        const modelNames: string[] = models.map((m: any) => m.name);
+        log(`Ollama available with ${models.length} models: ${modelNames.join(', ')}`, 'info');
+        semanticDebugLog('Ollama connected', { models: modelNames });
+        return modelNames;
+      },
+      (error: any) => {
+        log(`Ollama not available at ${baseUrl}: ${error.message}`, 'warning');
+        semanticDebugLog('Ollama connection failed', { error: error.message });
+        ollamaProbes.delete(baseUrl);
+        return null;
+      }
+    );
+    ollamaProbes.set(baseUrl, probe);
   }
+  return probe;
 }
 
+// Exact-match response cache shared by every SemanticAnalyzer instance (LLM_RESPONSE_CACHE=false disables),
+// persisted under DATA_DIR so restarts start warm (LLM_CACHE_PERSIST=false keeps it in memory)
+const LLM_RESPONSE_CACHE = process.env.LLM_RESPONSE_CACHE !== 'false';
+const analyzerResponseCache = new LLMResponseCache<AnalysisResult>({
+  ttlMs: parseInt(process.env.LLM_CACHE_TTL_MS || '3600000', 10),
+  maxEntries: parseInt(process.env.LLM_CACHE_MAX_ENTRIES || '500', 10),
+  cachePath: llmResponseCachePath("llm-response-cache"),
+});
+
+// Provider-side prompt caching: the part of a prompt before the caller's content (instructions
+// plus context) is identical across calls that share a context, so Anthropic requests mark it as
+// a cacheable block. Anthropic ignores cache breakpoints under ~1024 tokens, hence the floor.
+// OpenAI caches matching prefixes automatically; keeping the static text first is all it needs.
+const PROMPT_CACHE_MIN_PREFIX_CHARS = parseInt(process.env.PROMPT_CACHE_MIN_PREFIX_CHARS || '4096', 10);
+
+// Opt-in streaming for Groq completions: a response that stops producing tokens for
+// LLM_STREAM_IDLE_MS is abandoned so the fallback cascade takes over, instead of holding the
+// request until the full LLM timeout
+const LLM_STREAM_RESPONSES = process.env.LLM_STREAM_RESPONSES === 'true';
+const LLM_STREAM_IDLE_MS = parseInt(process.env.LLM_STREAM_IDLE_MS || '15000', 10);
+
 // Model tier types
 export type ModelTier = "fast" | "standard" | "premium";
 
@@ -444,7 +580,7 @@ export class SemanticAnalyzer {
   /**
    * Analyze with specific provider and model (tier-based routing)
    */
-  private async analyzeWithTier(prompt: string, provider: string, model: string): Promise<AnalysisResult> {
+  private async analyzeWithTier(prompt: string, provider: string, model: string, prefixLength?: number): Promise<AnalysisResult> {
     log(`analyzeWithTier: ${provider}/${model}`, 'info', { promptLength: prompt.length });
 
     // Check for LLM mock mode - return mock response if enabled
@@ -474,7 +610,7 @@ export class SemanticAnalyzer {
       case 'groq':
         return this.analyzeWithGroq(prompt, model);
       case 'anthropic':
-        return this.analyzeWithAnthropic(prompt, model);
+        return this.analyzeWithAnthropic(prompt, model, prefixLength);
       case 'openai':
         return this.analyzeWithOpenAI(prompt, model);
       case 'gemini':
@@ -496,61 +632,61 @@ export class SemanticAnalyzer {
     semanticDebugLog('initializeClients called', { cwd: process.cwd() });
 
     // Initialize Groq client (highest priority - cheap, low-latency)
-    const groqKey = process.env.GROQ_API_KEY;
+    const groqKey = getConfiguredApiKey("GROQ_API_KEY");
     semanticDebugLog('Checking Groq API key', { hasKey: !!groqKey, keyLength: groqKey?.length || 0 });
-    if (groqKey && groqKey !== "your-groq-api-key") {
-      this.groqClient = new Groq({
+    if (groqKey) {
+      this.groqClient = getSharedLLMClient("groq", groqKey, { timeout: SemanticAnalyzer.LLM_TIMEOUT_MS }, () => new Groq({
         apiKey: groqKey,
         timeout: SemanticAnalyzer.LLM_TIMEOUT_MS,
-      });
+      }));
       log("Groq client initialized (default provider)", "info");
       semanticDebugLog('Groq client initialized');
     }
 
     // Initialize Gemini client (second priority - cheap, good quality)
     // Note: Gemini SDK doesn't support timeout in constructor, handled per-request
-    const googleKey = process.env.GOOGLE_API_KEY;
+    const googleKey = getConfiguredApiKey("GOOGLE_API_KEY");
     semanticDebugLog('Checking Google API key', { hasKey: !!googleKey, keyLength: googleKey?.length || 0 });
-    if (googleKey && googleKey !== "your-google-api-key") {
-      this.geminiClient = new GoogleGenerativeAI(googleKey);
+    if (googleKey) {
+      this.geminiClient = getSharedLLMClient("gemini", googleKey, {}, () => new GoogleGenerativeAI(googleKey));
       log("Gemini client initialized (fallback #1)", "info");
       semanticDebugLog('Gemini client initialized');
     }
 
     // Initialize Custom OpenAI-compatible client (third priority)
     const customBaseUrl = process.env.OPENAI_BASE_URL;
-    const customKey = process.env.OPENAI_API_KEY;
+    const customKey = getConfiguredApiKey("OPENAI_API_KEY");
     semanticDebugLog('Checking Custom OpenAI key', { hasBaseUrl: !!customBaseUrl, hasKey: !!customKey });
-    if (customBaseUrl && customKey && customKey !== "your-openai-api-key") {
-      this.customClient = new OpenAI({
+    if (customBaseUrl && customKey) {
+      this.customClient = getSharedLLMClient("openai", customKey, { baseURL: customBaseUrl, timeout: SemanticAnalyzer.LLM_TIMEOUT_MS }, () => new OpenAI({
         apiKey: customKey,
         baseURL: customBaseUrl,
         timeout: SemanticAnalyzer.LLM_TIMEOUT_MS,
-      });
+      }));
       log("Custom OpenAI-compatible client initialized (fallback #2)", "info", { baseURL: customBaseUrl });
       semanticDebugLog('Custom OpenAI client initialized', { baseURL: customBaseUrl });
     }
 
     // Initialize Anthropic client (fourth priority)
-    const anthropicKey = process.env.ANTHROPIC_API_KEY;
+    const anthropicKey = getConfiguredApiKey("ANTHROPIC_API_KEY");
     semanticDebugLog('Checking Anthropic API key', { hasKey: !!anthropicKey, keyLength: anthropicKey?.length || 0 });
-    if (anthropicKey && anthropicKey !== "your-anthropic-api-key") {
-      this.anthropicClient = new Anthropic({
+    if (anthropicKey) {
+      this.anthropicClient = getSharedLLMClient("anthropic", anthropicKey, { timeout: SemanticAnalyzer.LLM_TIMEOUT_MS }, () => new Anthropic({
         apiKey: anthropicKey,
         timeout: SemanticAnalyzer.LLM_TIMEOUT_MS,
-      });
+      }));
       log("Anthropic client initialized (fallback #3)", "info");
       semanticDebugLog('Anthropic client initialized');
     }
 
     // Initialize OpenAI client (fifth priority - only if no custom base URL)
-    const openaiKey = process.env.OPENAI_API_KEY;
+    const openaiKey = getConfiguredApiKey("OPENAI_API_KEY");
     semanticDebugLog('Checking OpenAI API key', { hasKey: !!openaiKey, hasCustomUrl: !!customBaseUrl });
-    if (openaiKey && openaiKey !== "your-openai-api-key" && !customBaseUrl) {
-      this.openaiClient = new OpenAI({
+    if (openaiKey && !customBaseUrl) {
+      this.openaiClient = getSharedLLMClient("openai", openaiKey, { timeout: SemanticAnalyzer.LLM_TIMEOUT_MS }, () => new OpenAI({
         apiKey: openaiKey,
         timeout: SemanticAnalyzer.LLM_TIMEOUT_MS,
-      });
+      }));
       log("OpenAI client initialized (fallback #4)", "info");
       semanticDebugLog('OpenAI client initialized');
     }
@@ -562,11 +698,13 @@ export class SemanticAnalyzer {
     semanticDebugLog('Checking Ollama availability', { baseUrl: ollamaBaseUrl, model: this.ollamaModel });
 
     // Try to connect to Ollama (async check, but we set up client optimistically)
-    this.ollamaClient = axios.create({
+    this.ollamaClient = getSharedLLMClient("ollama", "", { baseURL: ollamaBaseUrl, timeout: SemanticAnalyzer.LLM_TIMEOUT_MS }, () => axios.create({
       baseURL: ollamaBaseUrl,
       timeout: SemanticAnalyzer.LLM_TIMEOUT_MS,
-      headers: { 'Content-Type': 'application/json' }
-    });
+      headers: { 'Content-Type': 'application/json' },
+      httpAgent: sharedHttpAgent,
+      httpsAgent: sharedHttpsAgent
+    }));
 
     // Verify Ollama is running by checking the API
     this.verifyOllamaConnection(ollamaBaseUrl);
@@ -591,24 +729,16 @@ export class SemanticAnalyzer {
    * Verify Ollama is running and available
    */
   private async verifyOllamaConnection(baseUrl: string): Promise<void> {
-    try {
-      const response = await axios.get(`${baseUrl}/api/tags`, { timeout: 5000 });
-      if (response.status === 200) {
-        const models = response.data?.models || [];
-        const modelNames = models.map((m: any) => m.name);
-        log(`Ollama available with ${models.length} models: ${modelNames.join(', ')}`, 'info');
-        semanticDebugLog('Ollama connected', { models: modelNames });
-
-        // Check if desired model is available
-        if (!modelNames.includes(this.ollamaModel)) {
-          log(`Ollama model '${this.ollamaModel}' not found. Available: ${modelNames.join(', ')}`, 'warning');
-        }
-      }
-    } catch (error: any) {
-      log(`Ollama not available at ${baseUrl}: ${error.message}`, 'warning');
-      semanticDebugLog('Ollama connection failed', { error: error.message });
+    const modelNames = await probeOllama(baseUrl);
+    if (modelNames === null) {
       // Set client to null if Ollama is not running
       this.ollamaClient = null;
+      return;
+    }
+
+    // Check if desired model is available
+    if (!modelNames.includes(this.ollamaModel)) {
+      log(`Ollama model '${this.ollamaModel}' not found. Available: ${modelNames.join(', ')}`, 'warning');
     }
   }
 
@@ -726,46 +856,10 @@ export class SemanticAnalyzer {
     } else if (provider === "ollama" && this.ollamaClient) {
       return await this.analyzeWithOllama(prompt);
     } else if (provider === "auto") {
-      // Auto mode with fallback cascade: Groq > Gemini > Custom > Anthropic > OpenAI > Ollama
-      const providers = [
-        { name: 'groq', client: this.groqClient, method: this.analyzeWithGroq.bind(this) },
-        { name: 'gemini', client: this.geminiClient, method: this.analyzeWithGemini.bind(this) },
-        { name: 'custom', client: this.customClient, method: this.analyzeWithCustom.bind(this) },
-        { name: 'anthropic', client: this.anthropicClient, method: this.analyzeWithAnthropic.bind(this) },
-        { name: 'openai', client: this.openaiClient, method: this.analyzeWithOpenAI.bind(this) },
-        { name: 'ollama', client: this.ollamaClient, method: this.analyzeWithOllama.bind(this) }
-      ];
-
-      const errors: Array<{ provider: string; error: any }> = [];
-
-      for (const { name, client, method } of providers) {
-        if (!client) continue;
-
-        try {
-          log(`Attempting analysis with ${name}`, 'info');
-          const result = await method(prompt);
-          if (errors.length > 0) {
-            log(`Successfully fell back to ${name} after ${errors.length} failure(s)`, 'info', {
-              failedProviders: errors.map(e => e.provider)
-            });
-          }
-          // Record metrics for step-level aggregation
-          SemanticAnalyzer.recordCallMetrics(result);
-          return result;
-        } catch (error: any) {
-          const isRateLimit = error?.status === 429 || error?.message?.includes('rate limit');
-          log(`${name} analysis failed${isRateLimit ? ' (rate limit)' : ''}`, 'warning', {
-            error: error?.message,
-            status: error?.status
-          });
-          errors.push({ provider: name, error });
-          // Continue to next provider
-        }
-      }
-
-      // All providers failed - NO MOCK FALLBACK
-      log('All LLM providers failed', 'error', { errors });
-      throw new Error(`All LLM providers failed (no mock fallback). Install Ollama for local fallback. Errors: ${errors.map(e => `${e.provider}: ${e.error?.message || 'Unknown error'}`).join('; ')}`);
+      const result = await this.analyzeWithFallbackCascade(prompt);
+      // Record metrics for step-level aggregation
+      SemanticAnalyzer.recordCallMetrics(result);
+      return result;
     }
 
     throw new Error("No available LLM provider - specify a valid provider or use 'auto'");
@@ -818,13 +912,50 @@ export class SemanticAnalyzer {
     });
 
     const prompt = this.buildAnalysisPrompt(content, context, analysisType);
+    // Static prefix (instructions and context) the Anthropic call marks as a cache breakpoint;
+    // prefixes below the minimum are not worth a cache write
+    const prefixLength = this.staticPromptPrefixLength(prompt, content, analysisType);
+    return this.analyzeBuiltPrompt(
+      prompt, options, effectiveTier, prefixLength >= PROMPT_CACHE_MIN_PREFIX_CHARS ? prefixLength : undefined);
+  }
+
+  /**
+   * Serve a built prompt from the response cache or route it to a provider
+   */
+  private async analyzeBuiltPrompt(prompt: string, options: AnalysisOptions, effectiveTier: ModelTier, prefixLength?: number): Promise<AnalysisResult> {
+    const { analysisType = "general", provider = "auto", taskType } = options;
+
+    if (!LLM_RESPONSE_CACHE) {
+      return this.routeAnalysis(prompt, options, effectiveTier, prefixLength);
+    }
+
+    // Routing options are folded into the partition through an order-independent digest
+    const cachePartition = `${analysisType}:${LLMResponseCache.optionsDigest({ provider, tier: effectiveTier, taskType })}`;
+    const cacheKey = LLMResponseCache.keyFor(cachePartition, prompt);
+    await analyzerResponseCache.initialize();
+    const cached = analyzerResponseCache.getExact(cacheKey);
+    if (cached) {
+      log("SemanticAnalyzer served from response cache", "info", { analysisType, tier: effectiveTier });
+      return cached;
+    }
+
+    const result = await this.routeAnalysis(prompt, options, effectiveTier, prefixLength);
+    analyzerResponseCache.set(cacheKey, cachePartition, result);
+    return result;
+  }
+
+  /**
+   * Dispatch a built prompt to the tier-selected, batched or explicitly requested provider
+   */
+  private async routeAnalysis(prompt: string, options: AnalysisOptions, effectiveTier: ModelTier, prefixLength?: number): Promise<AnalysisResult> {
+    const { analysisType = "general", provider = "auto", tier, taskType } = options;
 
     // If tier is specified (or derived from taskType), use tier-based selection
     if ((tier || taskType) && provider === "auto") {
       const tierSelection = this.getProviderForTier(effectiveTier);
       if (tierSelection) {
         log(`Using tier-based selection: ${tierSelection.provider}/${tierSelection.model} for tier ${effectiveTier}`, 'info');
-        return this.analyzeWithTier(prompt, tierSelection.provider, tierSelection.model);
+        return this.analyzeWithTier(prompt, tierSelection.provider, tierSelection.model, prefixLength);
       }
     }
 
@@ -874,7 +1005,7 @@ export class SemanticAnalyzer {
       if (!this.anthropicClient) {
         throw new Error("Anthropic client not available");
       }
-      result = await this.analyzeWithAnthropic(prompt);
+      result = await this.analyzeWithAnthropic(prompt, undefined, prefixLength);
     } else if (provider === "openai") {
       if (!this.openaiClient) {
         throw new Error("OpenAI client not available");
@@ -892,45 +1023,7 @@ export class SemanticAnalyzer {
         hasOllama: !!this.ollamaClient
       });
 
-      const providers = [
-        { name: 'groq', client: this.groqClient, method: this.analyzeWithGroq.bind(this) },
-        { name: 'gemini', client: this.geminiClient, method: this.analyzeWithGemini.bind(this) },
-        { name: 'custom', client: this.customClient, method: this.analyzeWithCustom.bind(this) },
-        { name: 'anthropic', client: this.anthropicClient, method: this.analyzeWithAnthropic.bind(this) },
-        { name: 'openai', client: this.openaiClient, method: this.analyzeWithOpenAI.bind(this) },
-        { name: 'ollama', client: this.ollamaClient, method: this.analyzeWithOllama.bind(this) }
-      ];
-
-      const errors: Array<{ provider: string; error: any }> = [];
-
-      for (const { name, client, method } of providers) {
-        if (!client) continue;
-
-        try {
-          log(`Attempting analysis with ${name}`, 'info');
-          result = await method(prompt);
-          if (errors.length > 0) {
-            log(`Successfully fell back to ${name} after ${errors.length} failure(s)`, 'info', {
-              failedProviders: errors.map(e => e.provider)
-            });
-          }
-          break; // Success - exit loop
-        } catch (error: any) {
-          const isRateLimit = error?.status === 429 || error?.message?.includes('rate limit');
-          log(`${name} analysis failed${isRateLimit ? ' (rate limit)' : ''}`, 'warning', {
-            error: error?.message,
-            status: error?.status
-          });
-          errors.push({ provider: name, error });
-          // Continue to next provider
-        }
-      }
-
-      // Check if we got a result
-      if (!result!) {
-        log('All LLM providers failed', 'error', { errors });
-        throw new Error(`All LLM providers failed. Errors: ${errors.map(e => `${e.provider}: ${e.error?.message || 'Unknown error'}`).join('; ')}`);
-      }
+      result = await this.analyzeWithFallbackCascade(prompt, prefixLength);
     } else {
       throw new Error(`Unknown provider: ${provider}`);
     }
@@ -947,6 +1040,52 @@ export class SemanticAnalyzer {
     return result;
   }
 
+  /**
+   * Try each configured provider in priority order until one succeeds (metrics are recorded by the caller)
+   */
+  private async analyzeWithFallbackCascade(prompt: string, prefixLength?: number): Promise<AnalysisResult> {
+    // Priority: Groq (cheap/fast) > Gemini > Custom > Anthropic > OpenAI > Ollama (local fallback)
+    const providers = [
+      { name: 'groq', client: this.groqClient, method: this.analyzeWithGroq.bind(this) },
+      { name: 'gemini', client: this.geminiClient, method: this.analyzeWithGemini.bind(this) },
+      { name: 'custom', client: this.customClient, method: this.analyzeWithCustom.bind(this) },
+      { name: 'anthropic', client: this.anthropicClient, method: (p: string) => this.analyzeWithAnthropic(p, undefined, prefixLength) },
+      { name: 'openai', client: this.openaiClient, method: this.analyzeWithOpenAI.bind(this) },
+      { name: 'ollama', client: this.ollamaClient, method: this.analyzeWithOllama.bind(this) }
+    ];
+
+    const errors: Array<{ provider: string; error: any }> = [];
+
+    for (const { name, client, method } of providers) {
+      if (!client) continue;
+
+      try {
+        log(`Attempting analysis with ${name}`, 'info');
+        const result = await method(prompt);
+        if (errors.length > 0) {
+          log(`Successfully fell back to ${name} after ${errors.length} failure(s)`, 'info', {
+            failedProviders: errors.map(e => e.provider)
+          });
+        }
+        return result;
+      } catch (error: any) {
+        const isRateLimit = error?.status === 429 || error?.message?.includes('rate limit');
+        log(`${name} analysis failed${isRateLimit ? ' (rate limit)' : ''}`, 'warning', {
+          error: error?.message,
+          status: error?.status
+        });
+        errors.push({ provider: name, error });
+        // Continue to next provider
+      }
+    }
+
+    // All providers failed - NO MOCK FALLBACK. Shared by the direct and batched routes, so the
+    // Ollama hint is only given when Ollama was not already part of the cascade
+    log('All LLM providers failed', 'error', { errors });
+    const ollamaHint = this.ollamaClient ? '' : ' Install Ollama for local fallback.';
+    throw new Error(`All LLM providers failed (no mock fallback).${ollamaHint} Errors: ${errors.map(e => `${e.provider}: ${e.error?.message || 'Unknown error'}`).join('; ')}`);
+  }
+
   async analyzeCode(code: string, options: CodeAnalysisOptions = {}): Promise<CodeAnalysisResult> {
     const { language, filePath, focus = "patterns" } = options;
 
@@ -984,96 +1123,25 @@ export class SemanticAnalyzer {
   }
 
   private buildAnalysisPrompt(content: string, context?: string, analysisType: string = "general"): string {
-    let prompt = "";
-
-    switch (analysisType) {
-      case "patterns":
-        prompt = `Analyze the following content for architectural and design patterns. Identify recurring patterns, best practices, and reusable solutions.
-
-${context ? `Context: ${context}\n\n` : ""}
-
-Content to analyze:
-${content}
-
-Please provide:
-1. List of identified patterns with clear names
-2. Description of each pattern
-3. Significance score (1-10)
-4. Implementation details
-5. Usage recommendations`;
-        break;
-
-      case "code":
-        prompt = `Analyze the following code for quality, patterns, and improvements.
-
-${context ? `Context: ${context}\n\n` : ""}
-
-Code to analyze:
-${content}
-
-Please provide:
-1. Code quality assessment
-2. Identified patterns and anti-patterns
-3. Security considerations
-4. Performance insights
-5. Improvement recommendations`;
-        break;
-
-      case "architecture":
-        prompt = `Analyze the following for architectural insights and design decisions.
-
-${context ? `Context: ${context}\n\n` : ""}
-
-Content:
-${content}
-
-Please provide:
-1. Architectural patterns identified
-2. Design decisions and trade-offs
-3. System structure insights
-4. Scalability considerations
-5. Maintainability assessment`;
-        break;
-
-      case "diagram":
-        prompt = `Generate a PlantUML diagram based on the following analysis data.
-
-${context ? `Context: ${context}\n\n` : ""}
-
-Analysis Data:
-${content}
-
-IMPORTANT REQUIREMENTS:
-- You MUST respond with a complete PlantUML diagram enclosed in @startuml and @enduml tags
-- Use proper PlantUML syntax for the requested diagram type
-- Make the diagram visually clear and informative with real components from the analysis
-- Include meaningful relationships and annotations based on the actual data
-- Do NOT provide explanatory text - ONLY the PlantUML code
-- The diagram should represent the actual architectural patterns and components found in the analysis
-
-Generate the PlantUML diagram now:`;
-        break;
-
-      case "raw":
-      case "passthrough":
-      case "classification":
-        // Pass through unchanged - caller has already formatted the prompt
-        // Used by OntologyClassifier for structured JSON classification responses
-        prompt = context ? `${context}\n\n${content}` : content;
-        break;
-
-      default:
-        prompt = `Provide a comprehensive analysis of the following content.
-
-${context ? `Context: ${context}\n\n` : ""}
+    if (PASSTHROUGH_ANALYSIS_TYPES.has(analysisType)) {
+      // Pass through unchanged - caller has already formatted the prompt
+      // Used by OntologyClassifier for structured JSON classification responses
+      return context ? `${context}\n\n${content}` : content;
+    }
 
-Content:
-${content}
+    const template = ANALYSIS_PROMPT_TEMPLATES[analysisType] || ANALYSIS_PROMPT_TEMPLATES.general;
+    return `${template.head}${context ? `Context: ${context}\n\n` : ""}${template.label}${content}${template.tail}`;
+  }
 
-Please provide detailed insights, patterns, and recommendations.`;
+  /**
+   * Length of the prompt text that precedes the caller's content (instructions and context)
+   */
+  private staticPromptPrefixLength(prompt: string, content: string, analysisType: string): number {
+    if (PASSTHROUGH_ANALYSIS_TYPES.has(analysisType)) {
+      return prompt.length - content.length;
     }
-
-    return prompt;
+    const template = ANALYSIS_PROMPT_TEMPLATES[analysisType] || ANALYSIS_PROMPT_TEMPLATES.general;
+    return prompt.length - content.length - template.tail.length;
   }
 
   private buildCodeAnalysisPrompt(code: string, language?: string, filePath?: string, focus: string = "patterns"): string {
@@ -1119,25 +1187,32 @@ For each pattern found, provide:
 
     try {
       log(`Making Groq API call with model ${selectedModel}`, "info");
-      const response = await this.groqClient.chat.completions.create({
-        model: selectedModel,
-        max_tokens: 4096,
-        messages: [{ role: "user", content: prompt }],
-        temperature: 0.7
-      });
+      let content: string | null | undefined;
+      let usage: { prompt_tokens?: number; completion_tokens?: number; total_tokens?: number } | null | undefined;
+
+      if (LLM_STREAM_RESPONSES) {
+        ({ content, usage } = await this.streamGroqCompletion(prompt, selectedModel));
+      } else {
+        const response = await this.groqClient.chat.completions.create({
+          model: selectedModel,
+          max_tokens: 4096,
+          messages: [{ role: "user", content: prompt }],
+          temperature: 0.7
+        });
 
-      log("Groq API response received", "info", {
-        hasChoices: !!response.choices,
-        choicesLength: response.choices?.length
-      });
+        log("Groq API response received", "info", {
+          hasChoices: !!response.choices,
+          choicesLength: response.choices?.length
+        });
+
+        content = response.choices[0]?.message?.content;
+        usage = response.usage;
+      }
 
-      const content = response.choices[0]?.message?.content;
       if (!content) {
         throw new Error("No content in Groq response");
       }
 
-      // Capture token usage from response
-      const usage = response.usage;
       const result: AnalysisResult = {
         insights: content,
         provider: "groq",
@@ -1164,6 +1239,59 @@ For each pattern found, provide:
     }
   }
 
+  /**
+   * Stream a Groq completion, aborting if no chunk arrives within LLM_STREAM_IDLE_MS
+   */
+  private async streamGroqCompletion(prompt: string, selectedModel: string): Promise<{ content: string; usage: any }> {
+    const stream = await this.groqClient!.chat.completions.create({
+      model: selectedModel,
+      max_tokens: 4096,
+      messages: [{ role: "user", content: prompt }],
+      temperature: 0.7,
+      stream: true
+    });
+
+    const parts: string[] = [];
+    let usage: any = null;
+    let stalled = false;
+    let idleTimer: ReturnType<typeof setTimeout> | null = null;
+    const armIdleTimer = () => {
+      if (idleTimer) clearTimeout(idleTimer);
+      idleTimer = setTimeout(() => {
+        stalled = true;
+        stream.controller.abort();
+      }, LLM_STREAM_IDLE_MS);
+    };
+
+    armIdleTimer();
+    try {
+      for await (const chunk of stream) {
+        armIdleTimer();
+        const delta = chunk.choices[0]?.delta?.content;
+        if (delta) {
+          parts.push(delta);
+        }
+        // Groq reports usage on the final chunk
+        usage = (chunk as any).x_groq?.usage || usage;
+      }
+    } catch (error) {
+      if (stalled) {
+        throw new Error(`Groq stream stalled: no tokens for ${LLM_STREAM_IDLE_MS}ms`);
+      }
+      throw error;
+    } finally {
+      if (idleTimer) clearTimeout(idleTimer);
+    }
+
+    // The SDK iterator treats an abort as a normal end of stream, so a stall can also land here
+    if (stalled) {
+      throw new Error(`Groq stream stalled: no tokens for ${LLM_STREAM_IDLE_MS}ms`);
+    }
+
+    log("Groq stream completed", "info", { chunks: parts.length });
+    return { content: parts.join(""), usage };
+  }
+
   private async analyzeWithGemini(prompt: string): Promise<AnalysisResult> {
     log("analyzeWithGemini called", "info", {
       hasClient: !!this.geminiClient,
@@ -1217,7 +1345,10 @@ For each pattern found, provide:
     }
   }
 
-  private async analyzeWithAnthropic(prompt: string, model?: string): Promise<AnalysisResult> {
+  /**
+   * prefixLength, when set, marks prompt.slice(0, prefixLength) as a prompt-cache breakpoint
+   */
+  private async analyzeWithAnthropic(prompt: string, model?: string, prefixLength?: number): Promise<AnalysisResult> {
     const selectedModel = model || "claude-sonnet-4-20250514";
     log("analyzeWithAnthropic called", "info", {
       hasClient: !!this.anthropicClient,
@@ -1234,7 +1365,15 @@ For each pattern found, provide:
       const response = await this.anthropicClient.messages.create({
         model: selectedModel,
         max_tokens: 4096,
-        messages: [{ role: "user", content: prompt }],
+        messages: [{
+          role: "user",
+          content: prefixLength
+            ? [
+                { type: "text", text: prompt.slice(0, prefixLength), cache_control: { type: "ephemeral" } },
+                { type: "text", text: prompt.slice(prefixLength) },
+              ]
+            : prompt,
+        }],
       });
       
       log("Anthropic API response received", "info", {
@@ -1396,18 +1535,30 @@ For each pattern found, provide:
     
     for (const line of lines) {
       const trimmed = line.trim();
+
+      // Plain string scan instead of a regex: the key is everything before the first colon
+      let key: string | null = null;
+      let value = "";
+      const colon = trimmed.indexOf(":");
+      if (colon > 0) {
+        const candidate = trimmed.slice(0, colon).toLowerCase();
+        if (PATTERN_FIELD_KEYS.has(candidate)) {
+          value = trimmed.slice(colon + 1).trim();
+          key = value ? candidate : null;
+        }
+      }
       
-      if (trimmed.match(/^(Pattern|Name):\s*(.+)/i)) {
+      if (key === "pattern" || key === "name") {
         if (currentPattern?.name) {
           patterns.push(this.finalizePattern(currentPattern));
         }
-        currentPattern = { name: RegExp.$2.trim() };
+        currentPattern = { name: value };
       } else if (currentPattern) {
-        if (trimmed.match(/^Type:\s*(.+)/i)) {
-          currentPattern.type = RegExp.$1.trim();
-        } else if (trimmed.match(/^Description:\s*(.+)/i)) {
-          currentPattern.description = RegExp.$1.trim();
-        } else if (trimmed.match(/^Code:|Example:/i)) {
+        if (key === "type") {
+          currentPattern.type = value;
+        } else if (key === "description") {
+          currentPattern.description = value;
+        } else if (this.isPatternCodeMarker(trimmed)) {
           currentPattern.code = "";
         } else if (currentPattern.code !== undefined && trimmed) {
           currentPattern.code += trimmed + "\n";
@@ -1425,6 +1576,14 @@ For each pattern found, provide:
     };
   }
 
+  /**
+   * Line opens a code block: starts with "Code:" or mentions "Example:" anywhere (case-insensitive)
+   */
+  private isPatternCodeMarker(line: string): boolean {
+    const lower = line.toLowerCase();
+    return lower.startsWith("code:") || lower.includes("example:");
+  }
+
   private finalizePattern(partial: Partial<Pattern>): Pattern {
     return {
       name: partial.name || "UnnamedPattern",
@@ -3,6 +3,7 @@ import fs from "fs/promises";
 import path from "path";
 import crypto from "crypto";
 import { fileURLToPath } from "url";
+import { mapWithConcurrency } from "../utils/concurrency.js";
 
 // Derive the coding repo root from this file's location
 const __filename = fileURLToPath(import.meta.url);
@@ -11,6 +12,14 @@ const __dirname = path.dirname(__filename);
 // Coding root is 5 levels up
 const CODING_ROOT = process.env.CODING_TOOLS_PATH || process.env.CODING_REPO || path.resolve(__dirname, '../../../../..');
 
+// Maximum number of sync targets synchronized at the same time
+// (a non-numeric or non-positive setting falls back to the default)
+const parsedSyncConcurrency = parseInt(process.env.SYNC_CONCURRENCY || '4', 10);
+const SYNC_CONCURRENCY = Number.isFinite(parsedSyncConcurrency) && parsedSyncConcurrency > 0 ? parsedSyncConcurrency : 4;
+
+// How long a computed health status is reused before being recomputed
+const HEALTH_CACHE_TTL_MS = 5000;
+
 export interface SyncTarget {
   name: string;
   type: "mcp_memory" | "graphology_db" | "knowledge_export_file";
@@ -51,6 +60,51 @@ export interface SyncHealthStatus {
   errors: string[];
 }
 
+/**
+ * Project a knowledge graph entity into its knowledge export record
+ */
+function projectExportEntity(entity: any, now: number): Record<string, any> {
+  return {
+    name: entity.name,
+    entityType: entity.entity_type || entity.entityType,
+    significance: entity.significance || 5,
+    observations: Array.isArray(entity.observations) ? entity.observations : [entity.observations].filter(Boolean),
+    metadata: {
+      ...entity.metadata,
+      updated_at: entity.updated_at || now,
+      created_at: entity.created_at || now
+    }
+  };
+}
+
+/**
+ * Project a knowledge graph entity into its backup record
+ */
+function projectBackupEntity(entity: any, includeMetadata: boolean): Record<string, any> {
+  return {
+    name: entity.name,
+    entityType: entity.entity_type || entity.entityType,
+    significance: entity.significance,
+    observations: entity.observations,
+    metadata: includeMetadata ? entity.metadata : {},
+    created_at: entity.created_at,
+    updated_at: entity.updated_at
+  };
+}
+
+/**
+ * Project a knowledge graph relation into its backup record
+ */
+function projectBackupRelation(rel: any, includeMetadata: boolean): Record<string, any> {
+  return {
+    from: rel.from_entity || rel.from,
+    to: rel.to_entity || rel.to,
+    relationType: rel.relation_type || rel.relationType,
+    metadata: includeMetadata ? rel.metadata : {},
+    created_at: rel.created_at
+  };
+}
+
 export class SynchronizationAgent {
   private targets: Map<string, SyncTarget> = new Map();
   private conflictResolution: ConflictResolution;
@@ -59,6 +113,9 @@ export class SynchronizationAgent {
   private running: boolean = true;
   private agents: Map<string, any> = new Map();
   private autoSyncTimer?: NodeJS.Timeout;
+  private healthCache: { status: SyncHealthStatus; computedAt: number } | null = null; // computedAt: performance.now()
+  private periodicSyncInFlight: Promise<SyncResult[]> | null = null;
+  private inFlightTargetSyncs: Map<string, Promise<SyncResult>> = new Map();
 
   constructor() {
     this.conflictResolution = {
@@ -105,16 +162,16 @@ export class SynchronizationAgent {
   async syncAll(): Promise<SyncResult[]> {
     log("Starting full synchronization", "info");
     
-    const results: SyncResult[] = [];
     const enabledTargets = Array.from(this.targets.values()).filter(t => t.enabled);
 
-    for (const target of enabledTargets) {
+    // Targets are independent - sync them through a bounded worker pool instead of
+    // one after another, keeping results in target order
+    const results = await mapWithConcurrency(enabledTargets, SYNC_CONCURRENCY, async (target): Promise<SyncResult> => {
       try {
-        const result = await this.syncTarget(target);
-        results.push(result);
+        return await this.syncTarget(target);
       } catch (error) {
         log(`Sync failed for target: ${target.name}`, "error", error);
-        results.push({
+        return {
           target: target.name,
           success: false,
           itemsAdded: 0,
@@ -122,20 +179,38 @@ export class SynchronizationAgent {
           itemsRemoved: 0,
           errors: [error instanceof Error ? error.message : String(error)],
           syncTime: 0,
-        });
+        };
       }
-    }
+    });
 
+    const successful = results.filter(r => r.success).length;
     log("Full synchronization completed", "info", {
       totalTargets: results.length,
-      successful: results.filter(r => r.success).length,
-      failed: results.filter(r => !r.success).length,
+      successful,
+      failed: results.length - successful,
     });
 
     return results;
   }
 
-  private async syncTarget(target: SyncTarget): Promise<SyncResult> {
+  private syncTarget(target: SyncTarget): Promise<SyncResult> {
+    // Single-flight per target: a sync requested while the same target is already
+    // syncing (e.g. manual sync during a periodic run) joins the running one
+    // instead of issuing a duplicate write
+    const inFlight = this.inFlightTargetSyncs.get(target.name);
+    if (inFlight) {
+      log(`Sync already in progress for target: ${target.name}, joining it`, "debug");
+      return inFlight;
+    }
+
+    const sync = this.runTargetSync(target).finally(() => {
+      this.inFlightTargetSyncs.delete(target.name);
+    });
+    this.inFlightTargetSyncs.set(target.name, sync);
+    return sync;
+  }
+
+  private async runTargetSync(target: SyncTarget): Promise<SyncResult> {
     const startTime = Date.now();
     log(`Syncing target: ${target.name}`, "info");
 
@@ -176,6 +251,7 @@ export class SynchronizationAgent {
     // Update last sync time
     if (result.success) {
       this.lastSyncTimes.set(target.name, Date.now());
+      this.healthCache = null;
     }
     
     return result;
@@ -191,31 +267,22 @@ export class SynchronizationAgent {
         throw new Error("Knowledge graph agent not available");
       }
       
-      // Extract entities and relations from knowledge graph
-      const entities = Array.from(kgAgent.entities?.values() || []).map((entity: any) => ({
-        name: entity.name,
-        entityType: entity.entity_type || entity.entityType,
-        significance: entity.significance || 5,
-        observations: Array.isArray(entity.observations) ? entity.observations : [entity.observations].filter(Boolean),
-        metadata: entity.metadata || {}
-      }));
-      
-      const relations = Array.from(kgAgent.relations || []).map((rel: any) => ({
-        from: rel.from_entity || rel.from,
-        to: rel.to_entity || rel.to,
-        relationType: rel.relation_type || rel.relationType,
-        metadata: rel.metadata || {}
-      }));
-      
       // Here we would sync with actual MCP Memory service
-      // For now, simulate the sync
+      // For now, simulate the sync - only the counts are reported, so walk the
+      // knowledge graph collections instead of materializing projected copies
       await new Promise(resolve => setTimeout(resolve, 100));
+
+      const entityCount = kgAgent.entities?.size ?? 0;
+      let relationCount = 0;
+      for (const _rel of kgAgent.relations || []) {
+        relationCount++;
+      }
       
-      result.itemsAdded = entities.length;
-      result.itemsUpdated = relations.length;
+      result.itemsAdded = entityCount;
+      result.itemsUpdated = relationCount;
       result.itemsRemoved = 0;
       
-      log(`Synced ${entities.length} entities and ${relations.length} relations to MCP memory`, "info");
+      log(`Synced ${entityCount} entities and ${relationCount} relations to MCP memory`, "info");
       
     } catch (error) {
       log("MCP memory sync failed", "error", error);
@@ -264,26 +331,6 @@ export class SynchronizationAgent {
         }
       }
       
-      // Get current entities from knowledge graph
-      const currentEntities = Array.from(kgAgent.entities?.values() || []).map((entity: any) => ({
-        name: entity.name,
-        entityType: entity.entity_type || entity.entityType,
-        significance: entity.significance || 5,
-        observations: Array.isArray(entity.observations) ? entity.observations : [entity.observations].filter(Boolean),
-        metadata: {
-          ...entity.metadata,
-          updated_at: entity.updated_at || Date.now(),
-          created_at: entity.created_at || Date.now()
-        }
-      }));
-      
-      const currentRelations = Array.from(kgAgent.relations || []).map((rel: any) => ({
-        from: rel.from_entity || rel.from,
-        to: rel.to_entity || rel.to,
-        relationType: rel.relation_type || rel.relationType,
-        metadata: rel.metadata || {}
-      }));
-      
       // Determine project context for targeted sync
       const currentProject = this.determineCurrentProject();
 
@@ -298,8 +345,15 @@ export class SynchronizationAgent {
       }
       
       // Merge entities - only add new ones to avoid conflicts
+      // Stream over the knowledge graph entities and project only the ones that are
+      // actually missing from the file, instead of copying the whole graph first
       const existingEntityNames = new Set((existingData.entities || []).map((e: any) => e.name));
-      const newEntities = currentEntities.filter(entity => !existingEntityNames.has(entity.name));
+      const newEntities: any[] = [];
+      const now = Date.now();
+      for (const entity of kgAgent.entities?.values() || []) {
+        if (existingEntityNames.has(entity.name)) continue;
+        newEntities.push(projectExportEntity(entity, now));
+      }
       
       let changesWereMade = false;
       if (newEntities.length > 0) {
@@ -425,10 +479,18 @@ export class SynchronizationAgent {
     
     this.autoSyncTimer = setInterval(async () => {
       if (!this.running) return;
+
+      // The background sync owns the flush work - never stack a second run on top
+      // of one that is still writing
+      if (this.periodicSyncInFlight) {
+        log("Previous periodic sync still running, skipping tick", "debug");
+        return;
+      }
       
       try {
         log("Running periodic sync", "debug");
-        const results = await this.syncAll();
+        this.periodicSyncInFlight = this.syncAll();
+        const results = await this.periodicSyncInFlight;
         const successful = results.filter(r => r.success).length;
         const failed = results.filter(r => !r.success).length;
         
@@ -439,6 +501,8 @@ export class SynchronizationAgent {
         }
       } catch (error) {
         log("Periodic sync error", "error", error);
+      } finally {
+        this.periodicSyncInFlight = null;
       }
     }, this.syncInterval);
     
@@ -477,6 +541,7 @@ export class SynchronizationAgent {
     }
     
     Object.assign(target, updates);
+    this.healthCache = null;
     log(`Updated sync target: ${name}`, "info", updates);
   }
 
@@ -565,33 +630,28 @@ export class SynchronizationAgent {
         };
       }
       
-      const entities = Array.from(kgAgent.entities?.values() || []);
-      const relations = Array.from(kgAgent.relations || []);
+      // Project straight from the knowledge graph iterators in a single pass
+      // (Array.from with a map function) rather than copying and then mapping
+      const entities = Array.from(
+        kgAgent.entities?.values() || [],
+        (entity: any) => projectBackupEntity(entity, includeMetadata)
+      );
+      const relations = Array.from(
+        kgAgent.relations || [],
+        (rel: any) => projectBackupRelation(rel, includeMetadata)
+      );
       
       const backupData = {
         timestamp: Date.now(),
         sources,
         includeMetadata,
-        entities: entities.map((entity: any) => ({
-          name: entity.name,
-          entityType: entity.entity_type || entity.entityType,
-          significance: entity.significance,
-          observations: entity.observations,
-          metadata: includeMetadata ? entity.metadata : {},
-          created_at: entity.created_at,
-          updated_at: entity.updated_at
-        })),
-        relations: relations.map((rel: any) => ({
-          from: rel.from_entity || rel.from,
-          to: rel.to_entity || rel.to,
-          relationType: rel.relation_type || rel.relationType,
-          metadata: includeMetadata ? rel.metadata : {},
-          created_at: rel.created_at
-        }))
+        entities,
+        relations
       };
       
       const backupFile = path.join(backupDir, `knowledge_backup_${Date.now()}.json`);
-      await fs.writeFile(backupFile, JSON.stringify(backupData, null, 2));
+      // Backups are machine-restored, not hand-edited - write compact JSON
+      await fs.writeFile(backupFile, JSON.stringify(backupData));
       
       log(`Created backup with ${entities.length} entities and ${relations.length} relations`, "info", {
         backupFile,
@@ -619,6 +679,14 @@ export class SynchronizationAgent {
 
   // Health check
   healthCheck(): SyncHealthStatus {
+    // Health probes arrive far more often than syncs complete - reuse the last
+    // status while it is fresh (a successful sync invalidates it)
+    const computedAt = performance.now();
+    if (this.healthCache && computedAt - this.healthCache.computedAt < HEALTH_CACHE_TTL_MS) {
+      return this.healthCache.status;
+    }
+    const now = Date.now(); // lastSyncTimes are wall-clock
+
     const enabledTargets = Array.from(this.targets.values()).filter(t => t.enabled);
     const lastSyncTimes: Record<string, number> = {};
     
@@ -630,7 +698,6 @@ export class SynchronizationAgent {
     let status: "healthy" | "degraded" | "unhealthy" = "healthy";
     
     // Check if any syncs are overdue
-    const now = Date.now();
     const overdueThreshold = this.syncInterval * 3; // 3x the sync interval
     
     for (const target of enabledTargets) {
@@ -645,20 +712,32 @@ export class SynchronizationAgent {
       status = "unhealthy";
     }
     
-    return {
+    const health: SyncHealthStatus = {
       status,
       targetsEnabled: enabledTargets.length,
       lastSyncTimes,
       syncInterval: this.syncInterval,
       errors
     };
+    this.healthCache = { status: health, computedAt };
+    return health;
   }
 
   // Shutdown
-  shutdown(): void {
+  // Syncing happens continuously in the background; shutdown only stops the timer
+  // and waits for an in-flight run to drain instead of starting a final sync
+  async shutdown(): Promise<void> {
     this.running = false;
     this.stopAutoSync();
     log("SynchronizationAgent shutting down", "info");
+
+    if (this.periodicSyncInFlight) {
+      try {
+        await this.periodicSyncInFlight;
+      } catch (error) {
+        log("In-flight sync failed during shutdown", "warning", error);
+      }
+    }
   }
 
   // Event handlers for workflow integration
@@ -692,15 +771,15 @@ export class SynchronizationAgent {
       for (const entityName of conflicts) {
         try {
           const kgAgent = this.agents.get("knowledge_graph");
-          if (!kgAgent || !kgAgent.entities?.has(entityName)) {
+          const entity = kgAgent?.entities?.get(entityName);
+          if (!entity) {
             errors.push({
               entity: entityName,
               error: "Entity not found in knowledge graph"
             });
             continue;
           }
-          
-          const entity = kgAgent.entities.get(entityName);
+
           let resolvedAction = "default_resolution";
           
           // Apply resolution strategy
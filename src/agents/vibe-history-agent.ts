@@ -3,6 +3,7 @@ import * as path from 'path';
 import { log } from '../logging.js';
 import { CheckpointManager } from '../utils/checkpoint-manager.js';
 import { SemanticAnalyzer } from './semantic-analyzer.js';
+import { extractJsonBlock } from '../utils/json-extraction.js';
 
 export interface ConversationSession {
   filename: string;
@@ -105,6 +106,46 @@ export interface VibeHistoryAnalysisResult {
   };
 }
 
+// Parsed sessions shared by every agent instance, keyed by file path and valid while the file's
+// mtime and size are unchanged; overlapping batch date ranges and repeat runs skip the re-parse
+const SESSION_CACHE_MAX_ENTRIES = parseInt(process.env.SESSION_CACHE_MAX_ENTRIES || '256', 10);
+const parsedSessionCache = new Map<string, { mtimeMs: number; size: number; session: ConversationSession | null }>();
+
+// Keyword classifiers compiled once: each is a case-insensitive alternation run directly over
+// the message text, so no lowercased copy of (potentially very long) session text is made
+const MESSAGE_ACTION_PATTERNS = [
+  { pattern: /creating?|create/i, action: 'create' },
+  { pattern: /updating?|update/i, action: 'update' },
+  { pattern: /fixing?|fix/i, action: 'fix' },
+  { pattern: /analyzing?|analyze/i, action: 'analyze' },
+  { pattern: /implementing?|implement/i, action: 'implement' },
+  { pattern: /refactoring?|refactor/i, action: 'refactor' },
+  { pattern: /debug/i, action: 'debug' },
+  { pattern: /test/i, action: 'test' }
+];
+
+const EXCHANGE_ACTION_PATTERNS = [
+  { pattern: /creating?|create/i, action: 'create' },
+  { pattern: /updating?|update/i, action: 'update' },
+  { pattern: /fixing?|fix/i, action: 'fix' },
+  { pattern: /analyzing?|analyze/i, action: 'analyze' },
+  { pattern: /implementing?|implement/i, action: 'implement' },
+  { pattern: /refactoring?|refactor/i, action: 'refactor' },
+  { pattern: /testing?|test/i, action: 'test' },
+  { pattern: /debugging?|debug/i, action: 'debug' }
+];
+
+const CONTEXT_START_PATTERN = /help me|i need to|how do i|can you|implement|create|fix|debug|analyze|review/i;
+
+const PROBLEM_TYPE_PATTERNS = [
+  { type: 'Bug Fix', pattern: /bug|error|issue|problem|broken|fail/i },
+  { type: 'Feature Implementation', pattern: /implement|feature|add|create|new/i },
+  { type: 'Refactoring', pattern: /refactor|improve|optimize|cleanup|restructure/i },
+  { type: 'Configuration', pattern: /config|setup|install|configure/i },
+  { type: 'Analysis', pattern: /analyze|review|investigate|understand/i },
+  { type: 'Testing', pattern: /test|spec|verification|validate/i }
+];
+
 export class VibeHistoryAgent {
   private repositoryPath: string;
   private specstoryPath: string;
@@ -224,7 +265,8 @@ export class VibeHistoryAgent {
   }
 
   private validateSpecstoryDirectory(): void {
-    if (!fs.existsSync(this.specstoryPath)) {
+    // One stat answers both existence and type
+    if (!fs.statSync(this.specstoryPath, { throwIfNoEntry: false })?.isDirectory()) {
       throw new Error(`Specstory directory not found: ${this.specstoryPath}`);
     }
   }
@@ -244,19 +286,19 @@ export class VibeHistoryAgent {
     const PARALLEL_BATCH_SIZE = 20; // Process 20 files in parallel
 
     try {
-      // Sort files by modification time descending to get most recent first
+      // Sort files by modification time descending to get most recent first; each file is
+      // stat'd once here and the stats are reused for filtering, sorting and the parse cache
       let files = fs.readdirSync(this.specstoryPath)
         .filter(file => file.endsWith('.md'))
-        .map(file => ({
-          name: file,
-          path: path.join(this.specstoryPath, file),
-          mtime: fs.statSync(path.join(this.specstoryPath, file)).mtime
-        }))
-        .sort((a, b) => b.mtime.getTime() - a.mtime.getTime()); // Most recent first
+        .map(file => {
+          const filePath = path.join(this.specstoryPath, file);
+          return { name: file, path: filePath, stats: fs.statSync(filePath) };
+        })
+        .sort((a, b) => b.stats.mtimeMs - a.stats.mtimeMs); // Most recent first
 
       // Filter by timestamp if provided
       if (fromTimestamp) {
-        files = files.filter(f => f.mtime >= fromTimestamp);
+        files = files.filter(f => f.stats.mtime >= fromTimestamp);
       }
 
       // Apply maxSessions limit if provided and > 0
@@ -277,7 +319,7 @@ export class VibeHistoryAgent {
         const batchResults = await Promise.all(
           batch.map(async (file) => {
             try {
-              return await this.parseSessionFile(file.path);
+              return await this.parseSessionFile(file.path, file.stats);
             } catch (error) {
               log(`Failed to parse session file: ${file.name}`, 'warning', error);
               return null;
@@ -324,13 +366,13 @@ export class VibeHistoryAgent {
         .filter(file => file.endsWith('.md'))
         .map(file => {
           const filePath = path.join(this.specstoryPath, file);
-          const stats = fs.statSync(filePath);
-          // Extract date from filename for more accurate filtering
+          // Extract date from filename for more accurate filtering; only files without a
+          // dated name need a stat for their mtime
           const dateFromFilename = this.extractDateFromFilename(file);
           return {
             name: file,
             path: filePath,
-            date: dateFromFilename || stats.mtime
+            date: dateFromFilename || fs.statSync(filePath).mtime
           };
         });
 
@@ -488,9 +530,34 @@ export class VibeHistoryAgent {
     return totalTokens;
   }
 
-  private async parseSessionFile(filePath: string): Promise<ConversationSession | null> {
+  private async parseSessionFile(filePath: string, knownStats?: fs.Stats): Promise<ConversationSession | null> {
+    try {
+      // Async stat/read: callers parse batches of files under Promise.all, so the reads overlap
+      const stats = knownStats || await fs.promises.stat(filePath);
+      const cached = parsedSessionCache.get(filePath);
+      if (cached && cached.mtimeMs === stats.mtimeMs && cached.size === stats.size) {
+        // Re-insert to keep the map in LRU order
+        parsedSessionCache.delete(filePath);
+        parsedSessionCache.set(filePath, cached);
+        return cached.session;
+      }
+
+      const session = this.parseSessionContent(filePath, await fs.promises.readFile(filePath, 'utf8'));
+      parsedSessionCache.delete(filePath);
+      parsedSessionCache.set(filePath, { mtimeMs: stats.mtimeMs, size: stats.size, session });
+      if (parsedSessionCache.size > SESSION_CACHE_MAX_ENTRIES) {
+        parsedSessionCache.delete(parsedSessionCache.keys().next().value!);
+      }
+      return session;
+
+    } catch (error) {
+      log(`Error parsing session file: ${filePath}`, 'error', error);
+      return null;
+    }
+  }
+
+  private parseSessionContent(filePath: string, content: string): ConversationSession | null {
     try {
-      const content = fs.readFileSync(filePath, 'utf8');
       const filename = path.basename(filePath);
       
       // Extract metadata from filename and content
@@ -616,6 +683,10 @@ export class VibeHistoryAgent {
     // NEW FORMAT: Find all Text Exchange sections (actual user conversations)
     const textExchangeRegex = /### Text Exchange - ([^\n]+)\n\n\*\*User Message:\*\* ([\s\S]*?)(?=\n\n\*\*|\n---|\n### |\n## |$)/g;
     let match;
+    // Tool calls (and the assistant message built from them) depend only on the prompt set,
+    // so they are parsed once and shared by its text exchanges rather than re-parsed per exchange
+    let promptSetToolCalls: Array<{tool: string; timestamp: Date; result: string; output?: string; userRequest?: string}> | null = null;
+    let promptSetAssistantMessage = '';
 
     while ((match = textExchangeRegex.exec(promptSet)) !== null) {
       const timestampStr = match[1];
@@ -625,8 +696,12 @@ export class VibeHistoryAgent {
       const timestamp = this.parseTimestamp(timestampStr);
 
       // Look for tool calls that follow this user message (assistant response)
-      const toolCalls = this.extractToolCallsFromPromptSet(promptSet);
-      const assistantMessage = this.buildAssistantMessageFromToolCalls(toolCalls);
+      if (!promptSetToolCalls) {
+        promptSetToolCalls = this.extractToolCallsFromPromptSet(promptSet);
+        promptSetAssistantMessage = this.buildAssistantMessageFromToolCalls(promptSetToolCalls);
+      }
+      const toolCalls = promptSetToolCalls;
+      const assistantMessage = promptSetAssistantMessage;
 
       exchanges.push({
         id: id++,
@@ -794,18 +869,7 @@ export class VibeHistoryAgent {
 
   private extractActionsFromMessage(message: string): string[] {
     const actions: string[] = [];
-    const actionPatterns = [
-      { pattern: /creating?|create/i, action: 'create' },
-      { pattern: /updating?|update/i, action: 'update' },
-      { pattern: /fixing?|fix/i, action: 'fix' },
-      { pattern: /analyzing?|analyze/i, action: 'analyze' },
-      { pattern: /implementing?|implement/i, action: 'implement' },
-      { pattern: /refactoring?|refactor/i, action: 'refactor' },
-      { pattern: /debug/i, action: 'debug' },
-      { pattern: /test/i, action: 'test' }
-    ];
-
-    for (const { pattern, action } of actionPatterns) {
+    for (const { pattern, action } of MESSAGE_ACTION_PATTERNS) {
       if (pattern.test(message) && !actions.includes(action)) {
         actions.push(action);
       }
@@ -869,19 +933,8 @@ export class VibeHistoryAgent {
     }
 
     // Extract actions from common patterns
-    const actionPatterns = [
-      { pattern: /creating?|create/i, action: 'create' },
-      { pattern: /updating?|update/i, action: 'update' },
-      { pattern: /fixing?|fix/i, action: 'fix' },
-      { pattern: /analyzing?|analyze/i, action: 'analyze' },
-      { pattern: /implementing?|implement/i, action: 'implement' },
-      { pattern: /refactoring?|refactor/i, action: 'refactor' },
-      { pattern: /testing?|test/i, action: 'test' },
-      { pattern: /debugging?|debug/i, action: 'debug' }
-    ];
-
     const combinedText = userMessage + ' ' + assistantMessage;
-    actionPatterns.forEach(({ pattern, action }) => {
+    EXCHANGE_ACTION_PATTERNS.forEach(({ pattern, action }) => {
       if (pattern.test(combinedText) && !actions.includes(action)) {
         actions.push(action);
       }
@@ -929,13 +982,7 @@ export class VibeHistoryAgent {
   }
 
   private isContextStart(exchange: ConversationExchange): boolean {
-    const userMessage = exchange.userMessage.toLowerCase();
-    const startPatterns = [
-      'help me', 'i need to', 'how do i', 'can you', 'implement',
-      'create', 'fix', 'debug', 'analyze', 'review'
-    ];
-
-    return startPatterns.some(pattern => userMessage.includes(pattern));
+    return CONTEXT_START_PATTERN.test(exchange.userMessage);
   }
 
   private buildDevelopmentContext(
@@ -946,10 +993,9 @@ export class VibeHistoryAgent {
     if (exchanges.length === 0) return null;
 
     const firstExchange = exchanges[0];
-    const allText = exchanges.map(e => e.userMessage + ' ' + e.assistantMessage).join(' ');
 
     // Determine problem type
-    const problemType = this.identifyProblemType(allText);
+    const problemType = this.identifyProblemType(exchanges);
     
     // Extract problem description
     const problemDescription = firstExchange.userMessage.split('\n')[0].trim();
@@ -974,19 +1020,10 @@ export class VibeHistoryAgent {
     };
   }
 
-  private identifyProblemType(text: string): string {
-    const problemTypes = [
-      { type: 'Bug Fix', keywords: ['bug', 'error', 'issue', 'problem', 'broken', 'fail'] },
-      { type: 'Feature Implementation', keywords: ['implement', 'feature', 'add', 'create', 'new'] },
-      { type: 'Refactoring', keywords: ['refactor', 'improve', 'optimize', 'cleanup', 'restructure'] },
-      { type: 'Configuration', keywords: ['config', 'setup', 'install', 'configure'] },
-      { type: 'Analysis', keywords: ['analyze', 'review', 'investigate', 'understand'] },
-      { type: 'Testing', keywords: ['test', 'spec', 'verification', 'validate'] }
-    ];
-
-    const lowerText = text.toLowerCase();
-    for (const { type, keywords } of problemTypes) {
-      if (keywords.some(keyword => lowerText.includes(keyword))) {
+  private identifyProblemType(exchanges: ConversationExchange[]): string {
+    // No keyword contains a space, so testing each message equals testing the joined text
+    for (const { type, pattern } of PROBLEM_TYPE_PATTERNS) {
+      if (exchanges.some(e => pattern.test(e.userMessage) || pattern.test(e.assistantMessage))) {
         return type;
       }
     }
@@ -1170,13 +1207,13 @@ Return 3-8 topics per batch. Return ONLY the JSON array, no other text.`;
       });
 
       // Parse LLM response - insights is the string response
-      const jsonMatch = result.insights.match(/\[[\s\S]*\]/);
-      if (!jsonMatch) {
+      const jsonBlock = extractJsonBlock(result.insights, 'array');
+      if (!jsonBlock) {
         log(`No JSON array found in LLM response for batch ${batchIndex}`, 'warning');
         return [];
       }
 
-      const topics = JSON.parse(jsonMatch[0]) as Array<{
+      const topics = JSON.parse(jsonBlock) as Array<{
         topic: string;
         category: string;
         description: string;
@@ -1396,13 +1433,13 @@ Return 2-6 pairs per batch. Return ONLY the JSON array, no other text.`;
       });
 
       // Parse LLM response
-      const jsonMatch = result.insights.match(/\[[\s\S]*\]/);
-      if (!jsonMatch) {
+      const jsonBlock = extractJsonBlock(result.insights, 'array');
+      if (!jsonBlock) {
         log(`No JSON array found in problem/solution LLM response for batch ${batchIndex}`, 'warning');
         return [];
       }
 
-      const rawPairs = JSON.parse(jsonMatch[0]) as Array<{
+      const rawPairs = JSON.parse(jsonBlock) as Array<{
         task: string;
         context?: string;
         difficulty: string;
@@ -2,6 +2,8 @@ import { log } from "../logging.js";
 import axios, { AxiosRequestConfig } from "axios";
 import * as cheerio from "cheerio";
 import { SemanticAnalyzer } from './semantic-analyzer.js';
+import { sharedHttpAgent, sharedHttpsAgent } from '../utils/llm-client-pool.js';
+import { extractJsonBlock } from '../utils/json-extraction.js';
 
 export interface SearchOptions {
   maxResults?: number;
@@ -171,6 +173,8 @@ export class WebSearchAgent {
       
       const config: AxiosRequestConfig = {
         timeout: options.timeout || 30000,
+        httpAgent: sharedHttpAgent,
+        httpsAgent: sharedHttpsAgent,
         headers: {
           'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
           'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -206,15 +210,13 @@ export class WebSearchAgent {
         }
       });
 
-      // Second pass: calculate relevance scores asynchronously
-      const results: SearchResult[] = await Promise.all(
-        rawResults.map(async ({ title, url, snippet }) => ({
-          title,
-          url,
-          snippet,
-          relevanceScore: await this.calculateRelevance(title, snippet, query),
-        }))
-      );
+      // Second pass: calculate relevance scores
+      const results: SearchResult[] = rawResults.map(({ title, url, snippet }) => ({
+        title,
+        url,
+        snippet,
+        relevanceScore: this.calculateRelevance(title, snippet, query),
+      }));
 
       // Extract content if requested
       if (options.contentExtraction?.extractCode || options.contentExtraction?.extractLinks) {
@@ -256,6 +258,8 @@ export class WebSearchAgent {
       
       const config: AxiosRequestConfig = {
         timeout: options.timeout || 30000,
+        httpAgent: sharedHttpAgent,
+        httpsAgent: sharedHttpsAgent,
         headers: {
           'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
           'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -298,15 +302,13 @@ export class WebSearchAgent {
         }
       });
 
-      // Second pass: calculate relevance scores asynchronously
-      const results: SearchResult[] = await Promise.all(
-        rawResults.map(async ({ title, url, snippet }) => ({
-          title,
-          url,
-          snippet,
-          relevanceScore: await this.calculateRelevance(title, snippet, query),
-        }))
-      );
+      // Second pass: calculate relevance scores
+      const results: SearchResult[] = rawResults.map(({ title, url, snippet }) => ({
+        title,
+        url,
+        snippet,
+        relevanceScore: this.calculateRelevance(title, snippet, query),
+      }));
 
       // Extract content if requested (limit to top 3 results)
       if (options.contentExtraction?.extractCode || options.contentExtraction?.extractLinks) {
@@ -337,7 +339,7 @@ export class WebSearchAgent {
     }
   }
 
-  private async calculateRelevance(title: string, snippet: string, query: string): Promise<number> {
+  private calculateRelevance(title: string, snippet: string, query: string): number {
     // Keyword-based relevance scoring (fast baseline)
     const queryWords = query.toLowerCase().split(/\s+/);
     const titleWords = title.toLowerCase().split(/\s+/);
@@ -406,9 +408,9 @@ Respond with JSON:
       });
 
       // Parse LLM response
-      const jsonMatch = result.insights.match(/\{[\s\S]*\}/);
-      if (jsonMatch) {
-        const parsed = JSON.parse(jsonMatch[0]);
+      const jsonBlock = extractJsonBlock(result.insights);
+      if (jsonBlock) {
+        const parsed = JSON.parse(jsonBlock);
 
         // Reorder results based on LLM ranking
         const rankedResults: SearchResult[] = [];
@@ -594,6 +596,8 @@ const result = ${query.replace(/\s+/g, '')}();`,
     try {
       const config: AxiosRequestConfig = {
         timeout: (options.timeout || 30000) / 2, // Use half the search timeout for content extraction
+        httpAgent: sharedHttpAgent,
+        httpsAgent: sharedHttpsAgent,
         headers: {
           'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
           'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -4,6 +4,8 @@ import { StdioServerTransport } from "@modelcontextprotocol/sdk/server/stdio.js"
 import { createServer } from "./server.js";
 import { setupLogging, log, logError } from "./logging.js";
 import { setServerInstance } from "./tools.js";
+import { closeSharedLLMClients } from "./utils/llm-client-pool.js";
+import { flushLLMResponseCaches } from "./utils/llm-response-cache.js";
 
 // Setup logging FIRST - before anything else
 setupLogging();
@@ -36,6 +38,9 @@ async function gracefulShutdown(reason: string) {
   // Give pending operations a moment to complete
   await new Promise(resolve => setTimeout(resolve, 100));
 
+  await flushLLMResponseCaches();
+  closeSharedLLMClients();
+
   log('Shutdown complete', 'info');
   process.exit(0);
 }
@@ -27,6 +27,7 @@ import {
   aggregateUpstreamContexts,
 } from '../types/agent-response.js';
 import { SemanticAnalyzer } from '../agents/semantic-analyzer.js';
+import { extractJsonBlock } from '../utils/json-extraction.js';
 
 /**
  * Step status in the workflow
@@ -591,9 +592,9 @@ Respond with JSON:
       tier: 'premium',
     });
 
-    const jsonMatch = result.insights.match(/\{[\s\S]*\}/);
-    if (jsonMatch) {
-      return JSON.parse(jsonMatch[0]);
+    const jsonBlock = extractJsonBlock(result.insights);
+    if (jsonBlock) {
+      return JSON.parse(jsonBlock);
     }
 
     // Fallback
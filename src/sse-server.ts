@@ -12,6 +12,8 @@ import { SSEServerTransport } from "@modelcontextprotocol/sdk/server/sse.js";
 import { createServer } from "./server.js";
 import { log, logError } from "./logging.js";
 import { setServerInstance } from "./tools.js";
+import { closeSharedLLMClients } from "./utils/llm-client-pool.js";
+import { flushLLMResponseCaches } from "./utils/llm-response-cache.js";
 
 const PORT = parseInt(process.env.SEMANTIC_ANALYSIS_PORT || '3848', 10);
 
@@ -154,6 +156,8 @@ process.on('SIGINT', async () => {
       console.error(`Error closing transport for session ${sessionId}:`, error);
     }
   }
+  await flushLLMResponseCaches();
+  closeSharedLLMClients();
   console.log('Server shutdown complete');
   process.exit(0);
 });
@@ -174,5 +178,7 @@ process.on('SIGTERM', async () => {
       console.error(`Error closing transport for session ${sessionId}:`, error);
     }
   }
+  await flushLLMResponseCaches();
+  closeSharedLLMClients();
   process.exit(0);
 });
@@ -24,6 +24,17 @@ const __dirname = path.dirname(__filename);
 const CODING_ROOT = process.env.CODING_ROOT || process.env.CODING_TOOLS_PATH || process.env.CODING_REPO || path.resolve(__dirname, '../../../..');;
 const DEFAULT_DB_PATH = path.join(CODING_ROOT, '.data', 'knowledge-graph');
 
+// Upper bound for the VKB server availability probe; a hung server must not stall initialization
+const VKB_PROBE_TIMEOUT_MS = parseInt(process.env.VKB_PROBE_TIMEOUT_MS || '1500', 10);
+
+/** Raised when the VKB availability probe does not answer in time */
+class VkbProbeTimeoutError extends Error {
+  constructor(timeoutMs: number) {
+    super(`VKB availability probe timed out after ${timeoutMs}ms`);
+    this.name = 'VkbProbeTimeoutError';
+  }
+}
+
 // Dynamic import to avoid TypeScript compilation issues
 let VkbApiClient: any;
 
@@ -85,7 +96,7 @@ export class GraphDatabaseAdapter {
       this.apiClient = new VkbApiClient({ debug: false });
 
       // Check if VKB server is available
-      this.useApi = await this.apiClient.isServerAvailable();
+      this.useApi = await this.probeVkbServer();
 
       if (this.useApi) {
         log('GraphDatabaseAdapter using VKB API (server is running)', 'info');
@@ -137,6 +148,29 @@ export class GraphDatabaseAdapter {
     }
   }
 
+  /**
+   * Probe VKB server availability with a hard timeout
+   * Only a timeout is treated as "server unavailable"; other probe errors propagate
+   */
+  private async probeVkbServer(): Promise<boolean> {
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const timeout = new Promise<never>((_, reject) => {
+      timer = setTimeout(() => reject(new VkbProbeTimeoutError(VKB_PROBE_TIMEOUT_MS)), VKB_PROBE_TIMEOUT_MS);
+    });
+
+    try {
+      return await Promise.race([this.apiClient.isServerAvailable(), timeout]);
+    } catch (error) {
+      if (error instanceof VkbProbeTimeoutError) {
+        log(error.message, 'warning');
+        return false;
+      }
+      throw error;
+    } finally {
+      clearTimeout(timer);
+    }
+  }
+
   /**
    * Store an entity in the graph database
    * Uses intelligent routing: API or direct access
@@ -181,10 +215,10 @@ export class GraphDatabaseAdapter {
       });
 
       // Store relationships if provided
+      // Relationships of one entity are independent writes - issue them together
+      // instead of paying one round-trip per relationship
       if (entity.relationships && entity.relationships.length > 0) {
-        for (const rel of entity.relationships) {
-          await this.storeRelationship(rel);
-        }
+        await Promise.all(entity.relationships.map(rel => this.storeRelationship(rel)));
       }
 
       return nodeId;
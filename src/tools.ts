@@ -20,7 +20,8 @@ import { OntologyValidator } from "./ontology/OntologyValidator.js";
 import fs from "fs/promises";
 import { mkdirSync, writeFileSync, existsSync, readFileSync, unlinkSync, openSync, closeSync, readdirSync, appendFileSync } from "fs";
 import path from "path";
-import { spawn } from "child_process";
+import { spawn, exec } from "child_process";
+import { promisify } from "util";
 import { fileURLToPath } from "url";
 
 // ES module compatible __dirname
@@ -950,7 +951,6 @@ async function handleCreateUkbEntity(args: any): Promise<any> {
   });
 
   // Use GraphDatabaseAdapter for direct LevelDB persistence (NO SharedMemory)
-  const { GraphDatabaseAdapter } = await import('./storage/graph-database-adapter.js');
   const graphDB = new GraphDatabaseAdapter();
   await graphDB.initialize();
 
@@ -1139,7 +1139,8 @@ async function handleExecuteWorkflow(args: any): Promise<any> {
       }
     };
 
-    writeFileSync(configFile, JSON.stringify(config, null, 2));
+    // Config is a handoff to the runner process (parsed, never hand-edited) - keep it compact
+    writeFileSync(configFile, JSON.stringify(config));
 
     // Spawn the workflow runner as a detached process
     const runnerScript = path.join(__dirname, 'workflow-runner.js');
@@ -1443,10 +1444,17 @@ async function handleGetWorkflowStatus(args: any): Promise<any> {
   const progressFilePath = path.join(repoPath, '.data', 'workflow-progress.json');
   const runnerProgressFilePath = path.join(repoPath, '.data', 'workflow-runner-progress.json');
 
+  // The runner and coordinator progress files are independent - read both
+  // concurrently up front (null = missing) instead of probing them one by one
+  const [runnerProgressContent, progressContent] = await Promise.all([
+    fs.readFile(runnerProgressFilePath, 'utf-8').catch(() => null),
+    fs.readFile(progressFilePath, 'utf-8').catch(() => null)
+  ]);
+
   // Check for detached workflow runner progress first (process-isolated workflows)
   try {
-    if (existsSync(runnerProgressFilePath)) {
-      const runnerProgress = JSON.parse(readFileSync(runnerProgressFilePath, 'utf-8'));
+    if (runnerProgressContent !== null) {
+      const runnerProgress = JSON.parse(runnerProgressContent);
 
       // Check if this matches the requested workflow_id (or no specific ID requested)
       if (!workflow_id || runnerProgress.workflowId === workflow_id) {
@@ -1482,9 +1490,9 @@ async function handleGetWorkflowStatus(args: any): Promise<any> {
         }
 
         // Also merge with coordinator progress if available
-        if (existsSync(progressFilePath)) {
+        if (progressContent !== null) {
           try {
-            const coordProgress = JSON.parse(readFileSync(progressFilePath, 'utf-8'));
+            const coordProgress = JSON.parse(progressContent);
             if (coordProgress.currentStep) {
               statusText += `\n## Coordinator Progress\n`;
               statusText += `- **Current Step:** ${coordProgress.currentStep}\n`;
@@ -1522,8 +1530,8 @@ async function handleGetWorkflowStatus(args: any): Promise<any> {
 
     // Also read progress file for detailed progress
     try {
-      if (existsSync(progressFilePath)) {
-        const progressData = JSON.parse(readFileSync(progressFilePath, 'utf-8'));
+      if (progressContent !== null) {
+        const progressData = JSON.parse(progressContent);
         statusText += `\n## Progress Details\n`;
         statusText += `- **Current Step:** ${progressData.currentStep || 'N/A'}\n`;
         statusText += `- **Steps:** ${progressData.completedSteps || 0}/${progressData.totalSteps || 0}\n`;
@@ -1543,7 +1551,7 @@ async function handleGetWorkflowStatus(args: any): Promise<any> {
 
   // Read progress file directly
   try {
-    if (!existsSync(progressFilePath)) {
+    if (progressContent === null) {
       return {
         content: [{
           type: "text",
@@ -1552,7 +1560,7 @@ async function handleGetWorkflowStatus(args: any): Promise<any> {
       };
     }
 
-    let progressData = JSON.parse(readFileSync(progressFilePath, 'utf-8'));
+    let progressData = JSON.parse(progressContent);
 
     // CRITICAL: Detect crashed workflows (process dead but status still "running")
     // This updates the progress file and returns the corrected status
@@ -1993,8 +2001,6 @@ async function handleGeneratePlantUMLDiagrams(args: any): Promise<any> {
     let pngGenerated = false;
     
     try {
-      const { exec } = await import('child_process');
-      const { promisify } = await import('util');
       const execAsync = promisify(exec);
       
       // Use relative path to avoid nested directory creation
@@ -2076,10 +2082,10 @@ function generateArchitectureDiagram(title: string, analysis: any): string {
   
   // Try different sources for meaningful components
   if (analysis?.semanticInsights?.patterns) {
-    components = analysis.semanticInsights.patterns.map((p: any) => p.name || p.pattern).slice(0, 8);
+    components = analysis.semanticInsights.patterns.slice(0, 8).map((p: any) => p.name || p.pattern);
     log(`Using semantic insights patterns:`, 'debug', components);
   } else if (analysis?.codeAnalysis?.patterns) {
-    components = analysis.codeAnalysis.patterns.map((p: any) => p.name || p.pattern).slice(0, 8);
+    components = analysis.codeAnalysis.patterns.slice(0, 8).map((p: any) => p.name || p.pattern);
     log(`Using code analysis patterns:`, 'debug', components);
   } else if (analysis?.commits && analysis.commits.length > 0) {
     // Extract components from git commit messages and file changes
@@ -2103,7 +2109,7 @@ function generateArchitectureDiagram(title: string, analysis: any): string {
     log(`Using components from git commits:`, 'debug', components);
   } else if (analysis?.architecturalDecisions) {
     // Use architectural decisions as components
-    components = analysis.architecturalDecisions.map((d: any) => d.component || d.area || 'System Component').slice(0, 6);
+    components = analysis.architecturalDecisions.slice(0, 6).map((d: any) => d.component || d.area || 'System Component');
     log(`Using architectural decisions:`, 'debug', components);
   }
   
@@ -0,0 +1,33 @@
+/**
+ * Bounded concurrency
+ *
+ * Shared worker pool for independent async jobs (git invocations, sync targets, LLM
+ * batches, GraphDB writes): up to `limit` jobs are in flight, and each worker takes the
+ * next item as soon as its previous one finishes, so one slow item does not hold back a
+ * fixed-size batch.
+ */
+
+/**
+ * Map `items` through `fn` with at most `limit` calls in flight. Results keep input order.
+ * A limit that is not a positive number runs one job at a time. The first rejection from
+ * `fn` rejects the whole call (jobs already started are not cancelled), so callers that want
+ * per-item failures should catch inside `fn`.
+ */
+export async function mapWithConcurrency<T, R>(
+  items: readonly T[],
+  limit: number,
+  fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let nextIndex = 0;
+  const worker = async (): Promise<void> => {
+    while (nextIndex < items.length) {
+      const index = nextIndex++;
+      results[index] = await fn(items[index], index);
+    }
+  };
+
+  const width = Number.isFinite(limit) && limit >= 1 ? Math.floor(limit) : 1;
+  await Promise.all(Array.from({ length: Math.min(width, items.length) }, worker));
+  return results;
+}
@@ -0,0 +1,53 @@
+/**
+ * JSON block extraction for LLM responses
+ *
+ * LLM responses wrap their JSON payload in prose or markdown fences. The
+ * historical extraction used a greedy `/\{[\s\S]*\}/` match, which drives the
+ * regex engine across the whole response and, when the prose after the payload
+ * contains another bracket, returns a span that is not valid JSON. A single
+ * forward scan tracking bracket depth (and skipping string literals) stops at
+ * the end of the first complete top-level block instead.
+ */
+
+const BRACKETS = {
+  object: ['{', '}'],
+  array: ['[', ']']
+} as const;
+
+/**
+ * Return the first complete top-level object (or array) in the text, or null.
+ * When the block is never closed (e.g. a truncated response), falls back to the
+ * span from the first opening to the last closing bracket.
+ */
+export function extractJsonBlock(text: string, kind: 'object' | 'array' = 'object'): string | null {
+  const [open, close] = BRACKETS[kind];
+  const start = text.indexOf(open);
+  if (start === -1) {
+    return null;
+  }
+
+  let depth = 0;
+  let inString = false;
+  for (let i = start; i < text.length; i++) {
+    const ch = text[i];
+    if (inString) {
+      if (ch === '\\') {
+        i++;
+      } else if (ch === '"') {
+        inString = false;
+      }
+    } else if (ch === '"') {
+      inString = true;
+    } else if (ch === open) {
+      depth++;
+    } else if (ch === close && --depth === 0) {
+      return text.slice(start, i + 1);
+    }
+  }
+
+  const end = text.lastIndexOf(close);
+  if (end <= start) {
+    return null;
+  }
+  return text.slice(start, end + 1);
+}
@@ -0,0 +1,88 @@
+/**
+ * LLM client pool
+ *
+ * Process-wide registry of LLM SDK clients. Agents construct their own
+ * SemanticAnalyzer / SemanticAnalysisAgent instances (some per tool call), and
+ * every SDK client owns its own HTTP agent, so per-instance clients meant a new
+ * DNS + TCP + TLS handshake for the first request of every instance. Sharing one
+ * client per provider configuration keeps those connections alive across agents.
+ *
+ * The provider SDKs bring their own keep-alive agents; plain axios calls (Ollama,
+ * web search) use the shared agents below so they also reuse warm sockets,
+ * bounded regardless of the Node version's global agent defaults.
+ */
+
+import * as crypto from "crypto";
+import * as http from "http";
+import * as https from "https";
+
+const KEEPALIVE_MAX_SOCKETS = parseInt(process.env.HTTP_KEEPALIVE_MAX_SOCKETS || '50', 10);
+const KEEPALIVE_MAX_FREE_SOCKETS = parseInt(process.env.HTTP_KEEPALIVE_MAX_FREE_SOCKETS || '20', 10);
+
+export const sharedHttpAgent = new http.Agent({
+  keepAlive: true,
+  maxSockets: KEEPALIVE_MAX_SOCKETS,
+  maxFreeSockets: KEEPALIVE_MAX_FREE_SOCKETS,
+});
+
+export const sharedHttpsAgent = new https.Agent({
+  keepAlive: true,
+  maxSockets: KEEPALIVE_MAX_SOCKETS,
+  maxFreeSockets: KEEPALIVE_MAX_FREE_SOCKETS,
+});
+
+const clients = new Map<string, unknown>();
+
+// Placeholder values from the example env files count as "not configured"
+const API_KEY_PLACEHOLDERS: Record<string, string> = {
+  GROQ_API_KEY: "your-groq-api-key",
+  GOOGLE_API_KEY: "your-google-api-key",
+  ANTHROPIC_API_KEY: "your-anthropic-api-key",
+  OPENAI_API_KEY: "your-openai-api-key",
+};
+
+const configuredApiKeys = new Map<string, string | null>();
+
+/**
+ * Return the API key in an env var, or null when unset or left at its placeholder.
+ * Resolved once per process, since the environment does not change at runtime.
+ */
+export function getConfiguredApiKey(envVar: string): string | null {
+  let key = configuredApiKeys.get(envVar);
+  if (key === undefined) {
+    const value = process.env[envVar];
+    key = value && value !== API_KEY_PLACEHOLDERS[envVar] ? value : null;
+    configuredApiKeys.set(envVar, key);
+  }
+  return key;
+}
+
+/**
+ * Return the shared client for a provider configuration, creating it on first use.
+ * The API key is hashed into the registry key so it is never held as a map key.
+ */
+export function getSharedLLMClient<T>(
+  provider: string,
+  apiKey: string,
+  options: { baseURL?: string; timeout?: number },
+  create: () => T
+): T {
+  const keyHash = crypto.createHash("sha256").update(apiKey).digest("hex").substring(0, 16);
+  const cacheKey = `${provider}|${keyHash}|${options.baseURL || ""}|${options.timeout ?? ""}`;
+
+  let client = clients.get(cacheKey) as T | undefined;
+  if (!client) {
+    client = create();
+    clients.set(cacheKey, client);
+  }
+  return client;
+}
+
+/**
+ * Drop all shared clients and close pooled sockets (call on server shutdown)
+ */
+export function closeSharedLLMClients(): void {
+  clients.clear();
+  sharedHttpAgent.destroy();
+  sharedHttpsAgent.destroy();
+}
@@ -0,0 +1,705 @@
+/**
+ * LLMResponseCache
+ *
+ * In-memory cache for LLM analysis responses with two lookup tiers:
+ * - Exact tier: sha256 of the prompt, so byte-identical prompts never hit the LLM twice
+ * - Semantic tier (optional): cosine similarity over prompt embeddings, so paraphrased
+ *   or whitespace-shifted prompts can reuse a prior response
+ *
+ * Entries are partitioned (e.g. by analysis type) so a similar prompt for a
+ * different kind of analysis never returns the wrong shape of answer.
+ *
+ * Features:
+ * - TTL-based expiry; expired entries are swept before any live entry is evicted
+ * - Bounded size with LRU order; entries that have been hit often are kept over one-off entries
+ * - Callers hash the prompt once (keyFor) and reuse the key for lookup and store
+ * - Very large prompts are keyed by a sampled fingerprint rather than a full hash
+ * - Embeddings stored L2-normalized in one contiguous matrix, so the semantic tier is a
+ *   single linear dot-product scan rather than a walk over per-entry arrays
+ * - Matrix rows quantized to int8 with a per-row scale, a quarter of the memory of float32;
+ *   at the similarity thresholds used the score drift is well under 0.01
+ * - Optional disk persistence (debounced writes) so a restarted server starts warm
+ */
+
+import * as fs from "fs";
+import * as path from "path";
+import * as crypto from "crypto";
+import { log } from "../logging.js";
+
+export interface LLMResponseCacheConfig {
+  ttlMs?: number;               // Default: 1 hour
+  maxEntries?: number;          // Default: 500
+  similarityThreshold?: number; // Default: 0.87
+  promoteAfterHits?: number;    // Default: 3
+  cachePath?: string;           // Persist to this file when set (default: memory only)
+  writeDebounceMs?: number;     // Default: 5000ms
+}
+
+interface CachedResponse<T> {
+  partition: string;
+  value: T;
+  row: number;                  // Row in the embedding matrix, -1 when stored without one
+  cachedAt: number;             // performance.now() - monotonic, immune to wall-clock adjustments
+  hits: number;
+}
+
+interface PersistedResponse<T> {
+  key: string;
+  partition: string;
+  value: T;
+  cachedAt: number;             // Wall-clock ms; monotonic times do not survive a restart
+  hits: number;
+  embedding?: { scale: number; data: string }; // Quantized row, base64 of the int8 values
+}
+
+interface CacheData<T> {
+  version: number;
+  dimension: number;
+  entries: PersistedResponse<T>[]; // LRU order, least recently used first
+  metadata: {
+    lastUpdated: string;
+    totalEntries: number;
+  };
+}
+
+const INITIAL_MATRIX_ROWS = 64;
+
+// Response caches with a cachePath, flushed together on shutdown
+const persistentCaches = new Set<LLMResponseCache>();
+
+/**
+ * Disk location for a named shared response cache, or undefined when LLM_CACHE_PERSIST=false
+ */
+export function llmResponseCachePath(name: string): string | undefined {
+  if (process.env.LLM_CACHE_PERSIST === "false") {
+    return undefined;
+  }
+  const dataDir = process.env.DATA_DIR || path.join(process.cwd(), ".data");
+  return path.join(dataDir, `${name}.json`);
+}
+
+/**
+ * Write every persistent response cache with pending changes (call on server shutdown)
+ */
+export async function flushLLMResponseCaches(): Promise<void> {
+  await Promise.all(Array.from(persistentCaches, cache => cache.flush()));
+}
+
+// Prompts up to this size are hashed in full. Larger ones are fingerprinted by length, both
+// edges and evenly strided samples of the middle, so a key costs O(1) instead of O(n).
+// Tradeoff: two huge prompts that agree on length, edges and every sample collide; the
+// TTL bounds how long such a false hit could live.
+const FULL_HASH_LIMIT = 64 * 1024;
+const FINGERPRINT_EDGE = 4096;
+const FINGERPRINT_SAMPLES = 64;
+const FINGERPRINT_SAMPLE_LENGTH = 64;
+
+/**
+ * Sorted, non-overlapping [from, to) ranges sampled from a text of the given length
+ * (only called above FULL_HASH_LIMIT)
+ */
+function fingerprintRanges(length: number): Array<[number, number]> {
+  const ranges: Array<[number, number]> = [[0, FINGERPRINT_EDGE]];
+  const step = Math.floor((length - 2 * FINGERPRINT_EDGE) / FINGERPRINT_SAMPLES);
+  for (let i = 0; i < FINGERPRINT_SAMPLES; i++) {
+    const at = FINGERPRINT_EDGE + i * step;
+    ranges.push([at, at + FINGERPRINT_SAMPLE_LENGTH]);
+  }
+  ranges.push([length - FINGERPRINT_EDGE, length]);
+  return ranges;
+}
+
+function updateWithFingerprint(hash: crypto.Hash, text: string): void {
+  if (text.length <= FULL_HASH_LIMIT) {
+    hash.update(text);
+    return;
+  }
+
+  hash.update(`#${text.length}#`);
+  for (const [from, to] of fingerprintRanges(text.length)) {
+    hash.update(text.slice(from, to));
+  }
+}
+
+/**
+ * Walk the whitespace-normalized view of `text` (runs collapsed to one space, trimmed)
+ * without building it: visit(start, end) gets each word's span in `text`, and (-1, -1) for
+ * the single space between words. Returning false stops the walk.
+ */
+function walkNormalized(text: string, visit: (start: number, end: number) => boolean | void): void {
+  const word = /\S+/g;
+  let first = true;
+  let match: RegExpExecArray | null;
+  while ((match = word.exec(text)) !== null) {
+    if (!first && visit(-1, -1) === false) return;
+    first = false;
+    if (visit(match.index, match.index + match[0].length) === false) return;
+  }
+}
+
+/**
+ * Same key material as updateWithFingerprint over the whitespace-normalized text, without
+ * copying large texts: one pass measures the normalized length, a second collects only the
+ * sampled ranges
+ */
+function updateWithNormalizedFingerprint(hash: crypto.Hash, text: string): void {
+  let length = 0;
+  walkNormalized(text, (start, end) => {
+    length += start < 0 ? 1 : end - start;
+  });
+  if (length <= FULL_HASH_LIMIT) {
+    hash.update(text.replace(/\s+/g, " ").trim());
+    return;
+  }
+
+  const ranges = fingerprintRanges(length);
+  const slices: string[] = ranges.map(() => "");
+  let next = 0;
+  let pos = 0;
+  walkNormalized(text, (start, end) => {
+    const runEnd = pos + (start < 0 ? 1 : end - start);
+    while (next < ranges.length && ranges[next][0] < runEnd) {
+      const from = Math.max(ranges[next][0], pos);
+      const to = Math.min(ranges[next][1], runEnd);
+      if (to > from) {
+        slices[next] += start < 0 ? " " : text.slice(start + from - pos, start + to - pos);
+      }
+      if (ranges[next][1] > runEnd) break;
+      next++;
+    }
+    pos = runEnd;
+    return next < ranges.length;
+  });
+
+  hash.update(`#${length}#`);
+  for (const slice of slices) {
+    hash.update(slice);
+  }
+}
+
+/**
+ * Dot product of one matrix row with a query vector, unrolled over four accumulators so the
+ * additions are independent and V8 can keep them in flight together
+ */
+function dotRow(matrix: Int8Array, offset: number, query: Float32Array, dim: number): number {
+  let s0 = 0, s1 = 0, s2 = 0, s3 = 0;
+  let i = 0;
+  for (; i + 3 < dim; i += 4) {
+    s0 += matrix[offset + i] * query[i];
+    s1 += matrix[offset + i + 1] * query[i + 1];
+    s2 += matrix[offset + i + 2] * query[i + 2];
+    s3 += matrix[offset + i + 3] * query[i + 3];
+  }
+  for (; i < dim; i++) {
+    s0 += matrix[offset + i] * query[i];
+  }
+  return (s0 + s1) + (s2 + s3);
+}
+
+function canonicalize(value: unknown): string {
+  if (Array.isArray(value)) {
+    return `[${value.map(canonicalize).join(",")}]`;
+  }
+  if (value && typeof value === "object") {
+    const keys = Object.keys(value).sort();
+    const parts: string[] = [];
+    for (const key of keys) {
+      const field = (value as Record<string, unknown>)[key];
+      if (field !== undefined) {
+        parts.push(`${JSON.stringify(key)}:${canonicalize(field)}`);
+      }
+    }
+    return `{${parts.join(",")}}`;
+  }
+  return JSON.stringify(value) ?? "null";
+}
+
+export class LLMResponseCache<T = any> {
+  private entries: Map<string, CachedResponse<T>> = new Map();
+  private ttlMs: number;
+  private maxEntries: number;
+  private similarityThreshold: number;
+  private promoteAfterHits: number;
+  // Quantized embeddings, one row of `dimension` int8 values per entry with its dequantization
+  // factor in rowScales; rowKeys maps rows back to entries
+  private matrix: Int8Array = new Int8Array(0);
+  private rowScales: Float32Array = new Float32Array(0);
+  private dimension: number = 0;
+  private rowKeys: (string | null)[] = [];
+  private freeRows: number[] = [];
+  private exactHits: number = 0;
+  private semanticHits: number = 0;
+  private misses: number = 0;
+  private cachePath: string | null;
+  private writeDebounceMs: number;
+  private writeTimeout: NodeJS.Timeout | null = null;
+  private isDirty: boolean = false;
+  private loadPromise: Promise<void> | null = null;
+  // Expired entries are swept on writes at most once per interval, so they do not stay
+  // resident until read (and a full cache does not rescan every entry on each insert)
+  private sweepIntervalMs: number;
+  private lastSweepAt: number = performance.now();
+
+  constructor(config?: LLMResponseCacheConfig) {
+    this.ttlMs = config?.ttlMs || 60 * 60 * 1000; // 1 hour
+    this.maxEntries = config?.maxEntries || 500;
+    this.similarityThreshold = config?.similarityThreshold ?? 0.87;
+    this.promoteAfterHits = config?.promoteAfterHits || 3;
+    this.cachePath = config?.cachePath || null;
+    this.writeDebounceMs = config?.writeDebounceMs || 5000;
+    this.sweepIntervalMs = Math.min(this.ttlMs, 60 * 1000);
+    if (this.cachePath) {
+      persistentCaches.add(this);
+    }
+  }
+
+  /**
+   * Load persisted entries from disk (once; later calls return the same promise)
+   */
+  initialize(): Promise<void> {
+    if (!this.loadPromise) {
+      this.loadPromise = this.cachePath
+        ? this.loadFromDisk().catch(error => {
+            // Log error but don't fail - cache can be rebuilt
+            log("Failed to load LLM response cache from disk, starting fresh", "warning", { error });
+          })
+        : Promise.resolve();
+    }
+    return this.loadPromise;
+  }
+
+  /**
+   * Compute the cache key for a prompt in a partition. A prompt may be passed as several
+   * parts (e.g. context and content) so callers never have to concatenate it just to hash it.
+   */
+  static keyFor(partition: string, ...promptParts: string[]): string {
+    const hash = crypto.createHash("sha256").update(partition);
+    for (const part of promptParts) {
+      hash.update("\0");
+      updateWithFingerprint(hash, part);
+    }
+    return hash.digest("hex");
+  }
+
+  /**
+   * keyFor over whitespace-normalized parts (runs collapsed, trimmed), so prompts that differ
+   * only in indentation, line endings or trailing blanks share an exact-tier key. Large parts
+   * are normalized while fingerprinting rather than copied first.
+   */
+  static normalizedKeyFor(partition: string, ...promptParts: string[]): string {
+    const hash = crypto.createHash("sha256").update(partition);
+    for (const part of promptParts) {
+      hash.update("\0");
+      updateWithNormalizedFingerprint(hash, part);
+    }
+    return hash.digest("hex");
+  }
+
+  /**
+   * Order-independent digest of call options, so {a, b} and {b, a} share cache entries.
+   * Undefined values are dropped; nested objects are canonicalized recursively.
+   */
+  static optionsDigest(options: Record<string, unknown>): string {
+    return crypto.createHash("sha256").update(canonicalize(options)).digest("hex").substring(0, 16);
+  }
+
+  /**
+   * Look up a response for a byte-identical prompt (key from keyFor)
+   */
+  getExact(key: string): T | null {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return null;
+    }
+
+    if (performance.now() - entry.cachedAt > this.ttlMs) {
+      this.deleteEntry(key, entry);
+      return null;
+    }
+
+    this.touch(key, entry);
+    this.exactHits++;
+    return entry.value;
+  }
+
+  /**
+   * Look up the most similar cached response in a partition (normalized embedding required)
+   */
+  getSimilar(partition: string, embedding: Float32Array): { value: T; score: number } | null {
+    const now = performance.now();
+    let best: CachedResponse<T> | null = null;
+    let bestKey = "";
+    let bestScore = this.similarityThreshold;
+
+    if (embedding.length !== this.dimension) {
+      this.misses++;
+      return null;
+    }
+
+    const dim = this.dimension;
+    const matrix = this.matrix;
+    const rowScales = this.rowScales;
+    for (let row = 0; row < this.rowKeys.length; row++) {
+      const key = this.rowKeys[row];
+      if (key === null) {
+        continue;
+      }
+      const entry = this.entries.get(key)!;
+      if (entry.partition !== partition) {
+        continue;
+      }
+      if (now - entry.cachedAt > this.ttlMs) {
+        this.deleteEntry(key, entry);
+        continue;
+      }
+
+      const score = dotRow(matrix, row * dim, embedding, dim) * rowScales[row];
+      if (score >= bestScore) {
+        bestScore = score;
+        best = entry;
+        bestKey = key;
+      }
+    }
+
+    if (!best) {
+      this.misses++;
+      return null;
+    }
+
+    this.touch(bestKey, best);
+    this.semanticHits++;
+    return { value: best.value, score: bestScore };
+  }
+
+  /**
+   * Store a response under a key from keyFor, optionally with the prompt embedding for the semantic tier
+   */
+  set(key: string, partition: string, value: T, embedding?: Float32Array | null): void {
+    const existing = this.entries.get(key);
+    if (existing) {
+      this.deleteEntry(key, existing);
+    }
+    this.entries.set(key, {
+      partition,
+      value,
+      row: embedding ? this.storeEmbedding(key, embedding) : -1,
+      cachedAt: performance.now(),
+      hits: 0
+    });
+    this.markDirty();
+
+    if (performance.now() - this.lastSweepAt >= this.sweepIntervalMs) {
+      this.prune();
+    }
+    if (this.entries.size > this.maxEntries) {
+      this.evictOne();
+    }
+  }
+
+  /**
+   * Remove expired entries from the cache
+   */
+  prune(): number {
+    const now = performance.now();
+    this.lastSweepAt = now;
+    let pruned = 0;
+
+    for (const [key, entry] of this.entries) {
+      if (now - entry.cachedAt > this.ttlMs) {
+        this.deleteEntry(key, entry);
+        pruned++;
+      }
+    }
+
+    if (pruned > 0) {
+      log(`Pruned ${pruned} expired LLM response cache entries`, "debug", { remaining: this.entries.size });
+    }
+
+    return pruned;
+  }
+
+  /**
+   * Record a miss for a lookup that never reached the semantic tier
+   */
+  recordMiss(): void {
+    this.misses++;
+  }
+
+  /**
+   * Clear all entries from the cache
+   */
+  clear(): void {
+    this.entries.clear();
+    this.matrix = new Int8Array(0);
+    this.rowScales = new Float32Array(0);
+    this.dimension = 0;
+    this.rowKeys = [];
+    this.freeRows = [];
+    this.markDirty();
+  }
+
+  /**
+   * Force an immediate write of pending changes to disk
+   */
+  async flush(): Promise<void> {
+    if (this.writeTimeout) {
+      clearTimeout(this.writeTimeout);
+      this.writeTimeout = null;
+    }
+
+    if (this.isDirty) {
+      await this.writeToDisk();
+    }
+  }
+
+  /**
+   * Get cache statistics
+   */
+  getStats(): { totalEntries: number; exactHits: number; semanticHits: number; misses: number } {
+    return {
+      totalEntries: this.entries.size,
+      exactHits: this.exactHits,
+      semanticHits: this.semanticHits,
+      misses: this.misses
+    };
+  }
+
+  /**
+   * Normalize an embedding to unit length so similarity is a dot product
+   */
+  static normalize(embedding: ArrayLike<number>): Float32Array {
+    const normalized = Float32Array.from(embedding);
+    let sumSquares = 0;
+    for (let i = 0; i < normalized.length; i++) {
+      sumSquares += normalized[i] * normalized[i];
+    }
+    const norm = Math.sqrt(sumSquares);
+    if (norm > 0) {
+      for (let i = 0; i < normalized.length; i++) {
+        normalized[i] /= norm;
+      }
+    }
+    return normalized;
+  }
+
+  private touch(key: string, entry: CachedResponse<T>): void {
+    // Map iteration order is insertion order: re-inserting moves the entry to the MRU end
+    entry.hits++;
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+  }
+
+  private deleteEntry(key: string, entry: CachedResponse<T>): void {
+    this.entries.delete(key);
+    if (entry.row >= 0) {
+      this.rowKeys[entry.row] = null;
+      this.freeRows.push(entry.row);
+    }
+  }
+
+  /**
+   * Quantize an embedding into a free matrix row (growing the matrix by doubling); -1 if its
+   * dimension differs from the embeddings already stored
+   */
+  private storeEmbedding(key: string, embedding: Float32Array): number {
+    const row = this.allocateRow(embedding.length);
+    if (row < 0) {
+      return -1;
+    }
+
+    // Symmetric per-row quantization: the largest component maps to +/-127
+    let maxAbs = 0;
+    for (let i = 0; i < embedding.length; i++) {
+      maxAbs = Math.max(maxAbs, Math.abs(embedding[i]));
+    }
+    const scale = 127 / Math.max(maxAbs, 1e-8);
+    const offset = row * this.dimension;
+    for (let i = 0; i < embedding.length; i++) {
+      this.matrix[offset + i] = Math.round(embedding[i] * scale);
+    }
+    this.rowScales[row] = 1 / scale;
+    this.rowKeys[row] = key;
+    return row;
+  }
+
+  /**
+   * Take a free matrix row (growing the matrix by doubling); -1 on a dimension mismatch
+   */
+  private allocateRow(dimension: number): number {
+    if (this.dimension === 0) {
+      this.dimension = dimension;
+    } else if (dimension !== this.dimension) {
+      return -1;
+    }
+
+    let row = this.freeRows.pop();
+    if (row === undefined) {
+      row = this.rowKeys.length;
+      this.rowKeys.push(null);
+      if (this.rowKeys.length > this.rowScales.length) {
+        const rows = Math.max(INITIAL_MATRIX_ROWS, this.rowKeys.length * 2);
+        const grown = new Int8Array(rows * this.dimension);
+        grown.set(this.matrix);
+        this.matrix = grown;
+        const grownScales = new Float32Array(rows);
+        grownScales.set(this.rowScales);
+        this.rowScales = grownScales;
+      }
+    }
+    return row;
+  }
+
+  private markDirty(): void {
+    if (!this.cachePath) {
+      return;
+    }
+    this.isDirty = true;
+    if (this.writeTimeout) {
+      return; // Already scheduled
+    }
+
+    this.writeTimeout = setTimeout(async () => {
+      this.writeTimeout = null;
+      if (this.isDirty) {
+        await this.writeToDisk();
+      }
+    }, this.writeDebounceMs);
+    // Shutdown paths flush explicitly; a pending write must not keep the process alive
+    this.writeTimeout.unref();
+  }
+
+  private async loadFromDisk(): Promise<void> {
+    const cachePath = this.cachePath!;
+    if (!fs.existsSync(cachePath)) {
+      log("No existing LLM response cache file found", "debug", { cachePath });
+      return;
+    }
+
+    const data: CacheData<T> = JSON.parse(await fs.promises.readFile(cachePath, "utf-8"));
+    if (data.version !== 1) {
+      log("Incompatible LLM response cache version, starting fresh", "warning", { version: data.version });
+      return;
+    }
+
+    // Ages carry over across the restart; entries stored since startup take precedence
+    const wallNow = Date.now();
+    const monotonicNow = performance.now();
+    let loaded = 0;
+    for (const persisted of data.entries) {
+      const age = wallNow - persisted.cachedAt;
+      if (age > this.ttlMs || this.entries.has(persisted.key)) {
+        continue;
+      }
+
+      let row = -1;
+      if (persisted.embedding && data.dimension > 0) {
+        row = this.allocateRow(data.dimension);
+        if (row >= 0) {
+          const values = Buffer.from(persisted.embedding.data, "base64");
+          this.matrix.set(new Int8Array(values.buffer, values.byteOffset, data.dimension), row * this.dimension);
+          this.rowScales[row] = persisted.embedding.scale;
+          this.rowKeys[row] = persisted.key;
+        }
+      }
+
+      this.entries.set(persisted.key, {
+        partition: persisted.partition,
+        value: persisted.value,
+        row,
+        cachedAt: monotonicNow - age,
+        hits: persisted.hits
+      });
+      loaded++;
+    }
+
+    while (this.entries.size > this.maxEntries) {
+      this.evictOne();
+    }
+
+    log("LLM response cache loaded from disk", "info", {
+      cachePath,
+      entriesLoaded: loaded,
+      lastUpdated: data.metadata.lastUpdated
+    });
+  }
+
+  private async writeToDisk(): Promise<void> {
+    const cachePath = this.cachePath!;
+    try {
+      const dir = path.dirname(cachePath);
+      if (!fs.existsSync(dir)) {
+        await fs.promises.mkdir(dir, { recursive: true });
+      }
+
+      // Expired entries would only be skipped again on load
+      this.prune();
+
+      const wallNow = Date.now();
+      const monotonicNow = performance.now();
+      const entries: PersistedResponse<T>[] = [];
+      for (const [key, entry] of this.entries) {
+        const persisted: PersistedResponse<T> = {
+          key,
+          partition: entry.partition,
+          value: entry.value,
+          cachedAt: wallNow - (monotonicNow - entry.cachedAt),
+          hits: entry.hits
+        };
+        if (entry.row >= 0) {
+          const offset = this.matrix.byteOffset + entry.row * this.dimension;
+          persisted.embedding = {
+            scale: this.rowScales[entry.row],
+            data: Buffer.from(this.matrix.buffer, offset, this.dimension).toString("base64")
+          };
+        }
+        entries.push(persisted);
+      }
+
+      const data: CacheData<T> = {
+        version: 1,
+        dimension: this.dimension,
+        entries,
+        metadata: {
+          lastUpdated: new Date(wallNow).toISOString(),
+          totalEntries: entries.length
+        }
+      };
+
+      // Write a sibling temp file and rename it over the cache: the server and workflow-runner
+      // processes share this path, and a crash mid-write must not leave a truncated file
+      this.isDirty = false;
+      const tempPath = `${cachePath}.${process.pid}.tmp`;
+      try {
+        await fs.promises.writeFile(tempPath, JSON.stringify(data));
+        await fs.promises.rename(tempPath, cachePath);
+      } catch (error) {
+        await fs.promises.unlink(tempPath).catch(() => {});
+        throw error;
+      }
+
+      log("LLM response cache written to disk", "debug", { entries: entries.length, path: cachePath });
+    } catch (error) {
+      this.isDirty = true;
+      log("Failed to write LLM response cache to disk", "error", { error });
+    }
+  }
+
+  private evictOne(): void {
+    // Least recently used entry that has not earned promotion; fall back to the LRU entry overall
+    let victim: string | null = null;
+    for (const [key, entry] of this.entries) {
+      if (victim === null) {
+        victim = key;
+      }
+      if (entry.hits < this.promoteAfterHits) {
+        victim = key;
+        break;
+      }
+    }
+
+    if (victim !== null) {
+      this.deleteEntry(victim, this.entries.get(victim)!);
+      log("Evicted LLM response cache entry", "debug", { remaining: this.entries.size });
+    }
+  }
+}
@@ -34,10 +34,40 @@ export interface AnalysisCheckpoint {
   confidenceScore: number;
 }
 
+// Dependency, virtualenv and build-output directories: large, and no signal about the project
+// itself. Hidden directories (.git, .venv, .next, ...) are pruned separately.
+const IGNORED_DIRECTORIES = new Set([
+  'node_modules', 'bower_components', 'vendor', '__pycache__', 'venv', 'env',
+  'target', 'dist', 'build', 'out', 'coverage'
+]);
+
+// Language detection: extensions per language and the directories whose files are counted.
+// TypeScript/JavaScript count src/ and the whole tree (so files under src/ weigh double);
+// Python only counts the usual source roots, to skip leftover experimental files.
+const LANGUAGE_RULES: Array<{ language: string; extensions: string[]; dirs: string[] }> = [
+  { language: 'TypeScript', extensions: ['.ts', '.tsx'], dirs: ['src', '.'] },
+  { language: 'JavaScript', extensions: ['.js', '.jsx'], dirs: ['src', '.'] },
+  { language: 'Python', extensions: ['.py'], dirs: ['src', 'lib', 'app'] },
+  { language: 'Java', extensions: ['.java'], dirs: ['src'] },
+  { language: 'Rust', extensions: ['.rs'], dirs: ['src'] },
+  { language: 'Go', extensions: ['.go'], dirs: ['src'] },
+  { language: 'C++', extensions: ['.cpp', '.cc', '.cxx'], dirs: ['src'] },
+  { language: 'C', extensions: ['.c'], dirs: ['src'] }
+];
+
+const LANGUAGE_BY_EXTENSION = new Map<string, number>(
+  LANGUAGE_RULES.flatMap(({ extensions }, index) => extensions.map(ext => [ext, index] as [string, number]))
+);
+
 export class RepositoryContextManager {
   private repositoryPath: string;
   private contextCache: RepositoryContext | null = null;
   private checkpointCache: AnalysisCheckpoint | null = null;
+  // One walk of the repository per context analysis (done up front, asynchronously),
+  // shared by every file-based detector
+  private fileListing: string[] | null = null;
+  // Top-level entry names (to whether each is a directory), read once per context analysis
+  private rootEntries: Map<string, boolean> | null = null;
   
   // Files that affect repository context
   private readonly STRUCTURAL_FILES = [
@@ -90,8 +120,25 @@ export class RepositoryContextManager {
   }
 
   private async analyzeRepositoryContext(): Promise<RepositoryContext> {
+    try {
+      // The walk is the only long-running part of the analysis; doing it with non-blocking
+      // directory reads keeps the server responsive to other tool calls meanwhile
+      this.fileListing = await this.walkRepository('.');
+      return this.buildRepositoryContext();
+    } finally {
+      this.fileListing = null;
+      this.rootEntries = null;
+    }
+  }
+
+  private buildRepositoryContext(): RepositoryContext {
     const structuralFiles = this.findStructuralFiles();
-    const contextHash = this.calculateContextHash(structuralFiles);
+    // Each structural file is read and hashed once; the context hash is derived from these
+    const fileHashes = structuralFiles.map(file => ({
+      path: file,
+      hash: this.calculateFileHash(file)
+    }));
+    const contextHash = this.calculateContextHash(fileHashes);
     
     // Analyze different aspects
     const projectType = this.detectProjectType(structuralFiles);
@@ -112,10 +159,7 @@ export class RepositoryContextManager {
       testingFrameworks,
       contextHash,
       lastUpdated: new Date(),
-      structuralFiles: structuralFiles.map(file => ({
-        path: file,
-        hash: this.calculateFileHash(file)
-      }))
+      structuralFiles: fileHashes
     };
   }
 
@@ -179,43 +223,34 @@ export class RepositoryContextManager {
   }
 
   private detectPrimaryLanguages(): string[] {
-    const languages: Record<string, number> = {};
-    
-    const countFiles = (dir: string, extensions: string[], language: string) => {
-      try {
-        const files = this.getAllFiles(dir);
-        const count = files.filter(file => 
-          extensions.some(ext => file.endsWith(ext)) &&
-          !file.includes('node_modules') &&
-          !file.includes('.git') &&
-          !file.includes('dist') &&
-          !file.includes('build')
-        ).length;
-        if (count > 0) {
-          languages[language] = (languages[language] || 0) + count;
-          log(`Detected ${count} ${language} files in ${dir}`, 'debug');
+    // One pass over the repository listing: each file's extension selects its language rule,
+    // and the file counts once for every rule directory it sits under
+    const counts = new Array<number>(LANGUAGE_RULES.length).fill(0);
+    for (const file of this.listFiles('.')) {
+      const dot = file.lastIndexOf('.');
+      const ruleIndex = dot >= 0 ? LANGUAGE_BY_EXTENSION.get(file.slice(dot)) : undefined;
+      if (ruleIndex === undefined ||
+          file.includes('node_modules') ||
+          file.includes('.git') ||
+          file.includes('dist') ||
+          file.includes('build')) {
+        continue;
+      }
+      for (const dir of LANGUAGE_RULES[ruleIndex].dirs) {
+        if (dir === '.' || file.startsWith(dir + path.sep)) {
+          counts[ruleIndex]++;
         }
-      } catch (error) {
-        log(`Failed to scan ${dir}: ${error}`, 'debug');
       }
-    };
+    }
 
-    // Count files in both src/ and root directories for TypeScript/JavaScript
-    countFiles('src', ['.ts', '.tsx'], 'TypeScript');
-    countFiles('.', ['.ts', '.tsx'], 'TypeScript');
-    countFiles('src', ['.js', '.jsx'], 'JavaScript');  
-    countFiles('.', ['.js', '.jsx'], 'JavaScript');
-    
-    // Only count Python files in specific directories (exclude leftover experimental files)
-    countFiles('src', ['.py'], 'Python');
-    countFiles('lib', ['.py'], 'Python');
-    countFiles('app', ['.py'], 'Python');
-    
-    countFiles('src', ['.java'], 'Java');
-    countFiles('src', ['.rs'], 'Rust');
-    countFiles('src', ['.go'], 'Go');
-    countFiles('src', ['.cpp', '.cc', '.cxx'], 'C++');
-    countFiles('src', ['.c'], 'C');
+    // Rule order is kept for languages with equal counts
+    const languages: Record<string, number> = {};
+    LANGUAGE_RULES.forEach(({ language }, index) => {
+      if (counts[index] > 0) {
+        languages[language] = counts[index];
+      }
+    });
+    log('Detected language file counts', 'debug', languages);
 
     const result = Object.entries(languages)
       .sort(([,a], [,b]) => b - a)
@@ -419,26 +454,18 @@ export class RepositoryContextManager {
   }
 
   private findStructuralFiles(): string[] {
-    const found: string[] = [];
-    
-    for (const file of this.STRUCTURAL_FILES) {
-      const fullPath = path.join(this.repositoryPath, file);
-      if (fs.existsSync(fullPath)) {
-        found.push(file);
-      }
-    }
-    
-    return found;
+    const entries = this.getRootEntries();
+    return this.STRUCTURAL_FILES.filter(file => entries.has(file));
   }
 
-  private calculateContextHash(structuralFiles: string[]): string {
+  private calculateContextHash(fileHashes: Array<{ path: string; hash: string }>): string {
     const hasher = crypto.createHash('md5');
-    
-    for (const file of structuralFiles) {
-      const fileHash = this.calculateFileHash(file);
-      hasher.update(fileHash);
+
+    // Bind each hash to its path so a renamed or unreadable file changes the context hash
+    for (const file of fileHashes) {
+      hasher.update(file.path).update('\0').update(file.hash).update('\0');
     }
-    
+
     return hasher.digest('hex');
   }
 
@@ -511,21 +538,54 @@ export class RepositoryContextManager {
   }
 
   private checkFileExists(filePath: string): boolean {
+    if (!filePath.includes('/')) {
+      return this.getRootEntries().has(filePath);
+    }
     const fullPath = path.join(this.repositoryPath, filePath);
     return fs.existsSync(fullPath);
   }
 
   private checkDirectoryExists(dirPath: string): boolean {
+    if (!dirPath.includes('/')) {
+      return this.getRootEntries().get(dirPath) === true;
+    }
     const fullPath = path.join(this.repositoryPath, dirPath);
-    return fs.existsSync(fullPath) && fs.statSync(fullPath).isDirectory();
+    // One stat answers both existence and type
+    return fs.statSync(fullPath, { throwIfNoEntry: false })?.isDirectory() === true;
+  }
+
+  /**
+   * Top-level entries of the repository from a single directory read, replacing one
+   * existsSync/statSync per probed name
+   */
+  private getRootEntries(): Map<string, boolean> {
+    if (!this.rootEntries) {
+      this.rootEntries = new Map();
+      try {
+        for (const entry of fs.readdirSync(this.repositoryPath, { withFileTypes: true })) {
+          let isDirectory = entry.isDirectory();
+          if (entry.isSymbolicLink()) {
+            try {
+              isDirectory = fs.statSync(path.join(this.repositoryPath, entry.name)).isDirectory();
+            } catch {
+              continue; // Dangling link: existsSync reported it missing too
+            }
+          }
+          this.rootEntries.set(entry.name, isDirectory);
+        }
+      } catch (error) {
+        // Repository root doesn't exist or can't be read
+      }
+    }
+    return this.rootEntries;
   }
 
   private checkFilePatterns(patterns: string[]): boolean {
     // Simple pattern matching - in production, use glob library
+    const files = this.listFiles('.');
     for (const pattern of patterns) {
       // This is a simplified implementation
       const cleanPattern = pattern.replace('**/', '').replace('*', '');
-      const files = this.getAllFiles('.');
       if (files.some(file => {
         const fileName = typeof file === 'string' ? file : String(file);
         return fileName.includes(cleanPattern);
@@ -536,27 +596,55 @@ export class RepositoryContextManager {
     return false;
   }
 
-  private getAllFiles(dir: string): string[] {
-    const files: string[] = [];
-    
+  /**
+   * Files under a repository-relative directory, filtered from the shared repository walk
+   */
+  private listFiles(dir: string): string[] {
+    const files = this.fileListing ?? [];
+    if (path.normalize(dir) === '.') {
+      return files;
+    }
+    const prefix = path.join(dir) + path.sep;
+    return files.filter(file => file.startsWith(prefix));
+  }
+
+  /**
+   * Collect repository-relative file paths without blocking the event loop; sibling
+   * directories are read concurrently (file order is not significant to any detector)
+   */
+  private async walkRepository(dir: string, files: string[] = []): Promise<string[]> {
+    const fullDir = path.join(this.repositoryPath, dir);
+    let entries: fs.Dirent[];
     try {
-      const fullDir = path.join(this.repositoryPath, dir);
-      const entries = fs.readdirSync(fullDir);
-      
-      for (const entry of entries) {
-        const fullPath = path.join(fullDir, entry);
-        const stat = fs.statSync(fullPath);
-        
-        if (stat.isDirectory() && !entry.startsWith('.') && entry !== 'node_modules') {
-          files.push(...this.getAllFiles(path.join(dir, entry)));
-        } else if (stat.isFile()) {
-          files.push(path.join(dir, entry));
-        }
-      }
+      entries = await fs.promises.readdir(fullDir, { withFileTypes: true });
     } catch (error) {
       // Directory doesn't exist or can't be read
+      return files;
+    }
+
+    const subdirectories: Promise<string[]>[] = [];
+    for (const entry of entries) {
+      // Dirent types come from the directory read itself, so only symlinks need a stat
+      let stat: fs.Dirent | fs.Stats = entry;
+      if (entry.isSymbolicLink()) {
+        try {
+          stat = await fs.promises.stat(path.join(fullDir, entry.name));
+        } catch {
+          continue; // Dangling link
+        }
+      }
+
+      if (stat.isDirectory()) {
+        // Prune hidden and ignored directories before descending
+        if (!entry.name.startsWith('.') && !IGNORED_DIRECTORIES.has(entry.name)) {
+          subdirectories.push(this.walkRepository(path.join(dir, entry.name), files));
+        }
+      } else if (stat.isFile()) {
+        files.push(path.join(dir, entry.name));
+      }
     }
-    
+    await Promise.all(subdirectories);
+
     return files;
   }
 }
\ No newline at end of file
@@ -44,50 +44,56 @@ export interface SerenaAnalysisResult {
   errors: string[];
 }
 
+// Reference patterns used by extractCodeReferences, compiled once
+// File paths (e.g., src/utils/foo.ts, lib/vkb-server/express-server.js)
+const FILE_PATH_PATTERN = /(?:^|\s|['"`])([a-zA-Z0-9_\-./]+\.(?:ts|js|tsx|jsx|py|java|go|rs|cpp|c|h))/g;
+// Class names (PascalCase, 2+ uppercase letters)
+const CLASS_PATTERN = /(?:class|interface|type)\s+([A-Z][a-zA-Z0-9]+)/g;
+// Standalone PascalCase words that look like class names
+const PASCAL_CASE_PATTERN = /\b([A-Z][a-z]+(?:[A-Z][a-z]+)+)\b/g;
+// Function/method names (camelCase followed by parentheses)
+const FUNCTION_PATTERN = /\b([a-z][a-zA-Z0-9]*)\s*\(/g;
+// Common words that aren't functions
+const NON_FUNCTION_WORDS: ReadonlySet<string> = new Set(['if', 'for', 'while', 'switch', 'catch', 'with', 'new', 'return']);
+
 /**
  * Extracts code references from text content (observations, descriptions, etc.)
  */
 export function extractCodeReferences(text: string): CodeReference[] {
   const references: CodeReference[] = [];
+  // Names of file and class references so far, so PascalCase matches skip duplicates in O(1)
+  const seenNames = new Set<string>();
 
-  // Pattern for file paths (e.g., src/utils/foo.ts, lib/vkb-server/express-server.js)
-  const filePathPattern = /(?:^|\s|['"`])([a-zA-Z0-9_\-./]+\.(?:ts|js|tsx|jsx|py|java|go|rs|cpp|c|h))/g;
-  let match: RegExpExecArray | null;
-  while ((match = filePathPattern.exec(text)) !== null) {
+  for (const match of text.matchAll(FILE_PATH_PATTERN)) {
     references.push({
       type: 'file',
       name: match[1],
       filePath: match[1]
     });
+    seenNames.add(match[1]);
   }
 
-  // Pattern for class names (PascalCase, 2+ uppercase letters)
-  const classPattern = /(?:class|interface|type)\s+([A-Z][a-zA-Z0-9]+)/g;
-  while ((match = classPattern.exec(text)) !== null) {
+  for (const match of text.matchAll(CLASS_PATTERN)) {
     references.push({
       type: 'class',
       name: match[1]
     });
+    seenNames.add(match[1]);
   }
 
-  // Pattern for standalone PascalCase words that look like class names
-  const pascalCasePattern = /\b([A-Z][a-z]+(?:[A-Z][a-z]+)+)\b/g;
-  while ((match = pascalCasePattern.exec(text)) !== null) {
+  for (const match of text.matchAll(PASCAL_CASE_PATTERN)) {
     // Avoid duplicates
-    if (!references.some(r => r.name === match![1])) {
+    if (!seenNames.has(match[1])) {
       references.push({
         type: 'class',
         name: match[1]
       });
+      seenNames.add(match[1]);
     }
   }
 
-  // Pattern for function/method names (camelCase followed by parentheses)
-  const functionPattern = /\b([a-z][a-zA-Z0-9]*)\s*\(/g;
-  while ((match = functionPattern.exec(text)) !== null) {
-    // Filter common words that aren't functions
-    const commonWords = ['if', 'for', 'while', 'switch', 'catch', 'with', 'new', 'return'];
-    if (!commonWords.includes(match[1])) {
+  for (const match of text.matchAll(FUNCTION_PATTERN)) {
+    if (!NON_FUNCTION_WORDS.has(match[1])) {
       references.push({
         type: 'function',
         name: match[1]
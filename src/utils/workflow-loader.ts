@@ -135,6 +135,7 @@ export interface AgentTuningConfig {
   };
   documentation_linker: {
     reference_batch_size: number;
+    reference_concurrency?: number;
   };
   deduplication: {
     batch_size: number;
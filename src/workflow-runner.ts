@@ -17,6 +17,7 @@ import * as fs from 'fs';
 import * as path from 'path';
 import { CoordinatorAgent } from './agents/coordinator.js';
 import { log } from './logging.js';
+import { flushLLMResponseCaches } from './utils/llm-response-cache.js';
 import { loadAllWorkflows, getConfigDir, loadWorkflowRunnerConfig } from './utils/workflow-loader.js';
 
 // ============================================================================
@@ -85,6 +86,13 @@ async function gracefulCleanup(reason: string, exitCode: number = 1): Promise<vo
     }
   }
 
+  // Persist cached LLM responses before process.exit drops the pending write
+  try {
+    await flushLLMResponseCaches();
+  } catch (e) {
+    log('[WorkflowRunner] Failed to flush LLM response caches', 'warning', e);
+  }
+
   // Clean up PID file
   if (cleanupState.pidFile) {
     try {
@@ -600,6 +608,8 @@ async function main(): Promise<void> {
     });
 
     log(`[WorkflowRunner] Workflow failed: ${errorMessage}`, 'error', error);
+    // process.exit skips the finally block below, so flush here as well
+    await flushLLMResponseCaches().catch(e => log('[WorkflowRunner] Failed to flush LLM response caches', 'warning', e));
     process.exit(1);
 
   } finally {
@@ -609,6 +619,12 @@ async function main(): Promise<void> {
       log('[WorkflowRunner] Error during shutdown', 'error', e);
     }
 
+    try {
+      await flushLLMResponseCaches();
+    } catch (e) {
+      log('[WorkflowRunner] Failed to flush LLM response caches', 'warning', e);
+    }
+
     // Clean up PID file
     try {
       fs.unlinkSync(pidFile);
@@ -628,5 +644,5 @@ async function main(): Promise<void> {
 // Run main
 main().catch(e => {
   console.error('Fatal error in workflow runner:', e);
-  process.exit(1);
+  flushLLMResponseCaches().finally(() => process.exit(1));
 });